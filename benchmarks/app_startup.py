@@ -0,0 +1,78 @@
+# benchmarks/app_startup.py
+"""
+Launch the real app headless and exit as soon as its window has drawn
+its first frame, or, given a document, its first word.
+
+Run as a child process by the startup benchmarks, which pass their launch
+time in RSVP_BENCH_START (seconds since the epoch). Prints
+"WINDOW <seconds>" with the time from launch to the first frame. If
+RSVP_BENCH_FILE names a document, it is then opened through the reader
+and "FIRST_WORD <seconds>" gives the time from starting to open it to
+the frame that shows its first word.
+
+The app's data (resume positions, library index, ...) goes to
+RSVP_BENCH_DATA_DIR, or a fresh temporary directory, so runs do not
+depend on or disturb the user's own data.
+
+The WINDOW line is also written to stderr, so -X importtime output can
+be split into imports before and after the first frame.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.headless import (configure_headless, START_VARIABLE,
+                                 DATA_DIR_VARIABLE, FILE_VARIABLE)
+configure_headless()
+
+import main
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+
+class StartupBenchApp(main.RSVPApp):
+    """RSVPApp that reports its first frame (and first word) and stops."""
+
+    @property
+    def user_data_dir(self):
+        if getattr(self, '_bench_data_dir', None) is None:
+            self._bench_data_dir = (os.environ.get(DATA_DIR_VARIABLE)
+                                    or tempfile.mkdtemp(prefix='rsvp-bench-'))
+        return self._bench_data_dir
+
+    def on_start(self):
+        super().on_start()
+        Window.bind(on_flip=self._report_window)
+
+    def _report_window(self, window):
+        Window.unbind(on_flip=self._report_window)
+        started = float(os.environ.get(START_VARIABLE, time.time()))
+        marker = f'WINDOW {time.time() - started:.6f}'
+        print(marker, flush=True)
+        # Kivy's logger replaces sys.stderr; -X importtime writes to the real one
+        print(marker, file=sys.__stderr__, flush=True)
+
+        filepath = os.environ.get(FILE_VARIABLE)
+        if not filepath:
+            # Next frame, so the app's own first-frame handlers still run
+            Clock.schedule_once(lambda dt: self.stop())
+            return
+        self._open_started = time.perf_counter()
+        self.root.load_file(filepath)
+        if not self.root.words:
+            # load_file reports errors in a popup rather than raising
+            print(f'ERROR could not open {filepath}', flush=True)
+            self.stop()
+            return
+        Window.bind(on_flip=self._report_first_word)
+
+    def _report_first_word(self, window):
+        Window.unbind(on_flip=self._report_first_word)
+        print(f'FIRST_WORD {time.perf_counter() - self._open_started:.6f}', flush=True)
+        self.stop()
+
+
+if __name__ == '__main__':
+    StartupBenchApp().run()
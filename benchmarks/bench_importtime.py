@@ -0,0 +1,131 @@
+# benchmarks/bench_importtime.py
+"""
+Startup import-time breakdown with a time-to-window budget.
+
+Launches the app headless under `python -X importtime` (see
+benchmarks.app_startup), parses the import timings it writes to stderr
+and reports the slowest imports along with the time from launch to the
+first frame. Exits with status 1 if the median time to window exceeds
+--budget or if any module that should be deferred until a document is
+opened was imported during startup.
+
+-X importtime itself adds some overhead, so the budget is measured with
+it on, consistently from run to run. Runs share a data directory warmed
+by one unrecorded launch, as for a returning user.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_importtime [--budget S] [--repeat N] [--top N]
+"""
+
+import argparse
+import json
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+
+from benchmarks.bench_startup import launch
+
+# Modules only needed once a document is opened, which must stay off
+# the startup path
+DEFERRED_MODULES = ('freetype', 'uharfbuzz', 'pyphen', 'syllapy', 'bbcode')
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)\s*$')
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output up to the first frame.
+
+    Imports after the WINDOW marker (e.g. the background warm-up) are
+    not on the startup path and are left out.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in import order
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if line.startswith('WINDOW '):
+            break
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us),
+                            (len(indent) - 1) // 2))
+    return imports
+
+
+def launch_with_importtime(python, module, data_dir):
+    """
+    Launch the app once under -X importtime.
+
+    Returns:
+        (time to window in seconds, parsed imports)
+    """
+    markers, result = launch(python, module, flags=('-X', 'importtime'),
+                             data_dir=data_dir)
+    return markers['WINDOW'], parse_importtime(result.stderr)
+
+
+def summarize(imports, top):
+    """Totals, slowest imports and deferred modules found in one launch."""
+    to_ms = lambda us: round(us / 1000.0, 2)
+    top_level = sorted((entry for entry in imports if entry[3] == 0),
+                       key=lambda entry: entry[2], reverse=True)
+    by_self = sorted(imports, key=lambda entry: entry[1], reverse=True)
+    loaded = {entry[0] for entry in imports}
+    return {
+        'modules': len(imports),
+        'total_import_ms': to_ms(sum(entry[2] for entry in imports if entry[3] == 0)),
+        'slowest_cumulative': [
+            {'module': module, 'cumulative_ms': to_ms(cumulative)}
+            for module, _, cumulative, _ in top_level[:top]],
+        'slowest_self': [
+            {'module': module, 'self_ms': to_ms(self_us)}
+            for module, self_us, _, _ in by_self[:top]],
+        'deferred_imported': sorted(
+            module for module in loaded
+            if module.split('.')[0] in DEFERRED_MODULES),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='maximum median seconds from launch to first frame')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15,
+                        help='number of slowest imports to list')
+    parser.add_argument('--python', default=sys.executable,
+                        help='interpreter to launch the app with')
+    parser.add_argument('--module', default='benchmarks.app_startup')
+    args = parser.parse_args()
+
+    times = []
+    data_dir = tempfile.mkdtemp(prefix='rsvp-bench-')
+    try:
+        launch(args.python, args.module, data_dir=data_dir)
+        for _ in range(args.repeat):
+            seconds, imports = launch_with_importtime(args.python, args.module,
+                                                      data_dir)
+            times.append(seconds)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = summarize(imports, args.top)
+    median = statistics.median(times)
+    report.update({
+        'time_to_window_s': [round(seconds, 4) for seconds in times],
+        'median_time_to_window_s': round(median, 4),
+        'budget_s': args.budget,
+        'within_budget': median <= args.budget,
+    })
+    print(json.dumps(report, indent=2))
+
+    if not report['within_budget'] or report['deferred_imported']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_playback_engine.py
+"""
+Headless PlaybackEngine sessions on a virtual or sped-up real-time clock.
+
+Plays a document (repeated until it lasts at least --minutes) from start
+to finish without a display, then reports the wall time taken and checks
+that playback finished exactly when the timeline says it should.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_playback_engine [file] [--minutes M] [--wpm W]
+    python -m benchmarks.bench_playback_engine --realtime --speed 600
+"""
+
+from benchmarks.headless import configure_headless
+configure_headless()
+
+import argparse
+import json
+import time
+
+from utils.clocks import RealtimeClock, VirtualClock
+from utils.file_handler import FileHandler
+from utils.playback_engine import PlaybackEngine
+from utils.timeline import Timeline
+
+
+def run_session(words, wpm, clock):
+    """Play words to the end and return a summary of the session."""
+    shown = []
+    engine = PlaybackEngine(clock, wpm=wpm, on_word=shown.append)
+
+    start = time.perf_counter()
+    timeline = Timeline.build(words, engine.text_processor)
+    engine.load(words, timeline)
+    built = time.perf_counter()
+    clock_start = clock.now()
+    engine.play()
+    clock.run()
+    finished = time.perf_counter()
+
+    expected = timeline.total_time(wpm)
+    played = clock.now() - clock_start
+    return {
+        'words': len(words),
+        'words_shown': len(shown),
+        'in_order': shown == list(range(len(words))),
+        'timeline_build_s': round(built - start, 4),
+        'playback_wall_s': round(finished - built, 4),
+        'session_clock_s': round(played, 4),
+        'expected_s': round(expected, 4),
+        'drift_ms': round((played - expected) * 1000.0, 3),
+        'timing': engine.recorder.sessions[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file', nargs='?', default='test_files/The_Ultimate_Display.timecode')
+    parser.add_argument('--minutes', type=float, default=60.0,
+                        help='minimum session length in clock minutes')
+    parser.add_argument('--wpm', type=int, default=300)
+    parser.add_argument('--realtime', action='store_true',
+                        help='use a real-time clock instead of a virtual one')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='real-time clock speed multiplier')
+    args = parser.parse_args()
+
+    document = FileHandler.load_file(args.file)
+    document_time = Timeline.build(document).total_time(args.wpm)
+    repeats = max(1, int(args.minutes * 60.0 / document_time) + 1)
+    words = document * repeats
+
+    clock = RealtimeClock(args.speed) if args.realtime else VirtualClock()
+    print(json.dumps(run_session(words, args.wpm, clock), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+# benchmarks/bench_rsvp_server.py
+"""
+Load test for the streaming server: hundreds of simulated clients at once.
+
+Starts serve.py on a free local port, connects --clients asyncio clients,
+and once all of them have received the document, has each seek to its own
+position and play at its own speed (spread over --wpm-range) for
+--seconds. Every word message is stamped by the server with the wall time
+it was due, so each client measures its delivery latency: the time from
+due to received, which includes the server's scheduling delay, encoding
+and the trip through the loopback interface.
+
+Reports, as JSON, per-client latency percentiles, words received and
+words skipped (index gaps), plus the same latencies pooled over every
+client, connection and document delivery times and the number of
+clients the server dropped.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_rsvp_server [--clients 300] [--seconds 10]
+    python -m benchmarks.bench_rsvp_server book.txt --clients 500 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.bench_startup import describe, environment
+from benchmarks.headless import HEADLESS_ENVIRONMENT
+
+DEFAULT_DOCUMENT = 'test_files/The_Ultimate_Display.txt'
+DOCUMENT_LINE_LIMIT = 1 << 30  # The document message is one (possibly huge) line
+SERVER_START_TIMEOUT = 60.0
+
+
+def percentiles(samples):
+    """Nearest-rank p50/p95/p99/max of samples in seconds, in milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    pick = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return {name: round(value * 1000.0, 3) for name, value in (
+        ('p50', pick(0.50)), ('p95', pick(0.95)), ('p99', pick(0.99)),
+        ('max', ordered[-1]))}
+
+
+def start_server(document, wpm):
+    """
+    Launch serve.py on a free port.
+
+    Returns:
+        (process, host, port)
+    """
+    environment = dict(os.environ, **HEADLESS_ENVIRONMENT)
+    process = subprocess.Popen(
+        [sys.executable, 'serve.py', document, '--port', '0', '--wpm', str(wpm)],
+        stderr=subprocess.PIPE, text=True, env=environment)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    for line in process.stderr:
+        if line.startswith('Serving '):
+            host, port = line.rsplit(' on ', 1)[1].strip().rsplit(':', 1)
+            # Keep reading, so a full pipe never blocks the server
+            threading.Thread(target=process.stderr.read, daemon=True).start()
+            return process, host, int(port)
+        if line.startswith('Error') or time.monotonic() > deadline:
+            break
+    process.kill()
+    raise RuntimeError(f'Server did not start: {line.strip()}')
+
+
+async def run_client(number, host, port, wpm, rng, seconds, ready, go):
+    """
+    One simulated reading station.
+
+    Connects, sets ready once it has the document, waits for go, then
+    seeks to a random position in the first half of the document and
+    plays at wpm for seconds.
+
+    Returns:
+        (summary dict, list of latencies in seconds)
+    """
+    result = {'client': number, 'wpm': wpm, 'words': 0, 'skipped': 0,
+              'dropped': False, 'error': None}
+    latencies = []
+    try:
+        started = time.perf_counter()
+        reader, writer = await asyncio.open_connection(host, port,
+                                                       limit=DOCUMENT_LINE_LIMIT)
+        result['connect_ms'] = round((time.perf_counter() - started) * 1000.0, 3)
+        document = json.loads(await reader.readline())
+        result['document_ms'] = round((time.perf_counter() - started) * 1000.0, 3)
+        start = rng.randrange(max(1, len(document['words']) // 2))
+        ready.set()
+        await go.wait()
+
+        writer.write(json.dumps({'command': 'seek', 'index': start}).encode() + b'\n')
+        writer.write(json.dumps({'command': 'play', 'wpm': wpm}).encode() + b'\n')
+        deadline = time.monotonic() + seconds
+        previous = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                line = await asyncio.wait_for(reader.readline(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                result['dropped'] = True
+                break
+            received = time.time()
+            message = json.loads(line)
+            if message['type'] != 'word':
+                continue
+            latencies.append(received - message['due'])
+            index = message['index']
+            if previous is not None and index > previous + 1:
+                result['skipped'] += index - previous - 1
+            previous = index
+        writer.close()
+        await writer.wait_closed()
+    except (OSError, ValueError) as e:
+        result['error'] = str(e)
+    finally:
+        ready.set()
+    result['words'] = len(latencies)
+    result['latency_ms'] = percentiles(latencies)
+    return result, latencies
+
+
+async def run_load(host, port, clients, seconds, wpm_range, seed):
+    """Run every client concurrently and summarize."""
+    rng = random.Random(seed)
+    go = asyncio.Event()
+    ready = [asyncio.Event() for _ in range(clients)]
+    tasks = [asyncio.create_task(run_client(
+                 number, host, port, rng.randint(*wpm_range),
+                 random.Random(rng.random()), seconds, ready[number], go))
+             for number in range(clients)]
+    # Every client connects and receives the document before any plays
+    await asyncio.gather(*(event.wait() for event in ready))
+    go.set()
+    outcomes = await asyncio.gather(*tasks)
+
+    per_client = [result for result, _ in outcomes]
+    pooled = [latency for _, latencies in outcomes for latency in latencies]
+    connected = [result for result in per_client if 'document_ms' in result]
+    client_p95 = [result['latency_ms']['p95'] for result in per_client
+                  if result['latency_ms']]
+    return {
+        'clients': clients,
+        'connected': len(connected),
+        'dropped': sum(result['dropped'] for result in per_client),
+        'errors': sum(result['error'] is not None for result in per_client),
+        'words_received': len(pooled),
+        'words_skipped': sum(result['skipped'] for result in per_client),
+        'latency_ms': percentiles(pooled),
+        'client_p95_latency_ms': describe(client_p95) if client_p95 else None,
+        'connect_ms': describe([result['connect_ms'] for result in connected])
+        if connected else None,
+        'document_ms': describe([result['document_ms'] for result in connected])
+        if connected else None,
+        'per_client': per_client,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('document', nargs='?', default=DEFAULT_DOCUMENT)
+    parser.add_argument('--clients', type=int, default=300)
+    parser.add_argument('--seconds', type=float, default=10.0,
+                        help='how long every client plays')
+    parser.add_argument('--wpm-range', type=int, nargs=2, default=(200, 600),
+                        metavar=('LOW', 'HIGH'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+
+    process, host, port = start_server(args.document, args.wpm_range[0])
+    try:
+        report = asyncio.run(run_load(host, port, args.clients, args.seconds,
+                                      args.wpm_range, args.seed))
+    finally:
+        process.terminate()
+        process.wait()
+    report = {'environment': environment(sys.executable), 'document': args.document,
+              'seconds': args.seconds, **report}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+# benchmarks/bench_startup.py
+"""
+Startup benchmark: process start to window, and file open to first word.
+
+Launches the app headless (see benchmarks.app_startup) --repeat times
+per scenario, each run in a fresh process:
+
+    window  launch to first frame, no document
+    small   the same, then open a short test file and time to its first word
+    large   the same with a generated document of --large-words words
+
+Each scenario gets its own data directory, warmed by one unrecorded
+launch, so the numbers are for a returning user whose caches (font index
+and so on) already exist, without depending on the user's own data.
+
+Results, with summary statistics over the repeats, are written as JSON so
+runs can be compared across commits.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_startup [--repeat N] [--output results.json]
+    python -m benchmarks.bench_startup --scenarios small large --large-words 2000000
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.headless import (HEADLESS_ENVIRONMENT, START_VARIABLE,
+                                 DATA_DIR_VARIABLE, FILE_VARIABLE)
+
+SMALL_DOCUMENT = 'test_files/The_Ultimate_Display.txt'
+SCENARIOS = ('window', 'small', 'large')
+
+
+def launch(python, module='benchmarks.app_startup', filepath=None, flags=(),
+           data_dir=None):
+    """
+    Run the app once in a fresh process.
+
+    Args:
+        python: Interpreter to launch
+        module: Launcher module (prints WINDOW/FIRST_WORD markers)
+        filepath: Optional document to open once the window is up
+        flags: Extra interpreter flags, e.g. ('-X', 'importtime')
+        data_dir: App data directory; a temporary empty one if not given
+
+    Returns:
+        (dict of marker name to seconds, completed process)
+
+    Raises:
+        RuntimeError: If the run ends without the expected markers
+    """
+    temporary = data_dir is None
+    if temporary:
+        data_dir = tempfile.mkdtemp(prefix='rsvp-bench-')
+    env = dict(os.environ)
+    env[DATA_DIR_VARIABLE] = data_dir
+    env.pop(FILE_VARIABLE, None)
+    if filepath:
+        env[FILE_VARIABLE] = os.path.abspath(filepath)
+    env[START_VARIABLE] = repr(time.time())
+    try:
+        result = subprocess.run([python, *flags, '-m', module],
+                                capture_output=True, text=True, env=env)
+    finally:
+        if temporary:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    markers = {}
+    for line in result.stdout.splitlines():
+        name, _, value = line.partition(' ')
+        if name in ('WINDOW', 'FIRST_WORD'):
+            markers[name] = float(value)
+    expected = ('WINDOW', 'FIRST_WORD') if filepath else ('WINDOW',)
+    if not all(name in markers for name in expected):
+        output = (result.stdout.splitlines()[-5:]
+                  + [line for line in result.stderr.splitlines()
+                     if not line.startswith('import time:')][-20:])
+        raise RuntimeError(f'app exited ({result.returncode}) before '
+                           f'{" and ".join(expected)}:\n' + '\n'.join(output))
+    return markers, result
+
+
+def generate_document(path, words, source=SMALL_DOCUMENT):
+    """Write a document of at least the given number of words by repeating source."""
+    with open(source, encoding='utf-8') as file:
+        text = file.read().strip()
+    per_copy = len(text.split())
+    copies = max(1, -(-words // per_copy))
+    with open(path, 'w', encoding='utf-8') as file:
+        for _ in range(copies):
+            file.write(text)
+            file.write('\n\n')
+    return copies * per_copy
+
+
+def describe(samples):
+    """Summary statistics for one measurement."""
+    return {
+        'samples': [round(sample, 4) for sample in samples],
+        'min': round(min(samples), 4),
+        'median': round(statistics.median(samples), 4),
+        'mean': round(statistics.fmean(samples), 4),
+        'stdev': round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+        'max': round(max(samples), 4),
+    }
+
+
+def environment(python):
+    """Where the numbers came from."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit or None,
+        'python': python,
+        'platform': platform.platform(),
+        'window_provider': {key: os.environ.get(key, value)
+                            for key, value in HEADLESS_ENVIRONMENT.items()
+                            if key in ('SDL_VIDEODRIVER', 'KIVY_GL_BACKEND')},
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def run_scenario(python, filepath, repeat):
+    """Launch the app repeat times and summarize each marker."""
+    data_dir = tempfile.mkdtemp(prefix='rsvp-bench-')
+    try:
+        # One unrecorded launch warms the app's caches and the OS file cache
+        launch(python, filepath=filepath, data_dir=data_dir)
+        samples = {}
+        for _ in range(repeat):
+            markers, _ = launch(python, filepath=filepath, data_dir=data_dir)
+            for name, seconds in markers.items():
+                samples.setdefault(name, []).append(seconds)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return {
+        'time_to_window_s': describe(samples['WINDOW']),
+        **({'open_to_first_word_s': describe(samples['FIRST_WORD'])}
+           if 'FIRST_WORD' in samples else {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS,
+                        default=list(SCENARIOS))
+    parser.add_argument('--small', default=SMALL_DOCUMENT,
+                        help='document for the small scenario')
+    parser.add_argument('--large-words', type=int, default=1_000_000,
+                        help='words in the generated large document')
+    parser.add_argument('--python', default=sys.executable,
+                        help='interpreter to launch the app with')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+
+    report = {'environment': environment(args.python), 'repeat': args.repeat,
+              'scenarios': {}}
+    workdir = tempfile.mkdtemp(prefix='rsvp-bench-docs-')
+    try:
+        for scenario in args.scenarios:
+            if scenario == 'window':
+                filepath, words = None, 0
+            elif scenario == 'small':
+                filepath = args.small
+                with open(filepath, encoding='utf-8') as file:
+                    words = len(file.read().split())
+            else:
+                filepath = os.path.join(workdir, 'large.txt')
+                words = generate_document(filepath, args.large_words)
+            result = run_scenario(args.python, filepath, args.repeat)
+            if filepath:
+                result['document_words'] = words
+            report['scenarios'][scenario] = result
+            print(f'{scenario}: done', file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+# benchmarks/bench_text_pipeline.py
+"""
+Micro- and macro-benchmarks for the text pipeline, with a compare mode.
+
+    micro  Per-call cost, in microseconds, of calculate_focus_character,
+           calculate_display_duration, format_word_with_focus and
+           TextMetrics.get_text_extents over every word of the bundled
+           test files. These are per-word operations, so their cost per
+           call does not depend on document size.
+    macro  Time, in milliseconds, for parse_timecoded_text and
+           FileHandler.load_file (.txt and .timecode) on each bundled test
+           file and on generated documents of each --sizes word count.
+
+Every measurement is repeated --repeat times after one unrecorded run and
+reported with summary statistics, keyed like "macro/load_file.txt/1000000",
+so results can be compared across commits:
+
+    python -m benchmarks.bench_text_pipeline --compare base.json new.json
+
+flags every benchmark whose median is more than --threshold slower (or
+faster), and whose samples do not overlap the base's, and exits with
+status 1 if any regressed.
+
+The default sizes stop at 1M words. 10M words works but needs several GB
+of memory for the parsed Word objects.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_text_pipeline [--repeat N] [--output results.json]
+    python -m benchmarks.bench_text_pipeline --sizes 100000 10000000 --skip-micro
+"""
+
+from benchmarks.headless import configure_headless
+configure_headless()
+
+import argparse
+import gc
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_startup import describe, environment, generate_document
+from timecoded_transcript import parse_timecoded_text
+from utils.file_handler import FileHandler
+from utils.text_processor import TextProcessor
+
+FONT_PATH = 'fonts/OpenDyslexic-Regular.otf'
+FONT_SIZE = 24
+TEST_FILES_DIR = 'test_files'
+TEXT_SOURCE = 'test_files/The_Ultimate_Display.txt'
+TIMECODE_SOURCE = 'test_files/The_Ultimate_Display.timecode'
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+TIMESTAMP = re.compile(r'\[t(\d+\.\d+)\]')
+# Kivy's logger (imported with constants) replaces sys.stderr
+PROGRESS = sys.__stderr__
+
+
+def measure(function, repeat):
+    """
+    Time function() repeat times after one unrecorded warm-up call.
+
+    Returns:
+        List of elapsed seconds, one per repeat
+    """
+    function()
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def scaled(samples, factor):
+    """Samples converted to another unit, e.g. seconds per call to microseconds."""
+    return [sample * factor for sample in samples]
+
+
+def generate_timecode(path, words, source=TIMECODE_SOURCE):
+    """
+    Write a timecoded document of at least words words by repeating source,
+    shifting each copy's timestamps so time keeps moving forward.
+    """
+    with open(source, encoding='utf-8') as file:
+        text = file.read().strip()
+    per_copy = len(text.split())
+    duration = max(float(stamp) for stamp in TIMESTAMP.findall(text)) + 1.0
+    copies = max(1, -(-words // per_copy))
+    with open(path, 'w', encoding='utf-8') as file:
+        for copy in range(copies):
+            offset = copy * duration
+            file.write(TIMESTAMP.sub(
+                lambda match: f'[t{float(match.group(1)) + offset:.2f}]', text))
+            file.write(' ')
+    return copies * per_copy
+
+
+def bundled_words():
+    """Every word of the bundled text files, in document order."""
+    words = []
+    for name in sorted(os.listdir(TEST_FILES_DIR)):
+        if name.endswith('.txt'):
+            words.extend(word.text for word in
+                         FileHandler.load_file(os.path.join(TEST_FILES_DIR, name)))
+    return words
+
+
+def run_micro(repeat):
+    """Per-call benchmarks of the per-word functions."""
+    # Imported here so --skip-micro runs never load FreeType or HarfBuzz
+    from kivy_text_metrics import TextMetrics
+
+    words = bundled_words()
+    text_processor = TextProcessor()
+    metrics = TextMetrics(FONT_PATH, FONT_SIZE)
+    focus = [text_processor.calculate_focus_character(word) for word in words]
+    # Extents are scaled to a texture width; the HarfBuzz width keeps the scale near 1
+    sizes = [(max(1, int(sum(metrics.get_glyph_advances(word)))), FONT_SIZE * 2)
+             for word in words]
+
+    def focus_characters():
+        for word in words:
+            text_processor.calculate_focus_character(word)
+
+    def display_durations():
+        for word in words:
+            text_processor.calculate_display_duration(word, 300)
+
+    def formatted_words():
+        for word, focus_pos in zip(words, focus):
+            text_processor.format_word_with_focus(word, focus_pos)
+
+    def text_extents():
+        for word, size in zip(words, sizes):
+            metrics.get_text_extents(word, size)
+
+    results = {}
+    for name, function in (('calculate_focus_character', focus_characters),
+                           ('calculate_display_duration', display_durations),
+                           ('format_word_with_focus', formatted_words),
+                           ('get_text_extents', text_extents)):
+        samples = measure(function, repeat)
+        results[f'micro/{name}'] = {
+            'unit': 'us',
+            'calls': len(words),
+            **describe(scaled(samples, 1e6 / len(words))),
+        }
+        print(f'micro/{name}: done', file=PROGRESS)
+    return results
+
+
+def run_macro(documents, repeat):
+    """
+    Parse and load benchmarks over whole documents.
+
+    Args:
+        documents: (label, text path, timecode path, words) tuples
+        repeat: Recorded runs per benchmark
+    """
+    results = {}
+    for label, text_path, timecode_path, words in documents:
+        with open(timecode_path, encoding='utf-8') as file:
+            timecoded = file.read()
+        for name, function in (
+                ('parse_timecoded_text', lambda: parse_timecoded_text(timecoded)),
+                ('load_file.txt', lambda: FileHandler.load_file(text_path)),
+                ('load_file.timecode', lambda: FileHandler.load_file(timecode_path))):
+            samples = measure(function, repeat)
+            results[f'macro/{name}/{label}'] = {
+                'unit': 'ms',
+                'words': words,
+                **describe(scaled(samples, 1e3)),
+            }
+        del timecoded
+        print(f'macro/{label}: done', file=PROGRESS)
+    return results
+
+
+def compare(base, new, threshold):
+    """
+    Compare the medians of two result files.
+
+    Args:
+        base: Results to compare against
+        new: Results to check
+        threshold: Relative median change (e.g. 0.1 for 10%) beyond which
+            a benchmark counts as a regression or improvement, provided
+            its samples and the base's do not overlap (so noise alone
+            does not flag it)
+
+    Returns:
+        (report lines, number of regressions)
+    """
+    base_results, new_results = base['results'], new['results']
+    lines = [f'{"benchmark":<48} {"base":>12} {"new":>12} {"change":>8}']
+    regressions = 0
+    for key in sorted(set(base_results) | set(new_results)):
+        if key not in new_results:
+            lines.append(f'{key:<48} {"":>12} {"":>12}  removed')
+            continue
+        if key not in base_results:
+            lines.append(f'{key:<48} {"":>12} {"":>12}  added')
+            continue
+        before, after = base_results[key], new_results[key]
+        unit = after['unit']
+        change = after['median'] / before['median'] - 1.0 if before['median'] else 0.0
+        if change > threshold and after['min'] > before['max']:
+            status = 'REGRESSION'
+            regressions += 1
+        elif change < -threshold and after['max'] < before['min']:
+            status = 'improved'
+        else:
+            status = ''
+        lines.append(f'{key:<48} {before["median"]:>9.3f} {unit:<2} '
+                     f'{after["median"]:>9.3f} {unit:<2} {change:>+7.1%}  {status}')
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sizes', type=int, nargs='*', default=list(DEFAULT_SIZES),
+                        help='word counts of the generated documents')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-macro', action='store_true')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'),
+                        help='compare two result files instead of running')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative median change flagged by --compare')
+    args = parser.parse_args()
+
+    if args.compare:
+        results = []
+        for path in args.compare:
+            with open(path, encoding='utf-8') as file:
+                results.append(json.load(file))
+        lines, regressions = compare(*results, args.threshold)
+        print('\n'.join(lines))
+        sys.exit(1 if regressions else 0)
+
+    report = {'environment': environment(sys.executable), 'repeat': args.repeat,
+              'results': {}}
+    if not args.skip_micro:
+        report['results'].update(run_micro(args.repeat))
+    if not args.skip_macro:
+        documents = []
+        for name in sorted(os.listdir(TEST_FILES_DIR)):
+            stem, extension = os.path.splitext(name)
+            if extension == '.txt':
+                text_path = os.path.join(TEST_FILES_DIR, name)
+                timecode_path = os.path.join(TEST_FILES_DIR, stem + '.timecode')
+                with open(text_path, encoding='utf-8') as file:
+                    documents.append((stem, text_path, timecode_path,
+                                      len(file.read().split())))
+        workdir = tempfile.mkdtemp(prefix='rsvp-bench-docs-')
+        try:
+            for size in args.sizes:
+                text_path = os.path.join(workdir, f'{size}.txt')
+                timecode_path = os.path.join(workdir, f'{size}.timecode')
+                words = generate_document(text_path, size, TEXT_SOURCE)
+                generate_timecode(timecode_path, size)
+                documents.append((str(size), text_path, timecode_path, words))
+            report['results'].update(run_macro(documents, args.repeat))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/bench_word_display.py
+"""
+Per-word main-thread cost of showing a word, before and after WordDisplay.
+
+"label" reproduces the original approach: a Label inside a RelativeLayout
+whose pos_hint, width, x and y are rewritten for every word. "direct" is
+the WordDisplay widget used by RSVPReader. Both measure focus offsets the
+same way, so the difference is the widget and layout cost. Each sample
+covers the update itself plus one event loop iteration, which runs the
+layout triggers and the canvas draw.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_word_display [file] [--words N]
+"""
+
+from benchmarks.headless import configure_headless
+configure_headless()
+
+import argparse
+import statistics
+import time
+
+from kivy.config import Config
+# Don't let the clock sleep to hold the frame rate, only the work is timed
+Config.set('graphics', 'maxfps', '0')
+
+from kivy.base import EventLoop
+from kivy.core.window import Window
+from kivy.metrics import dp
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.relativelayout import RelativeLayout
+
+from constants import DISPLAY_HEIGHT
+from kivy_text_metrics import TextMetrics
+from utils.file_handler import FileHandler
+from utils.text_processor import TextProcessor
+from widgets.word_display import WordDisplay
+
+FONT_PATH = 'fonts/OpenDyslexic-Regular.otf'
+FONT_SIZE = 24
+
+
+def focus_width(metrics, text, focus_pos, texture_size):
+    """Focus offset measured from a rendered texture, as update_display does."""
+    glyph_attribs, _, _ = metrics.get_text_extents(text, texture_size)
+    width = sum(attrib[6] for attrib in glyph_attribs[:focus_pos])
+    if focus_pos < len(glyph_attribs):
+        width += glyph_attribs[focus_pos][6] / 2
+    return width
+
+
+class LabelDisplay:
+    """The original Label based word display."""
+
+    def __init__(self, root):
+        self.container = RelativeLayout(size_hint=(1, None), height=DISPLAY_HEIGHT)
+        self.label = Label(markup=True, size_hint=(None, None), height=DISPLAY_HEIGHT,
+                           font_name=FONT_PATH, font_size=dp(FONT_SIZE),
+                           pos_hint={'center_x': 0.5, 'center_y': 0.5})
+        self.container.add_widget(self.label)
+        root.add_widget(self.container)
+
+    def show(self, metrics, text, focus_pos, markup):
+        self.label.pos_hint = {}
+        self.label.text = markup
+        self.label.texture_update()
+        width = focus_width(metrics, text, focus_pos, self.label.texture_size)
+        self.label.width = self.label.texture_size[0]
+        self.label.x = self.container.width / 2 - width
+        self.label.y = self.container.height / 2 - self.label.height / 2
+
+
+class DirectDisplay:
+    """The WordDisplay based word display."""
+
+    def __init__(self, root):
+        self.display = WordDisplay(size_hint=(1, None), height=DISPLAY_HEIGHT,
+                                   font_name=FONT_PATH, font_size=dp(FONT_SIZE))
+        root.add_widget(self.display)
+
+    def show(self, metrics, text, focus_pos, markup):
+        texture = self.display.prepare(markup)
+        width = focus_width(metrics, text, focus_pos, texture.size)
+        self.display.show(texture, width, markup)
+
+
+def run(display_class, words, metrics, text_processor):
+    """Show every word once and return the per-word times in seconds."""
+    root = BoxLayout(orientation='vertical')
+    root.add_widget(BoxLayout(size_hint_y=None, height=dp(44)))
+    display = display_class(root)
+    Window.add_widget(root)
+    EventLoop.idle()
+
+    samples = []
+    try:
+        for text in words:
+            focus_pos = text_processor.calculate_focus_character(text)
+            markup = text_processor.format_word_with_focus(text, focus_pos)
+            start = time.perf_counter()
+            display.show(metrics, text, focus_pos, markup)
+            EventLoop.idle()
+            samples.append(time.perf_counter() - start)
+    finally:
+        Window.remove_widget(root)
+    return samples
+
+
+def summarize(name, samples):
+    """Print mean and percentiles in microseconds."""
+    ordered = sorted(samples)
+    percentile = lambda p: ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+    print(f"{name:>8}: mean {statistics.mean(samples) * 1e6:8.1f}us  "
+          f"p50 {percentile(0.50) * 1e6:8.1f}us  "
+          f"p95 {percentile(0.95) * 1e6:8.1f}us  "
+          f"p99 {percentile(0.99) * 1e6:8.1f}us  ({len(samples)} words)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file', nargs='?', default='test_files/The_Ultimate_Display.txt')
+    parser.add_argument('--words', type=int, default=2000,
+                        help='number of words to show per run')
+    args = parser.parse_args()
+
+    texts = [word.text for word in FileHandler.load_file(args.file)]
+    words = (texts * (args.words // len(texts) + 1))[:args.words]
+    metrics = TextMetrics(FONT_PATH, FONT_SIZE)
+    text_processor = TextProcessor()
+
+    EventLoop.ensure_window()
+    # Warm up font loading and caches before timing either display
+    run(DirectDisplay, words[:50], metrics, text_processor)
+    summarize('label', run(LabelDisplay, words, metrics, text_processor))
+    summarize('direct', run(DirectDisplay, words, metrics, text_processor))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+# benchmarks/corpus_generator.py
+"""
+Synthetic .txt and .timecode documents of any size, for scale testing.
+
+Word frequencies follow a Zipf distribution over a fixed vocabulary:
+common English function words take the top ranks and the rest are
+pronounceable pseudo-words, with shorter words given higher ranks as in
+real text. Words are grouped into sentences and paragraphs of realistic
+length, with capitalization, commas and occasional [n] references.
+
+Timecoded output also exercises every quirk parse_timecoded_text handles:
+duplicate timestamps, timestamps that jump backwards, escaped \\[t...]
+tokens, words before the first and after the last timestamp, runs of
+words sharing one timestamp and timestamps without a following space.
+
+Output is fully determined by the seed and streamed to disk in chunks,
+so multi-GB documents need no more memory than small ones.
+
+Usage (from the repository root):
+    python -m benchmarks.corpus_generator out/ --words 1000000
+    python -m benchmarks.corpus_generator out/ --megabytes 2048 --formats timecode --seed 7
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+from typing import Iterator, List
+
+# Most frequent English words, by rank
+COMMON_WORDS = (
+    'the of and to a in is that for it as was with be by on not he I this '
+    'are or his from at which but have an they you were her she there one '
+    'all we their has been would when who will more if no out so said what '
+    'up its about into than them can only other new some could time these '
+    'two may then do first any my now such like our over man me even most '
+    'made after also did many before must through back years where much '
+    'your way well down should because each just those people how too '
+    'little state good very make world still own see men work long get here'
+).split()
+
+ONSETS = ('', 'b', 'c', 'd', 'f', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'r',
+          's', 't', 'v', 'w', 'bl', 'br', 'ch', 'cl', 'cr', 'dr', 'fl', 'fr',
+          'gr', 'pl', 'pr', 'sh', 'sl', 'sp', 'st', 'str', 'th', 'tr', 'wh')
+VOWELS = ('a', 'e', 'i', 'o', 'u', 'a', 'e', 'i', 'o', 'ea', 'ou', 'ai', 'ie', 'y')
+CODAS = ('', '', '', 'n', 'r', 's', 't', 'l', 'd', 'm', 'ng', 'nt', 'st',
+         'ck', 'rd', 'th', 'ss', 'x')
+
+VOCABULARY_SIZE = 50_000
+ZIPF_EXPONENT = 1.07
+CHUNK_PARTS = 65_536  # Pieces of text buffered before each write to disk
+
+# Probability per word of each timecode quirk
+TIMECODE_QUIRKS = {
+    'unstamped': 0.15,  # Word shares the previous word's timestamp
+    'duplicate': 0.01,  # Timestamp repeated
+    'backwards': 0.005,  # Timestamp earlier than the previous one
+    'escaped': 0.002,  # \[t...] token that is part of the text
+    'no_space': 0.02,  # Timestamp directly after the previous word
+}
+
+
+class CorpusGenerator:
+    """
+    Deterministic source of realistic words, sentences and paragraphs.
+
+    Args:
+        seed: Seed for every random choice
+        vocabulary_size: Distinct words drawn from
+        zipf_exponent: Exponent s of the rank frequency law 1 / rank**s
+    """
+
+    def __init__(self, seed: int = 0, vocabulary_size: int = VOCABULARY_SIZE,
+                 zipf_exponent: float = ZIPF_EXPONENT):
+        self.random = random.Random(seed)
+        self.vocabulary = self._build_vocabulary(vocabulary_size)
+        self.cumulative_weights = list(itertools.accumulate(
+            1.0 / rank ** zipf_exponent
+            for rank in range(1, len(self.vocabulary) + 1)
+        ))
+
+    def _pseudo_word(self) -> str:
+        """A pronounceable word of one to five syllables."""
+        syllables = min(5, 1 + int(self.random.expovariate(0.9)))
+        return ''.join(
+            self.random.choice(ONSETS) + self.random.choice(VOWELS)
+            + self.random.choice(CODAS)
+            for _ in range(syllables)
+        )
+
+    def _build_vocabulary(self, size: int) -> List[str]:
+        """Common words first, then unique pseudo-words, shorter ones ranked higher."""
+        vocabulary = list(dict.fromkeys(COMMON_WORDS))[:size]
+        seen = set(vocabulary)
+        invented = []
+        while len(vocabulary) + len(invented) < size:
+            word = self._pseudo_word()
+            if word not in seen:
+                seen.add(word)
+                invented.append(word)
+        # Length with noise, so short words are frequent but not exclusively so
+        invented.sort(key=lambda word: len(word) + self.random.gauss(0, 2))
+        return vocabulary + invented
+
+    def words(self, count: int) -> List[str]:
+        """count words drawn from the Zipf distribution."""
+        return self.random.choices(self.vocabulary,
+                                   cum_weights=self.cumulative_weights, k=count)
+
+    def sentences(self) -> Iterator[List[str]]:
+        """Endless punctuated sentences of 3 to 40 words."""
+        while True:
+            length = max(3, min(40, int(self.random.gauss(17, 7))))
+            words = self.words(length)
+            words[0] = words[0][:1].upper() + words[0][1:]
+            sentence = []
+            for word in words[:-1]:
+                roll = self.random.random()
+                if roll < 0.002:
+                    # A reference is its own token, like "BEFLIX [1], is"
+                    reference = f'[{self.random.randint(1, 60)}]'
+                    sentence += [word, reference + (',' if roll < 0.001 else '')]
+                elif roll < 0.062:
+                    sentence.append(word + ',')
+                else:
+                    sentence.append(word)
+            sentence.append(words[-1] + self.random.choices('.?!', weights=(90, 6, 4))[0])
+            yield sentence
+
+    def paragraphs(self) -> Iterator[List[str]]:
+        """Endless paragraphs of 1 to 9 sentences, as flat word lists."""
+        sentences = self.sentences()
+        while True:
+            count = max(1, min(9, int(self.random.gauss(4.5, 2))))
+            yield [word for _ in range(count) for word in next(sentences)]
+
+
+class _Sink:
+    """Buffered writer that counts words and bytes (the output is ASCII)."""
+
+    def __init__(self, file):
+        self.file = file
+        self.parts: List[str] = []
+        self.words = 0
+        self.bytes = 0
+
+    def add(self, text: str, words: int = 0):
+        self.parts.append(text)
+        self.words += words
+        self.bytes += len(text)
+        if len(self.parts) >= CHUNK_PARTS:
+            self.flush()
+
+    def flush(self):
+        self.file.write(''.join(self.parts))
+        self.parts = []
+
+
+def write_text(path: str, generator: CorpusGenerator, words: int = 0,
+               max_bytes: int = 0) -> int:
+    """
+    Write a text document, one paragraph per line with blank lines between.
+
+    Stops at the end of the paragraph that reaches words words or
+    max_bytes bytes, whichever limit is given.
+
+    Returns:
+        Number of words written
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        sink = _Sink(file)
+        for paragraph in generator.paragraphs():
+            sink.add(' '.join(paragraph) + '\n\n', len(paragraph))
+            if _done(sink, words, max_bytes):
+                break
+        sink.flush()
+    return sink.words
+
+
+def write_timecode(path: str, generator: CorpusGenerator, words: int = 0,
+                   max_bytes: int = 0, quirks: dict = TIMECODE_QUIRKS) -> int:
+    """
+    Write a timecoded transcript with [tSECONDS] stamps before words.
+
+    The first paragraph has no timestamps (words before the first stamp)
+    and neither does the last (words after the last stamp). Limits work
+    as for write_text.
+
+    Returns:
+        Number of words written
+    """
+    rng = random.Random(generator.random.random())
+    now = 0.0
+    with open(path, 'w', encoding='utf-8') as file:
+        sink = _Sink(file)
+        paragraphs = generator.paragraphs()
+        leading = next(paragraphs)
+        sink.add(' '.join(leading), len(leading))
+        while not _done(sink, words, max_bytes):
+            for word in next(paragraphs):
+                # About 150 words per minute with natural variation
+                now += rng.uniform(0.15, 0.65)
+                if rng.random() < quirks['unstamped']:
+                    sink.add(' ' + word, 1)
+                    continue
+                stamp = now
+                if rng.random() < quirks['backwards']:
+                    stamp = max(0.0, now - rng.uniform(0.5, 5.0))
+                sink.add('' if rng.random() < quirks['no_space'] else ' ')
+                sink.add(f'[t{stamp:.2f}]')
+                if rng.random() < quirks['duplicate']:
+                    sink.add(f'[t{stamp:.2f}]')
+                sink.add(word, 1)
+                if rng.random() < quirks['escaped']:
+                    sink.add(f' \\[t{rng.uniform(0, now + 1):.2f}]', 1)
+        trailing = next(paragraphs)
+        sink.add(' ' + ' '.join(trailing) + '\n', len(trailing))
+        sink.flush()
+    return sink.words
+
+
+def _done(sink: _Sink, words: int, max_bytes: int) -> bool:
+    """Whether either limit has been reached."""
+    if words and sink.words >= words:
+        return True
+    if max_bytes:
+        return sink.bytes >= max_bytes
+    return not words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', help='where to write the documents')
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--words', type=int, default=1_000_000,
+                      help='approximate words per document')
+    size.add_argument('--megabytes', type=float,
+                      help='approximate size per document instead of a word count')
+    parser.add_argument('--files', type=int, default=1,
+                        help='documents of each format')
+    parser.add_argument('--formats', nargs='+', choices=('txt', 'timecode'),
+                        default=['txt', 'timecode'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--vocabulary', type=int, default=VOCABULARY_SIZE)
+    parser.add_argument('--zipf', type=float, default=ZIPF_EXPONENT)
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    words = 0 if args.megabytes else args.words
+    max_bytes = int(args.megabytes * 1024 * 1024) if args.megabytes else 0
+    for number in range(args.files):
+        for extension in args.formats:
+            # One seed per document, so each file is reproducible on its own
+            seed = args.seed * 1_000_003 + number * 2 + (extension == 'timecode')
+            generator = CorpusGenerator(seed, args.vocabulary, args.zipf)
+            path = os.path.join(args.directory, f'corpus_{args.seed}_{number}.{extension}')
+            write = write_timecode if extension == 'timecode' else write_text
+            written = write(path, generator, words, max_bytes)
+            print(f'{path}: {written} words, {os.path.getsize(path)} bytes',
+                  file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+# benchmarks/headless.py
+
+import os
+
+# SDL2's offscreen video driver with Kivy's mock GL backend gives a real
+# Window (event loop, layout, canvas) without a display or GPU.
+HEADLESS_ENVIRONMENT = {
+    'SDL_VIDEODRIVER': 'offscreen',
+    'KIVY_GL_BACKEND': 'mock',
+    'KIVY_NO_ARGS': '1',
+    'KIVY_NO_CONSOLELOG': '1',
+    'KIVY_NO_FILELOG': '1',
+}
+
+# Passed by the startup benchmarks to the app they launch (see app_startup):
+# the launch time in seconds since the epoch, the app's data directory and
+# an optional document to open once the window is up
+START_VARIABLE = 'RSVP_BENCH_START'
+DATA_DIR_VARIABLE = 'RSVP_BENCH_DATA_DIR'
+FILE_VARIABLE = 'RSVP_BENCH_FILE'
+
+
+def configure_headless():
+    """
+    Configure Kivy to run without a display.
+
+    Must be called before any Kivy module (or constants.py) is imported.
+    Variables already set in the environment are left alone, so a real
+    window provider can still be forced from the command line.
+    """
+    for key, value in HEADLESS_ENVIRONMENT.items():
+        os.environ.setdefault(key, value)
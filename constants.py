@@ -1,11 +1,14 @@
 # constants.py
 
+import os
 from kivy.metrics import dp
 
-# Required packages and versions
+APP_DIRECTORY = os.path.dirname(os.path.abspath(__file__))  # Bundled directories are relative to this
+
+# Required packages (distribution names) and minimum versions
 REQUIRED_PACKAGES = [
     ('kivy', '2.3.0'),
-    ('freetype', None),
+    ('freetype-py', None),
     ('uharfbuzz', None),
     ('syllapy', None),
     ('pyphen', None),
@@ -20,7 +23,18 @@ DEFAULT_WINDOW_HEIGHT = 600
 DEFAULT_FONT = 'OpenDyslexic'
 DEFAULT_FONT_SIZE = 24
 FONT_SIZES = ['16', '20', '24', '28', '32', '36']
-FONT_NAMES = ['OpenDyslexic', 'APHont']
+FONT_NAMES = ['OpenDyslexic', 'APHont']  # Bundled fonts that must be available
+FONT_DIRECTORIES = [  # Installed fonts, after the bundled fonts/ directory
+    '/usr/local/share/fonts',
+    '/usr/share/fonts',
+    '~/.fonts',
+    '~/.local/share/fonts',
+    '/Library/Fonts',
+    '~/Library/Fonts',
+    '$WINDIR/Fonts',
+]
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.otc')
+FONT_INDEX_FILE = 'font_index.json'  # Written to the app's user data dir
 
 # Display settings
 DEFAULT_WPM = 300
@@ -28,10 +42,25 @@ WPM_VALUES = ['100', '200', '300', '400', '500']
 DEFAULT_FOCUS_OFFSET = 0.3  # Focus character position (30% into word)
 BASE_WPM = 300  # Base WPM for timecode scaling
 
+# Layout precomputation
+CALIBRATION_SAMPLE_SIZE = 64  # Rendered words used to fit each width predictor
+
 # Timing constants
 BASE_DURATION_FACTOR = 0.8  # Base duration multiplier
 LENGTH_FACTOR = 0.1  # Word length impact on timing
 SYLLABLE_FACTOR = 0.1  # Syllable count impact on timing
+PARAGRAPH_PAUSE_FACTOR = 1.0  # Extra base word durations after a paragraph
+
+# Timing instrumentation
+TIMING_BUFFER_SIZE = 65536  # Words kept per session for jitter statistics
+TIMING_SESSION_LIMIT = 100  # Latest session summaries kept; every seek ends a session
+DROPPED_WORD_THRESHOLD = 1 / 60.0  # Words shown for less than a frame count as dropped
+TIMING_REPORT_FILE = 'timing_report.json'  # Written to the app's user data dir
+PREPARE_AHEAD = 5  # Words rendered ahead of the current one after a seek
+LAYOUT_CACHE_SIZE = 4  # Font/size settings whose layouts and rendered words are kept
+REOPEN_LAST_DOCUMENT = True  # Reopen the last document at launch, ready to play
+SEARCH_RESULT_LIMIT = 100  # Hits listed in the search dialog
+SEARCH_CONTEXT_WORDS = 5  # Words of context shown either side of a hit
 
 # File settings
 SUPPORTED_EXTENSIONS = ['.txt', '.timecode']
@@ -41,12 +70,49 @@ TEST_FILES = [
     'You_Can_Do_That.timecode',
     'The_Ultimate_Display.timecode'
 ]
+DIRECTORY_CACHE_SIZE = 64  # Directory listings kept by the file browser
+LISTING_BATCH_SIZE = 200  # Entries read before the file browser list is updated
+
+# Resume positions
+RESUME_DB_FILE = 'resume.sqlite3'  # Written to the app's user data dir
+RESUME_SAVE_DELAY = 2.0  # Seconds saves are batched for before being written
+FINGERPRINT_BLOCK_SIZE = 4096  # Bytes per block hashed into a document fingerprint
+FINGERPRINT_BLOCKS = 8  # Blocks sampled across a document for its fingerprint
+
+# Library
+LIBRARY_DIRECTORIES = [os.path.join(APP_DIRECTORY, 'test_files'), '~/Documents']  # Scanned recursively for documents
+LIBRARY_INDEX_FILE = 'library.sqlite3'  # Written to the app's user data dir
+LIBRARY_CHUNK_SIZE = 16  # Documents sent to an indexing process at a time
+LIBRARY_COMMIT_BATCH = 256  # Documents indexed between commits
+
+# Precompiled documents (see precompile.py)
+COMPILED_EXTENSION = '.rsvpc'  # Appended to the document's file name
+COMPILED_CACHE_DIR = None  # Also searched for compiled documents, if set
+PRECOMPILE_CHUNK_SIZE = 8  # Documents sent to a precompile process at a time
+SHARE_DOCUMENTS = False  # Open documents through shared memory, one copy for every reader process
+
+# Schedule export (see export_schedule.py)
+EXPORT_BUFFER_SIZE = 1 << 20  # Bytes buffered before an export is written out
+
+# Frame export (see export_frames.py)
+FRAME_RATE = 30  # Frames per second of an exported reading session
+FRAME_SIZE = (1280, 720)  # Width and height of exported frames in pixels
+FRAME_FONT_SIZE = 64  # Font size of exported words in pixels
+FRAME_EXPORT_CHUNK_SIZE = 32  # Word images sent to a rendering process at a time
+
+# Streaming server (see utils.rsvp_server)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_SEND_LIMIT = 256 * 1024  # Bytes queued for a client before it is dropped as too slow
+SESSION_TIMING_BUFFER_SIZE = 1024  # Words of display timing kept per server session
+REMOTE_SERVER = None  # (host, port) of a server to follow instead of opening files
 
 # UI Constants
 PADDING = dp(10)
 SPACING = dp(10)
 BUTTON_HEIGHT = dp(44)
 DISPLAY_HEIGHT = dp(100)
+SCRUB_UPDATE_INTERVAL = 0.25  # Seconds between scrub bar updates while playing
 
 # Colors
 FOCUS_COLOR = 'ff0000'  # Red for focus character
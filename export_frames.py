@@ -0,0 +1,98 @@
+# export_frames.py
+"""
+Render a reading session to PNG frames, e.g. to make a video of it.
+
+Plays a document at a fixed WPM and frame rate without opening a window:
+each word is drawn with FreeType, focus character on the frame's center
+line as the reader shows it. Consecutive frames showing the same word
+are written once, as are repeated words, so the output directory holds
+one image per distinct word plus:
+
+    manifest.json    fps, wpm, frame size and frame count, and every run
+                     of frames as [first frame, frame count, image, word]
+    frames.ffconcat  the same runs as an ffmpeg concat script
+    frames/          with --sequence, every frame as frame_NNNNNNN.png
+                     (hard links to the images where possible)
+
+Images are rendered in a process pool, each worker taking a range of the
+session's frames.
+
+Usage:
+    python export_frames.py book.txt session/ --wpm 400
+    python export_frames.py book.txt session/ --fps 60 --size 1920 1080 --font APHont
+    ffmpeg -f concat -i session/frames.ffconcat -r 30 -pix_fmt yuv420p session.mp4
+"""
+
+import os
+# Kivy (pulled in by constants) must not parse this script's arguments
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+# ...nor replace sys.stderr, which progress is written to
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+import argparse
+import sys
+import time
+
+from constants import (DEFAULT_WPM, DEFAULT_FONT, FONT_DIRECTORIES, COMPILED_CACHE_DIR,
+                       FRAME_RATE, FRAME_SIZE, FRAME_FONT_SIZE)
+from utils.compiled_document import open_document
+from utils.font_index import FontIndex
+from utils.frame_export import export_frames
+
+
+def find_font(font):
+    """A font file given as a path, or by name from the bundled and installed fonts."""
+    if os.path.isfile(font):
+        return font
+    font_dirs = [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')]
+    for roots in (font_dirs, font_dirs + FONT_DIRECTORIES):
+        path = FontIndex.build(roots).path(font)
+        if path is not None:
+            return path
+    raise ValueError(f'Font not found: {font}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('document')
+    parser.add_argument('output_dir')
+    parser.add_argument('--wpm', type=float, default=DEFAULT_WPM)
+    parser.add_argument('--fps', type=float, default=FRAME_RATE)
+    parser.add_argument('--size', type=int, nargs=2, default=FRAME_SIZE,
+                        metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--font', default=DEFAULT_FONT,
+                        help='font name or font file')
+    parser.add_argument('--font-size', type=int, default=FRAME_FONT_SIZE,
+                        help='in pixels')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='rendering processes (default: one per CPU)')
+    parser.add_argument('--sequence', action='store_true',
+                        help='also write every frame to output_dir/frames/')
+    parser.add_argument('--cache-dir', default=COMPILED_CACHE_DIR,
+                        help='also look for a compiled document here')
+    args = parser.parse_args()
+
+    def progress(done, total):
+        print(f'\r{done}/{total} images', end='', file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    try:
+        font_path = find_font(args.font)
+        words, _, timeline, focus_positions = open_document(
+            args.document, cache_dir=args.cache_dir)
+        manifest = export_frames(words, timeline, args.wpm, args.output_dir,
+                                 font_path, args.font_size, tuple(args.size), args.fps,
+                                 focus_positions, args.workers, args.sequence,
+                                 on_progress=progress)
+    except KeyboardInterrupt:
+        print('\nInterrupted.', file=sys.stderr)
+        sys.exit(130)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f'\nError: {e}', file=sys.stderr)
+        sys.exit(1)
+    print(f'\n{manifest["frames"]} frames ({manifest["images"]} images) written to '
+          f'{args.output_dir} in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# export_schedule.py
+"""
+Export a document's reading schedule for external players and analytics.
+
+Writes every word with its focus character index, start time and display
+duration at a given WPM, exactly as the reader would show it. The
+document is prepared like the reader prepares it (from an up-to-date
+compiled file if there is one, see precompile.py), and the schedule is
+streamed out word by word through a buffered writer.
+
+Formats:
+    jsonl   One JSON object per line: index, text, focus, start, duration
+    csv     The same fields, with a header row
+    binary  A fixed-width layout a player can seek in, all little-endian:
+            header  magic b'RSVPT', u8 format version, u16 record size,
+                    u64 word count, f64 WPM (24 bytes)
+            records one per word: u64 text offset, u32 text length in
+                    bytes, u32 focus index, f64 start, f64 duration
+                    (32 bytes; word i is at 24 + 32 * i)
+            text    the UTF-8 text of every word, back to back, which
+                    the records' offsets point into
+
+Usage:
+    python export_schedule.py book.txt --wpm 400 > schedule.jsonl
+    python export_schedule.py book.txt --format binary --output schedule.rsvpt
+"""
+
+import os
+# Kivy (pulled in by constants) must not parse this script's arguments
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+# ...nor replace sys.stderr, which the summary is written to
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+import argparse
+import sys
+import time
+
+from constants import DEFAULT_WPM, COMPILED_CACHE_DIR
+from utils.compiled_document import open_document
+from utils.schedule_export import FORMATS, export_schedule, open_output
+
+# Formats chosen from the output file's extension when --format is not given
+EXTENSION_FORMATS = {'.jsonl': 'jsonl', '.csv': 'csv', '.rsvpt': 'binary',
+                     '.bin': 'binary'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('document')
+    parser.add_argument('--wpm', type=float, default=DEFAULT_WPM)
+    parser.add_argument('--format', choices=FORMATS,
+                        help="default: from the output's extension, else jsonl")
+    parser.add_argument('--output', default='-',
+                        help='file to write (default: stdout)')
+    parser.add_argument('--cache-dir', default=COMPILED_CACHE_DIR,
+                        help='also look for a compiled document here')
+    args = parser.parse_args()
+
+    format = args.format or EXTENSION_FORMATS.get(
+        os.path.splitext(args.output)[1].lower(), 'jsonl')
+    started = time.perf_counter()
+    try:
+        words, _, timeline, focus_positions = open_document(
+            args.document, cache_dir=args.cache_dir)
+        with open_output(args.output) as file:
+            count = export_schedule(words, timeline, args.wpm, file, format,
+                                    focus_positions)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+    print(f'{count} words exported as {format} in '
+          f'{time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -41,23 +41,8 @@ class TextMetrics:
         self.hb_font = hb.Font(self.hb_face)
         self.hb_font.scale = (self.font_size * 64, self.font_size * 64)
 
-    # Find the extents of the text for the specified font and size.
-    #
-    # Parameters:
-    # text: The string to be measured
-    # output_texture_size: The size of the texture that Kivy/SDL2 has already generated (e.g. for a Label)
-    #
-    # Return: A tuple of: glyph_attribs, ascender, descender
-    # glyph_attribs is a list of tuples of: rect_x, rect_y, rect_w, rect_h, glyph_ascent, glyph_descent, x_advance
-    # Those attribs specify bounding box of the glyph, ascent and descent (relative to baseline), and advance to the
-    # next glyph.
-    # The ascender, and descender specify the full ascent/descent for the font and can be used to determine the
-    # baseline.
-    def get_text_extents(self, text, output_texture_size):
-        # Extract needed face.size.* values from freetype
-        ascender = self.face.size.ascender / 64.0
-        descender = self.face.size.descender / 64.0
-
+    # Run the harfbuzz typesetting for text and return its (glyph_infos, glyph_positions).
+    def _shape(self, text):
         # Set up harfbuzz for typesetting
         hb_buffer = hb.Buffer()
         hb_buffer.add_str(text)
@@ -76,8 +61,47 @@ class TextMetrics:
         # The actual harfbuzz typesetting
         hb.shape(self.hb_font, hb_buffer, features)
 
-        glyph_info = hb_buffer.glyph_infos
-        glyph_positions = hb_buffer.glyph_positions
+        return hb_buffer.glyph_infos, hb_buffer.glyph_positions
+
+    # Find the unscaled harfbuzz horizontal advance of each glyph in text.
+    #
+    # This only shapes the text, it does not load any glyphs through freetype, so it is much cheaper than
+    # get_text_extents() and does not need a rendered texture. The advances are in the same (unscaled) units that
+    # get_text_extents() scales to the texture width, so they can be combined with a predicted texture width
+    # (see utils.width_predictor) to position text before Kivy has rendered it.
+    #
+    # Return: A list of x_advance floats, one per glyph
+    def get_glyph_advances(self, text):
+        _, glyph_positions = self._shape(text)
+        return [pos.x_advance / 64 for pos in glyph_positions]
+
+    # Shape text for drawing it directly with freetype (see utils.frame_export).
+    #
+    # Return: A list of (glyph_id, cluster, x_advance) tuples, one per glyph. cluster is the index of the first
+    # character of text the glyph was shaped from, and x_advance is unscaled, as in get_glyph_advances().
+    def get_glyphs(self, text):
+        glyph_infos, glyph_positions = self._shape(text)
+        return [(info.codepoint, info.cluster, pos.x_advance / 64)
+                for info, pos in zip(glyph_infos, glyph_positions)]
+
+    # Find the extents of the text for the specified font and size.
+    #
+    # Parameters:
+    # text: The string to be measured
+    # output_texture_size: The size of the texture that Kivy/SDL2 has already generated (e.g. for a Label)
+    #
+    # Return: A tuple of: glyph_attribs, ascender, descender
+    # glyph_attribs is a list of tuples of: rect_x, rect_y, rect_w, rect_h, glyph_ascent, glyph_descent, x_advance
+    # Those attribs specify bounding box of the glyph, ascent and descent (relative to baseline), and advance to the
+    # next glyph.
+    # The ascender, and descender specify the full ascent/descent for the font and can be used to determine the
+    # baseline.
+    def get_text_extents(self, text, output_texture_size):
+        # Extract needed face.size.* values from freetype
+        ascender = self.face.size.ascender / 64.0
+        descender = self.face.size.descender / 64.0
+
+        glyph_info, glyph_positions = self._shape(text)
 
         hb_glyph_attribs = []
         hb_x_cursor = 0
@@ -19,19 +19,26 @@ try:
 except:
     raise RuntimeError("This application requires Kivy 2.3.0")
 
+import itertools
 import os
+from importlib import metadata
 from pathlib import Path
-import bbcode  # Required for Kivy text markup
-from kivy.clock import Clock
+from kivy.clock import Clock, mainthread
 from kivy.app import App
+from kivy.core.window import Window
 from kivy.core.text import LabelBase
 from kivy.metrics import dp
 from kivy.config import Config
 from kivy.resources import resource_add_path
 
 from widgets.reader_widget import RSVPReader
+from utils.resume_store import ResumeStore
+from utils.font_index import (FontIndex, FontIndexBuilder, expand_directory,
+                              find_font_file)
 from constants import (DEFAULT_FONT, DEFAULT_FONT_SIZE, DEFAULT_WPM, 
-                      REQUIRED_PACKAGES)
+                      REQUIRED_PACKAGES, TIMING_REPORT_FILE, RESUME_DB_FILE,
+                      LIBRARY_INDEX_FILE, FONT_NAMES, FONT_DIRECTORIES,
+                      FONT_INDEX_FILE, REMOTE_SERVER)
 
 class RSVPApp(App):
     def __init__(self, **kwargs):
@@ -45,6 +52,7 @@ class RSVPApp(App):
         
         # Store font paths
         self.font_paths = {}
+        self.font_index = None
 
         # Register fonts
         self._register_fonts()
@@ -52,14 +60,20 @@ class RSVPApp(App):
 
         
     def _verify_requirements(self):
-        """Verify all required packages are installed."""
+        """
+        Verify all required packages are installed.
+        
+        Versions are read from the installed package metadata, so nothing
+        is imported here; the text-processing packages are only imported
+        when a document first needs them.
+        """
         missing = []
         for package, version in REQUIRED_PACKAGES:
             try:
-                module = __import__(package)
-                if version and not self._check_version(module.__version__, version):
+                installed = metadata.version(package)
+                if version and not self._check_version(installed, version):
                     missing.append(f"{package}>={version}")
-            except ImportError:
+            except metadata.PackageNotFoundError:
                 missing.append(package)
         
         if missing:
@@ -69,63 +83,118 @@ class RSVPApp(App):
             )
     
     def _check_version(self, current, required):
-        """Compare version strings."""
-        current_parts = [int(x) for x in current.split('.')]
-        required_parts = [int(x) for x in required.split('.')]
-        return current_parts >= required_parts
+        """Compare version strings, ignoring pre-release/local suffixes."""
+        def parts(version):
+            numbers = []
+            for part in version.split('.'):
+                digits = ''.join(itertools.takewhile(str.isdigit, part))
+                if not digits:
+                    break
+                numbers.append(int(digits))
+            return numbers
+        return parts(current) >= parts(required)
     
     def _register_fonts(self):
-        """Register custom fonts with Kivy."""
+        """
+        Register the required fonts with Kivy and load the installed font index.
+        
+        The bundled fonts are found by file name. The font index is kept in
+        the user data directory; if a font directory changed since it was
+        saved, it is rebuilt in the background and the saved index (if any)
+        is used meanwhile, so launching never opens font files. Other fonts
+        are registered when first selected (see register_font).
+        """
         try:
-            # Check both local and system-wide font locations
-            font_paths = [
-                os.path.join(os.path.dirname(__file__), 'fonts'),
-                '/usr/local/share/fonts',
-                os.path.expanduser('~/.fonts')
-            ]
-            
-            opendyslexic_found = aphont_found = False
+            # Bundled fonts first, so they win over installed fonts of the same name
+            bundled_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+            font_dirs = [bundled_dir] + [expand_directory(font_dir)
+                                         for font_dir in FONT_DIRECTORIES]
+            for font_dir in font_dirs:
+                resource_add_path(font_dir)
             
-            for font_path in font_paths:
-                resource_add_path(font_path)
-                
-                # Check for OpenDyslexic
-                if not opendyslexic_found:
-                    dyslexic_path = os.path.join(font_path, 'OpenDyslexic-Regular.otf')
-                    if os.path.exists(dyslexic_path):
-                        LabelBase.register('OpenDyslexic', dyslexic_path)
-                        self.font_paths['OpenDyslexic'] = dyslexic_path
-                        opendyslexic_found = True
-                
-                # Check for APHont
-                if not aphont_found:
-                    aphont_path = os.path.join(font_path, 'APHont-Regular.ttf')
-                    if os.path.exists(aphont_path):
-                        LabelBase.register('APHont', aphont_path)
-                        self.font_paths['APHont'] = aphont_path
-                        aphont_found = True
+            for font_name in FONT_NAMES:
+                path = find_font_file(bundled_dir, font_name)
+                if path is None:
+                    raise RuntimeError("Required fonts not found. Please ensure OpenDyslexic and APHont fonts are in the fonts directory.")
+                LabelBase.register(font_name, path)
+                self.font_paths[font_name] = path
             
-            if not (opendyslexic_found and aphont_found):
-                raise RuntimeError("Required fonts not found. Please ensure OpenDyslexic and APHont fonts are in the fonts directory.")
+            index_path = os.path.join(self.user_data_dir, FONT_INDEX_FILE)
+            self.font_index = FontIndex.load(index_path)
+            if self.font_index is None or self.font_index.is_stale(font_dirs):
+                FontIndexBuilder(index_path, font_dirs, self._on_font_index_built).start()
                 
         except Exception as e:
             raise RuntimeError(f"Error registering fonts: {str(e)}")
     
+    @mainthread
+    def _on_font_index_built(self, font_index):
+        """Use the rebuilt font index from now on."""
+        self.font_index = font_index
+    
+    def register_font(self, font_name):
+        """
+        Register an indexed font with Kivy if it is not already.
+        
+        Returns:
+            False if no such font is installed
+        """
+        if font_name in self.font_paths:
+            return True
+        path = self.font_index.path(font_name) if self.font_index else None
+        # An index being rebuilt may list a font that has since been removed
+        if path is None or not os.path.isfile(path):
+            return False
+        LabelBase.register(font_name, path)
+        self.font_paths[font_name] = path
+        return True
+    
+    def get_font_names(self):
+        """Names of every installed font, sorted."""
+        return self.font_index.names() if self.font_index else list(FONT_NAMES)
+    
     def get_font_path(self, font_name):
         """Get the full path for a given font name."""
+        self.register_font(font_name)
         return self.font_paths.get(font_name)
     
     def build(self):
         reader = RSVPReader()
         reader.app = self
+        reader.resume_store = ResumeStore(
+            os.path.join(self.user_data_dir, RESUME_DB_FILE))
+        reader.library_path = os.path.join(self.user_data_dir, LIBRARY_INDEX_FILE)
         Clock.schedule_once(lambda dt: self.update_display(), 0)
         return reader
     
+    def on_start(self):
+        """Start the warm-up once the window has drawn its first frame."""
+        Window.bind(on_flip=self._on_first_frame)
+    
+    def _on_first_frame(self, window):
+        Window.unbind(on_flip=self._on_first_frame)
+        if REMOTE_SERVER:
+            self.root.connect_to_server(*REMOTE_SERVER)
+        self.root.warm_up()
+    
+    def on_stop(self):
+        """Save the reading position and write the per-word display timing report."""
+        self.root.disconnect()
+        self.root.engine.pause()
+        self.root.save_resume_state()
+        self.root.resume_store.close()
+        recorder = self.root.engine.recorder
+        if recorder.sessions:
+            recorder.export_json(os.path.join(self.user_data_dir, TIMING_REPORT_FILE))
+    
     def update_display(self):
         """Update the display when settings change."""
         if hasattr(self, 'root'):
             self.root.word_display.font_name = self.font_name
             self.root.word_display.font_size = dp(self.font_size)
+            self.root.refresh_layout()
+            self.root.update_display()
+            self.root.save_resume_state()
 
 if __name__ == '__main__':
     RSVPApp().run()
\ No newline at end of file
@@ -0,0 +1,124 @@
+# precompile.py
+"""
+Precompile a library of documents so they open without parsing.
+
+Walks directory trees for .txt and .timecode files and, in a process
+pool, parses and tokenizes each one and precomputes its focus positions,
+base durations and sentence/paragraph boundaries. The result is written
+to a compiled file next to the document (document.txt.rsvpc), or into
+--cache-dir. The reader loads a compiled file instead of the document
+whenever one is up to date (see utils.compiled_document).
+
+Documents whose compiled file was made from the same size and mtime, or
+the same contents, are skipped, and compiled files are written
+atomically, so an interrupted run can simply be started again and
+resumes where it stopped.
+
+Usage:
+    python precompile.py ~/Documents/library [more directories...]
+    python precompile.py library/ --cache-dir ~/.rsvp-cache --workers 8
+"""
+
+import os
+# Kivy (pulled in by constants) must not parse this script's arguments
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+# ...nor replace sys.stderr, which progress is written to
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from constants import PRECOMPILE_CHUNK_SIZE
+from utils.compiled_document import compile_if_stale, compiled_path
+from utils.library_indexer import scan_directories
+
+PROGRESS_INTERVAL = 1.0  # Seconds between progress lines
+
+
+class Progress:
+    """Counts results and reports them at most once per PROGRESS_INTERVAL."""
+
+    def __init__(self, total, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.counts = {'compiled': 0, 'current': 0, 'failed': 0}
+        self.words = 0
+        self.started = time.perf_counter()
+        self._reported = 0.0
+        self._interactive = stream.isatty()
+
+    @property
+    def done(self):
+        return sum(self.counts.values())
+
+    def add(self, source, status, words, error):
+        """Record one document's result."""
+        self.counts[status] += 1
+        if status == 'compiled':
+            self.words += words
+        if error:
+            self.write(f'failed: {source}: {error}', final=True)
+        now = time.perf_counter()
+        if now - self._reported >= PROGRESS_INTERVAL:
+            self._reported = now
+            self.write(self.summary())
+
+    def summary(self):
+        """One line: position, counts, rate and time remaining."""
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        remaining = (self.total - self.done) / rate if rate else 0.0
+        return (f'[{self.done}/{self.total}] compiled {self.counts["compiled"]}, '
+                f'up to date {self.counts["current"]}, failed {self.counts["failed"]} '
+                f'- {rate:.1f} files/s, {remaining:.0f}s left')
+
+    def write(self, line, final=False):
+        """Show a line, overwriting the last progress line on a terminal."""
+        if self._interactive and not final:
+            self.stream.write('\r' + line + '\x1b[K')
+        else:
+            if self._interactive:
+                self.stream.write('\r\x1b[K')
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directories', nargs='+')
+    parser.add_argument('--cache-dir',
+                        help='write compiled files here instead of next to each document')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='recompile documents that are up to date')
+    args = parser.parse_args()
+
+    sources = sorted(path for path, _, _ in scan_directories(args.directories))
+    tasks = [(source, compiled_path(source, args.cache_dir), args.force)
+             for source in sources]
+    progress = Progress(len(tasks))
+    print(f'{len(tasks)} documents found', file=sys.stderr)
+
+    executor = ProcessPoolExecutor(max_workers=args.workers)
+    try:
+        for result in executor.map(compile_if_stale, tasks,
+                                   chunksize=PRECOMPILE_CHUNK_SIZE):
+            progress.add(*result)
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        progress.write(progress.summary(), final=True)
+        print('Interrupted; run again to resume.', file=sys.stderr)
+        sys.exit(130)
+    executor.shutdown()
+
+    progress.write(progress.summary(), final=True)
+    print(f'{progress.words} words compiled in '
+          f'{time.perf_counter() - progress.started:.1f}s', file=sys.stderr)
+    sys.exit(1 if progress.counts['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# serve.py
+"""
+Serve a document to RSVP reading stations over the local network.
+
+The document is parsed and prepared once; every client that connects
+gets its own position, speed and play state, and is streamed the words
+to show as they fall due (see utils.rsvp_server for the protocol). Point
+a reader at the server by setting REMOTE_SERVER in constants.py.
+
+Usage:
+    python serve.py test_files/The_Ultimate_Display.txt
+    python serve.py book.txt --host 0.0.0.0 --port 8765 --wpm 250
+"""
+
+import os
+# Kivy (pulled in by constants) must not parse this script's arguments
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+# ...nor replace sys.stderr, which status lines are written to
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+import argparse
+import asyncio
+import signal
+import sys
+
+from constants import DEFAULT_WPM, SERVER_HOST, SERVER_PORT
+from utils.rsvp_server import RSVPServer
+
+
+async def serve(args):
+    server = RSVPServer(args.document, args.host, args.port, args.wpm)
+    host, port = await server.start()
+    print(f'Serving {server.document.name} ({len(server.document.words)} words) '
+          f'on {host}:{port}', file=sys.stderr)
+    # SDL (loaded by Kivy's metrics) turns SIGTERM into a window event
+    # nobody reads here, so stop on it explicitly
+    task = asyncio.current_task()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, task.cancel)
+        except NotImplementedError:  # Windows: Ctrl+C still interrupts
+            pass
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('document')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--wpm', type=int, default=DEFAULT_WPM,
+                        help='starting speed of new sessions')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
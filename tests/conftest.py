@@ -0,0 +1,12 @@
+# tests/conftest.py
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tests import the app's modules from the repository root and run Kivy
+# headless (SDL2 offscreen driver, mock GL), before anything imports it
+sys.path.insert(0, ROOT)
+from benchmarks.headless import configure_headless
+configure_headless()
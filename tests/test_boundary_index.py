@@ -0,0 +1,89 @@
+# tests/test_boundary_index.py
+
+import pytest
+
+from utils.boundary_index import BoundaryIndex, ends_sentence
+from utils.file_handler import FileHandler
+
+TEXT = '''First one. Second one!
+
+Third sentence here? Fourth "quoted." Fifth.
+
+
+
+Last paragraph. Really the end.
+'''
+
+
+@pytest.fixture
+def boundaries():
+    boundaries = BoundaryIndex()
+    FileHandler._parse_text_file(TEXT, boundaries)
+    return boundaries
+
+
+def test_starts(boundaries):
+    assert len(boundaries) == 15
+    assert list(boundaries.sentence_starts) == [0, 2, 4, 7, 9, 10, 12]
+    assert list(boundaries.paragraph_starts) == [0, 4, 10]
+
+
+def test_empty_paragraphs_are_not_recorded(boundaries):
+    # Several blank lines are one paragraph break
+    assert list(boundaries.paragraph_of[9:11]) == [1, 2]
+    assert boundaries.ends_paragraph(9)
+    assert not boundaries.ends_paragraph(8)
+    assert not boundaries.ends_paragraph(14)
+
+
+def test_leading_blank_lines():
+    boundaries = BoundaryIndex()
+    FileHandler._parse_text_file('\n\nOnly. Words.\n\n', boundaries)
+    assert list(boundaries.paragraph_starts) == [0]
+    assert list(boundaries.sentence_starts) == [0, 1]
+
+
+def test_sentence_navigation(boundaries):
+    assert boundaries.next_sentence(0) == 2
+    assert boundaries.next_sentence(5) == 7
+    assert boundaries.previous_sentence(6) == 4
+    # At or one word into a sentence start goes back one more
+    assert boundaries.previous_sentence(4) == 2
+    assert boundaries.previous_sentence(5) == 2
+
+
+def test_sentence_navigation_at_document_edges(boundaries):
+    assert boundaries.previous_sentence(0) == 0
+    assert boundaries.previous_sentence(1) == 0
+    assert boundaries.next_sentence(14) == 14
+    assert boundaries.next_sentence(12) == 12
+
+
+def test_paragraph_navigation(boundaries):
+    assert boundaries.next_paragraph(0) == 4
+    assert boundaries.next_paragraph(6) == 10
+    assert boundaries.previous_paragraph(8) == 4
+    assert boundaries.previous_paragraph(10) == 4
+
+
+def test_paragraph_navigation_at_document_edges(boundaries):
+    assert boundaries.previous_paragraph(0) == 0
+    assert boundaries.previous_paragraph(1) == 0
+    assert boundaries.next_paragraph(14) == 14
+
+
+@pytest.mark.parametrize('token', ['end.', 'end!', 'why?', 'said."', 'aside.)', 'it.’'])
+def test_ends_sentence(token):
+    assert ends_sentence(token)
+
+
+@pytest.mark.parametrize('token', ['word', 'E.', 'Dr.', 'mr.', 'e.g.', 'i.e.', '(cf.', 'vs.', 'one,'])
+def test_initials_and_abbreviations_do_not_end_sentence(token):
+    assert not ends_sentence(token)
+
+
+def test_abbreviation_inside_sentence():
+    boundaries = BoundaryIndex()
+    FileHandler._parse_text_file('Ask Dr. Smith and J. R. Jones, e.g. today. Then go.',
+                                 boundaries)
+    assert list(boundaries.sentence_starts) == [0, 9]
@@ -0,0 +1,96 @@
+# tests/test_compiled_document.py
+
+import os
+import shutil
+
+import pytest
+
+from utils.compiled_document import (compile_document, compile_if_stale, compiled_path,
+                                     find_compiled, load_compiled, open_document)
+from utils.file_handler import FileHandler
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENTS = ['test_files/The_Ultimate_Display.txt',
+             'test_files/The_Ultimate_Display.timecode']
+
+
+def touch(path, offset_ns=1_000_000):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset_ns))
+
+
+@pytest.fixture(params=DOCUMENTS)
+def source(request, tmp_path):
+    path = tmp_path / os.path.basename(request.param)
+    shutil.copy(os.path.join(ROOT, request.param), path)
+    return str(path)
+
+
+def test_round_trip(source):
+    output = compiled_path(source)
+    count = compile_document(source, output)
+    compiled = load_compiled(output)
+
+    text_processor = TextProcessor()
+    words, boundaries = FileHandler.load_document(source)
+    timeline = Timeline.build(words, text_processor, boundaries)
+    assert count == len(words) == len(compiled.words)
+    assert [(w.text, w.start_time, w.end_time) for w in compiled.words] == \
+        [(w.text, w.start_time, w.end_time) for w in words]
+    assert compiled.timeline.units == timeline.units
+    assert compiled.timeline.starts == timeline.starts
+    for name in ('sentence_starts', 'paragraph_starts', 'sentence_of', 'paragraph_of'):
+        assert getattr(compiled.boundaries, name) == getattr(boundaries, name)
+    assert list(compiled.focus_positions) == [
+        text_processor.calculate_focus_character(w.text) for w in words]
+
+
+def test_open_document_uses_current_compiled_file(source):
+    assert open_document(source).focus_positions is None
+    compile_document(source, compiled_path(source))
+    assert find_compiled(source) == compiled_path(source)
+    assert open_document(source).focus_positions is not None
+
+
+def test_changed_mtime_or_size_is_stale(source):
+    output = compiled_path(source)
+    compile_document(source, output)
+    touch(source)
+    assert find_compiled(source) is None
+    assert open_document(source).focus_positions is None
+
+    compile_document(source, output)
+    with open(source, 'a', encoding='utf-8') as file:
+        file.write('\n\nAppended words.\n')
+    assert find_compiled(source) is None
+
+
+def test_compile_if_stale(source, tmp_path):
+    output = compiled_path(source, str(tmp_path / 'cache'))
+    source_path, status, words, error = compile_if_stale((source, output, False))
+    assert (source_path, status, error) == (source, 'compiled', None) and words
+    assert compile_if_stale((source, output, False))[1] == 'current'
+
+    # Same content with a new mtime: only the header is restamped
+    touch(source)
+    assert find_compiled(source, str(tmp_path / 'cache')) is None
+    assert compile_if_stale((source, output, False))[1] == 'current'
+    assert find_compiled(source, str(tmp_path / 'cache')) == output
+
+    # Changed content (the first line repeated): recompiled
+    with open(source, encoding='utf-8') as file:
+        first_line = file.readline()
+    with open(source, 'a', encoding='utf-8') as file:
+        file.write('\n' + first_line)
+    assert compile_if_stale((source, output, False))[:2] == (source, 'compiled')
+    assert len(load_compiled(output).words) > words
+    assert compile_if_stale((source, output, True))[1] == 'compiled'
+
+
+def test_not_a_compiled_file(tmp_path):
+    path = tmp_path / 'bad.rsvpc'
+    path.write_bytes(b'not compiled')
+    with pytest.raises(ValueError):
+        load_compiled(str(path))
@@ -0,0 +1,82 @@
+# tests/test_frame_export.py
+
+import json
+import math
+import os
+from array import array
+
+import pytest
+
+from utils.file_handler import FileHandler, Word
+from utils.frame_export import MANIFEST_FILE, FrameRun, export_frames, frame_runs
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENT = 'test_files/The_Ultimate_Display.txt'
+FONT = 'fonts/APHont-Regular.ttf'
+# Every word is shown for one second at 60 WPM
+UNIT = 60.0
+WPM = 60
+
+
+def timeline(*units):
+    return Timeline(array('d', units))
+
+
+def test_identical_frames_are_grouped():
+    assert frame_runs(timeline(UNIT, UNIT, UNIT), WPM, 10) == [
+        FrameRun(0, 0, 10), FrameRun(1, 10, 10), FrameRun(2, 20, 10)]
+
+
+@pytest.mark.parametrize('wpm, fps, frames', [
+    (60, 10, 10), (120, 10, 5), (60, 30, 30), (30, 24, 48), (250, 24, 5.76)])
+def test_frame_counts_at_speed(wpm, fps, frames):
+    runs = frame_runs(timeline(*[UNIT] * 20), wpm, fps)
+    assert [run.word for run in runs] == list(range(20))
+    # Each word starts on the first frame at or after its start time
+    for run in runs:
+        assert run.first_frame == math.ceil(run.word * frames - 1e-9)
+    assert sum(run.frames for run in runs) == math.ceil(20 * frames - 1e-9)
+
+
+def test_word_shorter_than_a_frame_has_no_run():
+    # Word 1 falls between the frames at 1.0s and 1.1s
+    assert frame_runs(timeline(65.0, 1.0, 54.0), WPM, 10) == [
+        FrameRun(0, 0, 11), FrameRun(2, 11, 9)]
+
+
+def test_runs_agree_with_playback():
+    words = FileHandler.load_file(os.path.join(ROOT, DOCUMENT))
+    document = Timeline.build(words, TextProcessor())
+    wpm, fps = 400, 24
+    runs = frame_runs(document, wpm, fps)
+    frame = 0
+    for word, first_frame, frames in runs:
+        assert first_frame == frame and frames > 0
+        for f in (first_frame, first_frame + frames - 1):
+            assert document.index_at(f / fps, wpm) == word
+        frame += frames
+    assert frame == math.ceil(document.total_time(wpm) * fps)
+    assert all(a.word < b.word for a, b in zip(runs, runs[1:]))
+
+
+def test_empty_document():
+    assert frame_runs(Timeline(array('d')), WPM, 10) == []
+
+
+def test_repeated_words_share_one_image(tmp_path):
+    pytest.importorskip('freetype')
+    pytest.importorskip('uharfbuzz')
+    words = [Word(text) for text in ['the', 'cat', 'and', 'the', 'cat']]
+    manifest = export_frames(words, timeline(*[UNIT] * 5), WPM, str(tmp_path),
+                             os.path.join(ROOT, FONT), 24, (160, 60), 2,
+                             focus_positions=[1, 1, 1, 1, 1], workers=1)
+    assert manifest['frames'] == 10 and manifest['images'] == 3
+    assert [run[2] for run in manifest['runs']] == [
+        'word_0000000.png', 'word_0000001.png', 'word_0000002.png',
+        'word_0000000.png', 'word_0000001.png']
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith('.png')) == \
+        ['word_0000000.png', 'word_0000001.png', 'word_0000002.png']
+    with open(tmp_path / MANIFEST_FILE, encoding='utf-8') as file:
+        assert json.load(file) == manifest
@@ -0,0 +1,63 @@
+# tests/test_library_indexer.py
+
+import os
+
+import pytest
+
+from utils.library_indexer import LibraryIndex, update_library
+
+
+def write(path, text, mtime_offset=0):
+    path.write_text(text)
+    if mtime_offset:
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+
+def word_counts(index):
+    return {os.path.basename(entry.path): entry.word_count for entry in index.entries()}
+
+
+@pytest.fixture
+def library(tmp_path):
+    directory = tmp_path / 'books'
+    (directory / 'nested').mkdir(parents=True)
+    write(directory / 'one.txt', 'one two three')
+    write(directory / 'nested' / 'two.txt', 'four five')
+    write(directory / 'notes.bin', 'not a document')
+    index = LibraryIndex(str(tmp_path / 'library.sqlite3'))
+    yield index, directory
+    index.close()
+
+
+def test_incremental_updates(library):
+    index, directory = library
+    progress = []
+    assert update_library(index, [str(directory)],
+                          lambda done, total: progress.append((done, total)),
+                          workers=1) == 2
+    assert word_counts(index) == {'one.txt': 3, 'two.txt': 2}
+    assert progress[-1] == (2, 2)
+    entry = index.entries()[0]
+    assert entry.reading_units > 0 and entry.fingerprint
+
+    # Nothing changed: nothing is parsed
+    assert update_library(index, [str(directory)], workers=1) == 0
+
+    # Added and modified files are parsed again, the rest are kept
+    write(directory / 'three.txt', 'six seven eight nine')
+    write(directory / 'one.txt', 'one two three four five', mtime_offset=1_000_000)
+    assert update_library(index, [str(directory)], workers=1) == 2
+    assert word_counts(index) == {'one.txt': 5, 'two.txt': 2, 'three.txt': 4}
+
+    # Deleted files are dropped without starting the pool
+    os.remove(directory / 'nested' / 'two.txt')
+    assert update_library(index, [str(directory)], workers=1) == 1
+    assert word_counts(index) == {'one.txt': 5, 'three.txt': 4}
+
+
+def test_missing_directory_empties_library(library, tmp_path):
+    index, directory = library
+    update_library(index, [str(directory)], workers=1)
+    assert update_library(index, [str(tmp_path / 'missing')], workers=1) == 2
+    assert index.entries() == []
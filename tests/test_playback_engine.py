@@ -0,0 +1,161 @@
+# tests/test_playback_engine.py
+
+import os
+from array import array
+
+import pytest
+
+from utils.clocks import VirtualClock
+from utils.file_handler import FileHandler, Word
+from utils.playback_engine import PlaybackEngine
+from utils.timeline import Timeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENT = 'test_files/The_Ultimate_Display.txt'
+# Every word is shown for one second at 60 WPM
+UNIT = 60.0
+WPM = 60
+# How late LateClock runs every callback, in seconds
+LATENESS = 0.005
+
+
+class LateClock(VirtualClock):
+    """VirtualClock that runs every callback LATENESS seconds late, like a busy frame loop."""
+
+    def schedule_once(self, callback, delay=0):
+        return super().schedule_once(callback, delay + LATENESS)
+
+
+def make_engine(count, clock=None):
+    """An engine on a virtual clock, loaded with count one-second words."""
+    clock = clock or VirtualClock()
+    shown = []
+    finished = []
+    engine = PlaybackEngine(clock, wpm=WPM, on_word=shown.append,
+                            on_finished=lambda: finished.append(clock.now()))
+    engine.load([Word(f'w{i}') for i in range(count)],
+                Timeline(array('d', [UNIT] * count)))
+    return engine, clock, shown, finished
+
+
+def test_index_after_n_seconds():
+    engine, clock, shown, _ = make_engine(100)
+    engine.play()
+    clock.advance(10.5)
+    assert engine.index == 10
+    assert shown == list(range(11))
+
+
+def test_index_follows_document_timeline():
+    words = FileHandler.load_file(os.path.join(ROOT, DOCUMENT))
+    clock = VirtualClock()
+    engine = PlaybackEngine(clock, wpm=300)
+    engine.load(words)
+    engine.play()
+    for seconds in (0.1, 7.3, 42.0, 95.5):
+        clock.run(until=seconds)
+        assert engine.index == engine.timeline.index_at(seconds, engine.wpm)
+
+
+def test_seek_while_playing_restarts_word():
+    engine, clock, shown, _ = make_engine(100)
+    engine.play()
+    clock.advance(2.5)
+    engine.seek(50)
+    assert engine.index == 50 and shown[-1] == 50
+    # The target word gets its full duration from the seek
+    clock.advance(0.99)
+    assert engine.index == 50
+    clock.advance(0.02)
+    assert engine.index == 51
+
+
+def test_seek_while_paused_shows_word_without_playing():
+    engine, clock, shown, _ = make_engine(100)
+    engine.seek(500)
+    assert engine.index == 99 and shown == [99]
+    assert not engine.is_playing and not clock.pending()
+
+
+def test_set_wpm_rescales_remaining_time():
+    engine, clock, _, _ = make_engine(100)
+    engine.play()
+    clock.advance(0.5)
+    engine.set_wpm(WPM * 2)
+    # Half of word 0 is left and now takes a quarter second
+    clock.advance(0.24)
+    assert engine.index == 0
+    clock.advance(0.02)
+    assert engine.index == 1
+    # Later words take half a second, word 1 ending at 1.25s
+    clock.advance(0.47)
+    assert engine.index == 1
+    clock.advance(0.04)
+    assert engine.index == 2
+    assert engine.recorder.intended_duration[0] == pytest.approx(0.75)
+
+
+def test_stops_at_end_of_document():
+    engine, clock, shown, finished = make_engine(5)
+    engine.play()
+    clock.run()
+    assert finished == [5.0]
+    assert shown == [0, 1, 2, 3, 4]
+    assert engine.index == 0
+    assert not engine.is_playing and not clock.pending()
+
+
+def test_long_session_does_not_drift():
+    # An hour of one-second words with every callback late: each word
+    # appears late, but the lateness must not add up (chained relative
+    # delays would drift by LATENESS per word, 18 seconds in total)
+    engine, clock, _, finished = make_engine(3600, LateClock())
+    engine.play()
+    clock.run()
+    summary = engine.recorder.sessions[-1]
+    assert finished == [pytest.approx(3600.0 + LATENESS)]
+    assert summary['words_recorded'] == 3600
+    assert summary['onset_jitter_ms']['max'] == pytest.approx(LATENESS * 1000, abs=0.01)
+    assert summary['cumulative_drift_ms'] == pytest.approx(LATENESS * 1000, abs=0.01)
+    assert summary['dropped_words'] == 0
+
+
+def test_records_time_returned_by_on_word():
+    # Work on_word does after the word is drawn is not display latency
+    clock = VirtualClock()
+    engine = PlaybackEngine(clock, wpm=WPM, on_word=lambda index: clock.now() - 0.25)
+    engine.load([Word('w0'), Word('w1')], Timeline(array('d', [UNIT] * 2)))
+    engine.play()
+    clock.advance(1.5)
+    assert engine.recorder.actual_start[1] == pytest.approx(0.75)
+
+
+@pytest.mark.parametrize('percent, index', [(0, 0), (25, 25), (50.5, 50), (100, 99)])
+def test_seek_percent_while_paused(percent, index):
+    engine, clock, shown, _ = make_engine(100)
+    engine.seek_percent(percent)
+    assert engine.index == index and shown == [index]
+    assert not engine.is_playing and not clock.pending()
+
+
+def test_seek_time_while_playing():
+    engine, clock, shown, _ = make_engine(100)
+    engine.play()
+    clock.advance(3.5)
+    engine.seek_time(70.2)
+    assert engine.index == 70 and engine.is_playing
+    assert engine.position_time() == 70.0
+    clock.advance(1.01)
+    assert engine.index == 71
+    # The jump ended one timing session and started another
+    assert len(engine.recorder.sessions) == 1
+
+
+def test_seek_percent_to_end_while_playing_finishes():
+    engine, clock, _, finished = make_engine(100)
+    engine.play()
+    clock.advance(0.5)
+    engine.seek_percent(100)
+    assert engine.index == 99 and engine.position_percent() == 99.0
+    clock.run()
+    assert finished == [1.5] and engine.index == 0
@@ -0,0 +1,115 @@
+# tests/test_resume_store.py
+
+import os
+import sqlite3
+import time
+
+import pytest
+
+from utils.fingerprint import document_fingerprint
+from utils.resume_store import ResumeState, ResumeStore
+
+STATE = ResumeState('/books/a.txt', 10, 300, 'OpenDyslexic', 24)
+
+
+class CountingStore(ResumeStore):
+    """ResumeStore recording how many states each write committed."""
+
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        super().__init__(*args, **kwargs)
+
+    def _write_pending(self, connection):
+        with self._lock:
+            pending = len(self._pending)
+        if pending:
+            self.batches.append(pending)
+        super()._write_pending(connection)
+
+
+def rows(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute(
+            'SELECT fingerprint, word_index, wpm FROM resume ORDER BY fingerprint').fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'resume.sqlite3')
+
+
+def test_close_writes_pending_states(db_path):
+    # A long delay: nothing is written until close()
+    store = ResumeStore(db_path, delay=60)
+    store.save('a', STATE)
+    store.save_position('a', 42)
+    assert rows(db_path) == []
+    store.close()
+    assert rows(db_path) == [('a', 42, 300)]
+    assert ResumeStore(db_path).get('a') == STATE._replace(word_index=42)
+
+
+def test_close_twice(db_path):
+    store = ResumeStore(db_path, delay=60)
+    store.save('a', STATE)
+    store.close()
+    store.close()
+    assert rows(db_path) == [('a', 10, 300)]
+
+
+def test_rapid_saves_are_coalesced(db_path):
+    store = CountingStore(db_path, delay=0.2)
+    store.save('a', STATE)
+    store.save('b', STATE._replace(path='/books/b.txt'))
+    for index in range(1000):
+        store.save_position('a', index)
+    # Pending states are visible before they are written
+    assert store.get('a').word_index == 999
+    deadline = time.monotonic() + 5
+    while not store.batches and time.monotonic() < deadline:
+        time.sleep(0.05)
+    store.close()
+    assert store.batches == [2]
+    assert rows(db_path) == [('a', 999, 300), ('b', 10, 300)]
+
+
+def test_save_position_needs_a_saved_state(db_path):
+    store = ResumeStore(db_path, delay=60)
+    assert not store.save_position('a', 5)
+    assert store.get('a') is None
+    store.close()
+
+
+def test_most_recent(db_path):
+    store = ResumeStore(db_path, delay=60)
+    store.save('a', STATE)
+    store.save('b', STATE._replace(path='/books/b.txt'))
+    store.save_position('a', 11)
+    assert store.most_recent() == STATE._replace(word_index=11)
+    store.close()
+    store = ResumeStore(db_path)
+    assert store.most_recent().path == STATE.path
+    store.close()
+
+
+def test_changed_file_does_not_resume(db_path, tmp_path):
+    document = tmp_path / 'book.txt'
+    document.write_text('one two three')
+    fingerprint = document_fingerprint(str(document))
+    store = ResumeStore(db_path, delay=60)
+    store.save(fingerprint, STATE._replace(path=str(document)))
+    store.close()
+
+    # Same size, new contents and modification time
+    document.write_text('one two thre3')
+    stat = os.stat(document)
+    os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed = document_fingerprint(str(document))
+    assert changed != fingerprint
+    store = ResumeStore(db_path)
+    assert store.get(changed) is None
+    assert store.get(fingerprint).path == str(document)
+    store.close()
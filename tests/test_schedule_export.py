@@ -0,0 +1,112 @@
+# tests/test_schedule_export.py
+
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from utils.compiled_document import CompiledDocument
+from utils.file_handler import FileHandler, Word
+from utils.schedule_export import (HEADER, MAGIC, RECORD, ScheduledWord, export_schedule,
+                                   iter_schedule, read_binary)
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENT = 'test_files/The_Ultimate_Display.txt'
+WPM = 300
+# Words that need quoting or escaping in CSV and JSON, and multi-byte UTF-8
+AWKWARD = ['Naïve,', '"quoted"', 'back\\slash', 'café—crème', '日本語', 'end.']
+
+
+@pytest.fixture(scope='module')
+def document():
+    text_processor = TextProcessor()
+    words, boundaries = FileHandler.load_document(os.path.join(ROOT, DOCUMENT))
+    focus_positions = [text_processor.calculate_focus_character(word.text) for word in words]
+    return CompiledDocument(words, boundaries, Timeline.build(words, text_processor, boundaries),
+                            focus_positions)
+
+
+def awkward_document():
+    words = [Word(text) for text in AWKWARD]
+    return words, Timeline.build(words, TextProcessor())
+
+
+def export(words, timeline, format, **kwargs):
+    file = io.BytesIO()
+    count = export_schedule(words, timeline, WPM, file, format, **kwargs)
+    assert count == len(words)
+    return file.getvalue()
+
+
+def jsonl_rows(data):
+    return [ScheduledWord(**json.loads(line)) for line in data.decode('utf-8').splitlines()]
+
+
+def csv_rows(data):
+    reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+    assert next(reader) == list(ScheduledWord._fields)
+    return [ScheduledWord(int(index), text, int(focus), float(start), float(duration))
+            for index, text, focus, start, duration in reader]
+
+
+def test_schedule_follows_timeline(document):
+    schedule = list(iter_schedule(document.words, document.timeline, WPM,
+                                  document.focus_positions))
+    assert len(schedule) == len(document.words)
+    for entry in schedule[:50]:
+        assert entry.text == document.words[entry.index].text
+        assert entry.start == document.timeline.start_time(entry.index, WPM)
+        assert entry.duration == document.timeline.duration(entry.index, WPM)
+    # Focus positions found on the fly match the precomputed ones
+    computed = iter_schedule(document.words, document.timeline, WPM)
+    assert [entry.focus for entry in computed] == list(document.focus_positions)
+
+
+@pytest.mark.parametrize('build', ['document', 'awkward'])
+def test_jsonl_and_csv_give_the_same_rows(build, document):
+    words, timeline = (document.words, document.timeline) if build == 'document' \
+        else awkward_document()
+    expected = list(iter_schedule(words, timeline, WPM))
+    assert jsonl_rows(export(words, timeline, 'jsonl')) == expected
+    assert csv_rows(export(words, timeline, 'csv')) == expected
+
+
+@pytest.mark.parametrize('build', ['document', 'awkward'])
+def test_binary_round_trip(build, document):
+    words, timeline = (document.words, document.timeline) if build == 'document' \
+        else awkward_document()
+    data = export(words, timeline, 'binary')
+
+    magic, _, record_size, count, wpm = HEADER.unpack_from(data)
+    assert (magic, record_size, count, wpm) == (MAGIC, RECORD.size, len(words), WPM)
+    text_bytes = sum(len(word.text.encode('utf-8')) for word in words)
+    assert len(data) == HEADER.size + count * RECORD.size + text_bytes
+    assert list(read_binary(io.BytesIO(data))) == list(iter_schedule(words, timeline, WPM))
+
+
+def test_binary_records_are_seekable():
+    words, timeline = awkward_document()
+    data = export(words, timeline, 'binary')
+    text_start = HEADER.size + len(words) * RECORD.size
+    offset, length, _, start, duration = RECORD.unpack_from(data, HEADER.size + 4 * RECORD.size)
+    assert data[text_start + offset:text_start + offset + length].decode('utf-8') == '日本語'
+    assert (start, duration) == (timeline.start_time(4, WPM), timeline.duration(4, WPM))
+
+
+def test_read_binary_rejects_other_files():
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(b'{"index":0}\n')))
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(b'')))
+
+
+def test_export_rejects_bad_arguments():
+    words, timeline = awkward_document()
+    with pytest.raises(ValueError):
+        export_schedule(words, timeline, WPM, io.BytesIO(), 'xml')
+    with pytest.raises(ValueError):
+        export_schedule(words, timeline, 0, io.BytesIO(), 'csv')
@@ -0,0 +1,50 @@
+# tests/test_search_index.py
+
+import threading
+
+from utils.search_index import SearchIndex
+
+TEXT = '— The war — and peace is here. War, and peace! The end —'
+
+
+def search(query, text=TEXT):
+    return SearchIndex.build(text.split()).search(query)
+
+
+def test_single_word_is_case_and_punctuation_insensitive():
+    assert search('war') == [(2, 1), (8, 1)]
+    assert search('"Peace."') == [(5, 1), (10, 1)]
+
+
+def test_phrase_matches_consecutive_words():
+    assert search('peace is here') == [(5, 3)]
+    assert search('war and peace') == [(2, 4), (8, 3)]
+
+
+def test_phrase_copied_across_punctuation_token():
+    # The dash is not indexed, but still counts in the match length
+    assert search('war — and') == [(2, 3), (8, 2)]
+    assert search('the war — and peace') == [(1, 5)]
+
+
+def test_punctuation_tokens_at_document_edges():
+    assert search('— the war') == [(1, 2)]
+    assert search('the end —') == [(11, 2)]
+    assert search('end') == [(12, 1)]
+
+
+def test_no_match():
+    assert search('war is') == []
+    assert search('missing') == []
+    assert search('— …') == []
+    assert search('') == []
+
+
+def test_phrase_longer_than_document():
+    assert search('a b c', 'a b') == []
+
+
+def test_cancelled_build():
+    cancelled = threading.Event()
+    cancelled.set()
+    assert SearchIndex.build(TEXT.split(), cancelled) is None
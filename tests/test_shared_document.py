@@ -0,0 +1,101 @@
+# tests/test_shared_document.py
+
+import os
+import shutil
+import subprocess
+import sys
+from multiprocessing import shared_memory
+
+import pytest
+
+from utils.compiled_document import open_document
+from utils.shared_document import (HOLDERS_OFFSET, JSON_OFFSET, SharedDocument,
+                                   _untrack, segment_name)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENT = 'test_files/The_Ultimate_Display.timecode'
+
+
+def holders(name):
+    """PIDs in a segment's holder table, or None if the segment is gone."""
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return None
+    _untrack(segment)
+    table = segment.buf[HOLDERS_OFFSET:JSON_OFFSET].cast('I')
+    pids = [pid for pid in table if pid]
+    table.release()
+    segment.close()
+    return pids
+
+
+def run_and_crash(code):
+    """
+    Run code in another process that exits without detaching. The code
+    must keep its documents referenced, or they detach when collected.
+    """
+    subprocess.run([sys.executable, '-c', code + '\nimport os; os._exit(0)'],
+                   cwd=ROOT, check=True, timeout=60)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / os.path.basename(DOCUMENT)
+    shutil.copy(os.path.join(ROOT, DOCUMENT), path)
+    yield str(path)
+    # Never leave a segment behind, even when a test fails
+    name = segment_name(str(path))
+    if holders(name) is not None:
+        segment = shared_memory.SharedMemory(name=name)
+        segment.close()
+        segment.unlink()
+
+
+def test_shared_contents_match_document(source):
+    with SharedDocument.open(source) as shared:
+        words, boundaries, timeline, _ = open_document(source)
+        assert [(w.text, w.start_time, w.end_time) for w in shared.words] == \
+            [(w.text, w.start_time, w.end_time) for w in words]
+        assert list(shared.timeline.units) == list(timeline.units)
+        assert list(shared.boundaries.sentence_starts) == list(boundaries.sentence_starts)
+        assert len(shared.focus_positions) == len(words)
+
+
+def test_last_holder_unlinks_segment(source):
+    name = segment_name(source)
+    first = SharedDocument.open(source)
+    second = SharedDocument.attach(name)
+    assert holders(name) == [os.getpid(), os.getpid()]
+
+    first.close()
+    assert first.closed and holders(name) == [os.getpid()]
+    assert second.words[0].text == open_document(source).words[0].text
+    first.close()  # Closing twice drops one reference only
+    assert holders(name) == [os.getpid()]
+
+    second.close()
+    assert holders(name) is None
+    with pytest.raises(FileNotFoundError):
+        SharedDocument.attach(name)
+
+
+def test_crashed_holder_is_pruned(source):
+    name = segment_name(source)
+    shared = SharedDocument.open(source)
+    run_and_crash(f'from utils.shared_document import SharedDocument\n'
+                  f'shared = SharedDocument.attach({name!r})')
+    assert len(holders(name)) == 2
+    shared.close()
+    assert holders(name) is None
+
+
+def test_segment_of_crashed_publisher_is_reused_then_unlinked(source):
+    name = segment_name(source)
+    run_and_crash(f'from utils.shared_document import SharedDocument\n'
+                  f'shared = SharedDocument.open({source!r})')
+    assert len(holders(name)) == 1 and holders(name) != [os.getpid()]
+    shared = SharedDocument.open(source)
+    assert holders(name) == [os.getpid()]
+    shared.close()
+    assert holders(name) is None
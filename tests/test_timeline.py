@@ -0,0 +1,51 @@
+# tests/test_timeline.py
+
+from array import array
+
+import pytest
+
+from utils.timeline import Timeline
+
+# Words shown for 1, 2, 0.5 and 1.5 seconds at 60 WPM
+UNITS = [60.0, 120.0, 30.0, 90.0]
+STARTS = [0.0, 1.0, 3.0, 3.5]
+WPM = 60
+
+
+@pytest.fixture
+def timeline():
+    return Timeline(array('d', UNITS))
+
+
+def test_start_times(timeline):
+    assert [timeline.start_time(i, WPM) for i in range(len(UNITS))] == STARTS
+    assert timeline.total_time(WPM) == 5.0
+    assert timeline.total_time(WPM * 2) == 2.5
+
+
+@pytest.mark.parametrize('index', range(len(UNITS)))
+def test_index_at_word_boundaries(timeline, index):
+    # A word is on screen from its start time up to the next word's
+    start = STARTS[index]
+    assert timeline.index_at(start, WPM) == index
+    assert timeline.index_at(start + 0.01, WPM) == index
+    if index:
+        assert timeline.index_at(start - 0.01, WPM) == index - 1
+
+
+def test_index_at_document_edges(timeline):
+    assert timeline.index_at(0.0, WPM) == 0
+    assert timeline.index_at(-1.0, WPM) == 0
+    # 100% is the end of the last word, which is still the last word
+    assert timeline.index_at(timeline.total_time(WPM), WPM) == len(UNITS) - 1
+    assert timeline.index_at(60.0, WPM) == len(UNITS) - 1
+
+
+def test_index_at_scales_with_wpm(timeline):
+    assert timeline.index_at(1.5, WPM * 2) == 2
+
+
+def test_empty_timeline():
+    timeline = Timeline(array('d'))
+    assert timeline.total_time(WPM) == 0.0
+    assert timeline.index_at(1.0, WPM) == 0
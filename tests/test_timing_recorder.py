@@ -0,0 +1,42 @@
+# tests/test_timing_recorder.py
+
+import json
+
+from utils.timing_recorder import TimingRecorder
+
+
+def play(recorder, first, count):
+    """One session of count one-second words shown on time."""
+    recorder.start_session()
+    for i in range(count):
+        recorder.record(first + i, float(i), 1.0, float(i))
+    return recorder.end_session(float(count))
+
+
+def test_session_summary():
+    recorder = TimingRecorder(capacity=8)
+    summary = play(recorder, 10, 12)
+    assert summary['words_recorded'] == 12 and summary['words_analyzed'] == 8
+    assert (summary['first_word_index'], summary['last_word_index']) == (14, 21)
+    assert summary['cumulative_drift_ms'] == 0.0 and summary['dropped_words'] == 0
+
+
+def test_sessions_are_capped(tmp_path):
+    # Every seek ends a session: a long read must not keep them all
+    recorder = TimingRecorder(capacity=8, session_limit=3)
+    for session in range(10):
+        play(recorder, session * 100, 2)
+    assert len(recorder.sessions) == 3 and recorder.sessions_ended == 10
+    assert [s['first_word_index'] for s in recorder.sessions] == [700, 800, 900]
+
+    path = tmp_path / 'timing.json'
+    recorder.export_json(str(path))
+    report = json.loads(path.read_text(encoding='utf-8'))
+    assert report['sessions_ended'] == 10
+    assert report['sessions'] == list(recorder.sessions)
+
+
+def test_end_without_session():
+    recorder = TimingRecorder(capacity=8)
+    assert recorder.end_session(1.0) is None
+    assert not recorder.sessions and recorder.sessions_ended == 0
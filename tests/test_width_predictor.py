@@ -0,0 +1,83 @@
+# tests/test_width_predictor.py
+
+import os
+
+import pytest
+from kivy.metrics import dp
+
+from kivy_text_metrics import TextMetrics
+from utils.file_handler import FileHandler
+from utils.text_processor import TextProcessor
+from utils.width_predictor import (CALIBRATION_SAMPLE_SIZE, WidthPredictor,
+                                   collect_samples)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONTS = ['fonts/OpenDyslexic-Regular.otf', 'fonts/APHont-Regular.ttf']
+SIZES = [16, 24, 36]
+DOCUMENT = 'test_files/The_Ultimate_Display.txt'
+# Largest error allowed for any held-out word, and on average, in pixels
+MAX_ERROR = 6.0
+MEAN_ERROR = 1.5
+# A calibration sample without markup characters
+TRAINING_WORDS = ['The', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog.',
+                  'Ultimate', 'Display', 'computer', 'mathematical', '(1965)']
+
+
+@pytest.fixture(scope='module')
+def words():
+    """Distinct words of the test document."""
+    texts = [word.text for word in FileHandler.load_file(os.path.join(ROOT, DOCUMENT))]
+    return list(dict.fromkeys(texts))
+
+
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('font', FONTS)
+def test_predicts_held_out_render_widths(words, font, size):
+    # Calibrate on every other word, then compare predictions for the
+    # rest with the widths CoreMarkupLabel actually renders
+    font_path = os.path.join(ROOT, font)
+    metrics = TextMetrics(font_path, size)
+    text_processor = TextProcessor()
+    train = collect_samples(words[::2][:CALIBRATION_SAMPLE_SIZE], metrics,
+                            text_processor, font_path, dp(size))
+    held_out = collect_samples(words[1::2], metrics, text_processor,
+                               font_path, dp(size))
+    predictor = WidthPredictor.fit(train)
+
+    errors = {word: abs(predictor.predict(advance, count) - width)
+              for word, (advance, count, width) in zip(words[1::2], held_out)}
+    worst = max(errors, key=errors.get)
+    assert errors[worst] <= MAX_ERROR, f'{worst!r} is off by {errors[worst]:.2f}px'
+    assert sum(errors.values()) / len(errors) <= MEAN_ERROR
+
+
+def test_markup_characters_are_measured_as_text():
+    # Brackets in a word must render as text, not be parsed as markup
+    font_path = os.path.join(ROOT, FONTS[1])
+    metrics = TextMetrics(font_path, 24)
+    text_processor = TextProcessor()
+    train = collect_samples(TRAINING_WORDS, metrics, text_processor,
+                            font_path, dp(24))
+    predictor = WidthPredictor.fit(train)
+    (advance, count, width), = collect_samples(['[2].'], metrics, text_processor,
+                                               font_path, dp(24))
+    assert abs(predictor.predict(advance, count) - width) <= MAX_ERROR
+
+
+def test_fit_recovers_linear_model():
+    predictor = WidthPredictor((1.25, 0.5, 2.0))
+    samples = [(advance, count, predictor.predict(advance, count))
+               for advance, count in [(10.0, 2), (35.5, 5), (80.0, 9), (52.25, 4)]]
+    fitted = WidthPredictor.fit(samples)
+    assert fitted.coefficients == pytest.approx((1.25, 0.5, 2.0))
+    assert fitted.evaluate(samples)[1] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_fit_single_sample_falls_back_to_scaling():
+    predictor = WidthPredictor.fit([(40.0, 4, 50.0)])
+    assert predictor.coefficients == (1.25, 0.0, 0.0)
+
+
+def test_fit_without_samples_fails():
+    with pytest.raises(ValueError):
+        WidthPredictor.fit([])
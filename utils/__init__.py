@@ -2,5 +2,10 @@
 
 from .text_processor import TextProcessor
 from .file_handler import FileHandler, Word
+from .timeline import Timeline
+from .clocks import VirtualClock, RealtimeClock
+from .playback_engine import PlaybackEngine
+from .search_index import SearchIndex
 
-__all__ = ['TextProcessor', 'FileHandler', 'Word']
\ No newline at end of file
+__all__ = ['TextProcessor', 'FileHandler', 'Word', 'Timeline',
+           'VirtualClock', 'RealtimeClock', 'PlaybackEngine', 'SearchIndex']
\ No newline at end of file
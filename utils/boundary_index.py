@@ -0,0 +1,108 @@
+# utils/boundary_index.py
+
+from array import array
+
+# Punctuation that ends a sentence, and closing marks that may follow it
+SENTENCE_TERMINATORS = ('.', '!', '?')
+CLOSING_MARKS = '"\')]}”’'
+# Abbreviations that end in a period but (almost) never end a sentence
+ABBREVIATIONS = frozenset(('mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'st.',
+                           'vs.', 'e.g.', 'i.e.', 'cf.'))
+
+
+def ends_sentence(token: str) -> bool:
+    """
+    Whether a token ends a sentence.
+
+    Single capital initials such as "E." and common abbreviations such
+    as "Dr." are not treated as sentence ends.
+    """
+    stripped = token.rstrip(CLOSING_MARKS)
+    if not stripped.endswith(SENTENCE_TERMINATORS):
+        return False
+    if stripped.lstrip('"\'([{“‘').casefold() in ABBREVIATIONS:
+        return False
+    return not (len(stripped) == 2 and stripped[0].isupper())
+
+
+class BoundaryIndex:
+    """
+    Sentence and paragraph boundaries of a document as word indices.
+
+    sentence_starts and paragraph_starts hold the index of the first word
+    of each sentence/paragraph, and sentence_of/paragraph_of map every word
+    to the number of the sentence/paragraph containing it, so every
+    navigation query is a couple of array lookups.
+
+    Build it with add_word() and break_paragraph() while tokenizing.
+    """
+
+    def __init__(self):
+        self.sentence_starts = array('I')
+        self.paragraph_starts = array('I')
+        self.sentence_of = array('I')
+        self.paragraph_of = array('I')
+        self._sentence_open = False
+        self._paragraph_open = False
+
+    def add_word(self, token: str):
+        """Record the next word of the document."""
+        index = len(self.sentence_of)
+        if not self._paragraph_open:
+            self.paragraph_starts.append(index)
+            self._paragraph_open = True
+            self._sentence_open = False
+        if not self._sentence_open:
+            self.sentence_starts.append(index)
+            self._sentence_open = True
+        self.sentence_of.append(len(self.sentence_starts) - 1)
+        self.paragraph_of.append(len(self.paragraph_starts) - 1)
+        if ends_sentence(token):
+            self._sentence_open = False
+
+    def break_paragraph(self):
+        """Mark that the next word starts a new paragraph."""
+        self._paragraph_open = False
+
+    def __len__(self) -> int:
+        return len(self.sentence_of)
+
+    def previous_sentence(self, index: int) -> int:
+        """
+        Start of the current sentence, or of the previous one when already
+        at (or one word into) the start of the current sentence.
+        """
+        sentence = self.sentence_of[index]
+        if index - self.sentence_starts[sentence] > 1 or sentence == 0:
+            return self.sentence_starts[sentence]
+        return self.sentence_starts[sentence - 1]
+
+    def next_sentence(self, index: int) -> int:
+        """Start of the next sentence (or the current word if in the last one)."""
+        sentence = self.sentence_of[index] + 1
+        if sentence < len(self.sentence_starts):
+            return self.sentence_starts[sentence]
+        return index
+
+    def previous_paragraph(self, index: int) -> int:
+        """
+        Start of the current paragraph, or of the previous one when already
+        at (or one word into) the start of the current paragraph.
+        """
+        paragraph = self.paragraph_of[index]
+        if index - self.paragraph_starts[paragraph] > 1 or paragraph == 0:
+            return self.paragraph_starts[paragraph]
+        return self.paragraph_starts[paragraph - 1]
+
+    def next_paragraph(self, index: int) -> int:
+        """Start of the next paragraph (or the current word if in the last one)."""
+        paragraph = self.paragraph_of[index] + 1
+        if paragraph < len(self.paragraph_starts):
+            return self.paragraph_starts[paragraph]
+        return index
+
+    def ends_paragraph(self, index: int) -> bool:
+        """Whether a word is the last of a paragraph followed by another one."""
+        following = index + 1
+        return (following < len(self.paragraph_of)
+                and self.paragraph_of[following] != self.paragraph_of[index])
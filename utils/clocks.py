@@ -0,0 +1,157 @@
+# utils/clocks.py
+
+import heapq
+import itertools
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class ScheduledEvent:
+    """A callback scheduled on a clock; cancel() stops it from running."""
+
+    def __init__(self, callback: Callable, scheduled_at: float, when: float):
+        self.callback = callback
+        self.scheduled_at = scheduled_at
+        self.when = when
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the event if it has not run yet."""
+        self.cancelled = True
+
+
+class VirtualClock:
+    """
+    Clock whose time only moves when it is told to.
+
+    run() jumps straight from one event to the next, so hours of playback
+    complete in however long the callbacks themselves take. Used for
+    benchmarks and regression runs of PlaybackEngine without a display.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._queue: List[Tuple[float, int, ScheduledEvent]] = []
+        self._sequence = itertools.count()
+
+    def now(self) -> float:
+        """Current clock time in seconds."""
+        return self._now
+
+    def schedule_once(self, callback: Callable, delay: float = 0) -> ScheduledEvent:
+        """
+        Schedule callback(dt) to run after delay seconds of clock time.
+
+        Returns:
+            ScheduledEvent that can be cancelled
+        """
+        now = self.now()
+        event = ScheduledEvent(callback, now, now + max(0.0, delay))
+        heapq.heappush(self._queue, (event.when, next(self._sequence), event))
+        return event
+
+    def pending(self) -> bool:
+        """Whether any uncancelled event is still scheduled."""
+        self._discard_cancelled()
+        return bool(self._queue)
+
+    def advance(self, seconds: float) -> int:
+        """
+        Move time forward, running every event that falls due.
+
+        Args:
+            seconds: How far to move the clock
+
+        Returns:
+            Number of callbacks that ran
+        """
+        return self.run(until=self._now + seconds)
+
+    def run(self, until: Optional[float] = None) -> int:
+        """
+        Run events in time order until none are left or until is reached.
+
+        Args:
+            until: Optional clock time to stop at
+
+        Returns:
+            Number of callbacks that ran
+        """
+        ran = 0
+        while self.pending():
+            when = self._queue[0][0]
+            if until is not None and when > until:
+                break
+            _, _, event = heapq.heappop(self._queue)
+            self._wait_until(when)
+            self._now = max(self._now, when)
+            event.callback(self._now - event.scheduled_at)
+            ran += 1
+        if until is not None and until > self._now:
+            self._wait_until(until)
+            self._now = until
+        return ran
+
+    def _wait_until(self, when: float):
+        """Virtual time never waits."""
+
+    def _discard_cancelled(self):
+        while self._queue and self._queue[0][2].cancelled:
+            heapq.heappop(self._queue)
+
+
+class RealtimeClock(VirtualClock):
+    """
+    Clock that follows wall time, optionally sped up.
+
+    Runs the same event loop as VirtualClock but sleeps until each event is
+    due, for headless playback at real (speed=1.0) or scaled speed.
+    """
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self._origin = time.perf_counter()
+        super().__init__(start=0.0)
+
+    def now(self) -> float:
+        """Clock time: wall time since creation, scaled by speed."""
+        self._now = (time.perf_counter() - self._origin) * self.speed
+        return self._now
+
+    def _wait_until(self, when: float):
+        remaining = when - self.now()
+        if remaining > 0:
+            time.sleep(remaining / self.speed)
+        self.now()
+
+
+class KivyClock:
+    """Adapter running playback on Kivy's main-thread Clock."""
+
+    def __init__(self):
+        from kivy.clock import Clock
+        self._clock = Clock
+
+    def now(self) -> float:
+        """Monotonic wall time in seconds."""
+        return time.perf_counter()
+
+    def schedule_once(self, callback: Callable, delay: float = 0):
+        """Schedule callback(dt) on the next frame after delay seconds."""
+        return self._clock.schedule_once(callback, delay)
+
+
+class AsyncioClock:
+    """Adapter running playback on an asyncio event loop."""
+
+    def __init__(self, loop):
+        self._loop = loop
+
+    def now(self) -> float:
+        """The loop's monotonic time in seconds."""
+        return self._loop.time()
+
+    def schedule_once(self, callback: Callable, delay: float = 0):
+        """Schedule callback(dt) on the loop after delay seconds."""
+        delay = max(0.0, delay)
+        return self._loop.call_later(delay, callback, delay)
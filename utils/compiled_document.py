@@ -0,0 +1,328 @@
+# utils/compiled_document.py
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import List, NamedTuple, Optional
+from constants import (COMPILED_EXTENSION, BASE_DURATION_FACTOR, LENGTH_FACTOR,
+                       SYLLABLE_FACTOR, DEFAULT_FOCUS_OFFSET, BASE_WPM,
+                       PARAGRAPH_PAUSE_FACTOR)
+from utils.boundary_index import BoundaryIndex
+from utils.file_handler import FileHandler, Word
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+MAGIC = b'RSVPC'
+FORMAT_VERSION = 2
+# Everything a compiled file's focus positions and durations depend on
+SETTINGS = [BASE_DURATION_FACTOR, LENGTH_FACTOR, SYLLABLE_FACTOR,
+            DEFAULT_FOCUS_OFFSET, BASE_WPM, PARAGRAPH_PAUSE_FACTOR]
+HEADER = struct.Struct('<5sBI')  # magic, format version, JSON header length
+
+# Array sections, in file order: (name, typecode)
+SECTIONS = [
+    ('start_times', 'd'),
+    ('end_times', 'd'),
+    ('sentence_starts', 'I'),
+    ('paragraph_starts', 'I'),
+    ('sentence_of', 'I'),
+    ('paragraph_of', 'I'),
+    ('focus_positions', 'I'),
+    ('units', 'd'),
+]
+
+
+class CompiledDocument(NamedTuple):
+    """A document restored from its compiled file, ready to open."""
+    words: List[Word]
+    boundaries: BoundaryIndex
+    timeline: Timeline
+    focus_positions: array
+
+
+def compiled_path(source: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Where a document's compiled file lives.
+
+    Next to the document by default. In a cache directory, files are named
+    after a hash of the document's absolute path, so one flat directory
+    can hold a whole library.
+    """
+    if cache_dir is None:
+        return source + COMPILED_EXTENSION
+    key = hashlib.blake2b(os.path.abspath(source).encode('utf-8'),
+                          digest_size=16).hexdigest()
+    return os.path.join(os.path.expanduser(cache_dir), key + COMPILED_EXTENSION)
+
+
+def content_hash(data: bytes) -> str:
+    """Hash of a document's full contents."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_header(path: str) -> Optional[dict]:
+    """The JSON header of a compiled file, or None if it is missing or not one."""
+    try:
+        with open(path, 'rb') as file:
+            magic, version, length = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            return json.loads(file.read(length))
+    except (OSError, struct.error, ValueError):
+        return None
+
+
+def is_current(header: Optional[dict], size: int, mtime_ns: int) -> bool:
+    """Whether a header was compiled from a file of this size and mtime."""
+    return (header is not None and header['settings'] == SETTINGS
+            and header['size'] == size and header['mtime_ns'] == mtime_ns)
+
+
+def compile_document(source: str, output: str,
+                     text_processor: Optional[TextProcessor] = None) -> int:
+    """
+    Parse a document, precompute its focus positions and base durations,
+    and write them to a compiled file.
+
+    Args:
+        source: .txt or .timecode document
+        output: Compiled file to write
+        text_processor: TextProcessor to reuse across documents
+
+    Returns:
+        Number of words compiled
+
+    Raises:
+        OSError, ValueError, RuntimeError: If the document cannot be read
+            or parsed
+    """
+    text_processor = text_processor or TextProcessor()
+    stat = os.stat(source)
+    with open(source, 'rb') as file:
+        digest = content_hash(file.read())
+    words, boundaries = FileHandler.load_document(source)
+    timeline = Timeline.build(words, text_processor, boundaries)
+
+    focus_cache = {}
+    focus_positions = array('I')
+    for word in words:
+        focus_pos = focus_cache.get(word.text)
+        if focus_pos is None:
+            focus_pos = focus_cache[word.text] = \
+                text_processor.calculate_focus_character(word.text)
+        focus_positions.append(focus_pos)
+
+    timed = any(word.start_time is not None for word in words)
+    nan = float('nan')
+    arrays = {
+        'start_times': array('d', [nan if word.start_time is None else word.start_time
+                                   for word in words] if timed else []),
+        'end_times': array('d', [nan if word.end_time is None else word.end_time
+                                 for word in words] if timed else []),
+        'sentence_starts': boundaries.sentence_starts,
+        'paragraph_starts': boundaries.paragraph_starts,
+        'sentence_of': boundaries.sentence_of,
+        'paragraph_of': boundaries.paragraph_of,
+        'focus_positions': focus_positions,
+        'units': timeline.units,
+    }
+    text = '\n'.join(word.text for word in words).encode('utf-8')
+    header = json.dumps({
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': digest,
+        'settings': SETTINGS,
+        'byteorder': sys.byteorder,
+        'words': len(words),
+        'text_bytes': len(text),
+        'lengths': [len(arrays[name]) for name, _ in SECTIONS],
+    }).encode('utf-8')
+
+    _write_atomically(output, [header, text] + [arrays[name] for name, _ in SECTIONS])
+    return len(words)
+
+
+def _write_atomically(output: str, parts: list):
+    """
+    Write a JSON header and the sections after it to a temporary name and
+    rename it into place, so an interrupted write never leaves a partial
+    file behind.
+
+    Args:
+        output: Compiled file to write
+        parts: Encoded JSON header, then bytes or arrays to follow it
+    """
+    header, *sections = parts
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    temporary = f'{output}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(header)))
+            file.write(header)
+            for section in sections:
+                if isinstance(section, array):
+                    section.tofile(file)
+                else:
+                    file.write(section)
+        os.replace(temporary, output)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+
+def _restamp(output: str, header: dict, stat: os.stat_result):
+    """
+    Record a new size and mtime in a compiled file whose document is
+    unchanged in content, so the reader's size and mtime check accepts
+    it again. Only the header changes; nothing is parsed.
+    """
+    with open(output, 'rb') as file:
+        _, _, length = HEADER.unpack(file.read(HEADER.size))
+        file.seek(length, os.SEEK_CUR)
+        body = file.read()
+    header = dict(header, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    _write_atomically(output, [json.dumps(header).encode('utf-8'), body])
+
+
+def load_compiled(path: str) -> CompiledDocument:
+    """
+    Read a compiled file.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not a compiled file of this format
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    try:
+        magic, version, length = HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError(f"Not a compiled document: {path}")
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Not a compiled document: {path}")
+    offset = HEADER.size
+    header = json.loads(data[offset:offset + length])
+    offset += length
+
+    view = memoryview(data)
+    text = bytes(view[offset:offset + header['text_bytes']]).decode('utf-8')
+    offset += header['text_bytes']
+    arrays = {}
+    for (name, typecode), count in zip(SECTIONS, header['lengths']):
+        values = array(typecode)
+        end = offset + count * values.itemsize
+        values.frombytes(view[offset:end])
+        if header['byteorder'] != sys.byteorder:
+            values.byteswap()
+        arrays[name] = values
+        offset = end
+
+    texts = text.split('\n') if header['words'] else []
+    if arrays['start_times']:
+        words = [Word(token, None if start != start else start,
+                      None if end != end else end)
+                 for token, start, end in zip(texts, arrays['start_times'],
+                                              arrays['end_times'])]
+    else:
+        words = [Word(token) for token in texts]
+
+    boundaries = BoundaryIndex()
+    boundaries.sentence_starts = arrays['sentence_starts']
+    boundaries.paragraph_starts = arrays['paragraph_starts']
+    boundaries.sentence_of = arrays['sentence_of']
+    boundaries.paragraph_of = arrays['paragraph_of']
+    return CompiledDocument(words, boundaries, Timeline(arrays['units']),
+                            arrays['focus_positions'])
+
+
+def find_compiled(source: str, cache_dir: Optional[str] = None) -> Optional[str]:
+    """
+    The up-to-date compiled file for a document, if there is one.
+
+    Looks next to the document, then in cache_dir. Only size and mtime
+    are checked, so this costs two stats and a header read.
+    """
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    candidates = [compiled_path(source)]
+    if cache_dir is not None:
+        candidates.append(compiled_path(source, cache_dir))
+    for path in candidates:
+        if is_current(read_header(path), stat.st_size, stat.st_mtime_ns):
+            return path
+    return None
+
+
+def open_document(source: str, text_processor: Optional[TextProcessor] = None,
+                  cache_dir: Optional[str] = None) -> CompiledDocument:
+    """
+    Load a document from its compiled file if it has an up-to-date one,
+    otherwise parse and time it.
+
+    Returns:
+        CompiledDocument; focus_positions is None when the document was
+        parsed, since they are then computed with the layout
+
+    Raises:
+        OSError, ValueError, RuntimeError: If the document cannot be read
+            or parsed
+    """
+    compiled = find_compiled(source, cache_dir)
+    if compiled is not None:
+        try:
+            return load_compiled(compiled)
+        except (OSError, ValueError) as e:
+            print(f"Error reading compiled document, parsing instead: {e}")
+    words, boundaries = FileHandler.load_document(source)
+    timeline = Timeline.build(words, text_processor, boundaries)
+    return CompiledDocument(words, boundaries, timeline, None)
+
+
+# One TextProcessor per worker process, created on first use
+_text_processor: Optional[TextProcessor] = None
+
+
+def compile_if_stale(task):
+    """
+    Compile one document unless its compiled file is up to date. Runs in
+    a precompile worker process.
+
+    A compiled file is up to date if it was compiled from a file of the
+    same size and mtime, or, failing that, with the same content hash
+    (e.g. after a copy that did not preserve mtimes), in which case its
+    header is updated to the document's new size and mtime.
+
+    Args:
+        task: (source, output, force) tuple
+
+    Returns:
+        (source, status, words, error) with status 'compiled', 'current'
+        or 'failed'
+    """
+    global _text_processor
+    source, output, force = task
+    if _text_processor is None:
+        _text_processor = TextProcessor()
+    try:
+        if not force:
+            header = read_header(output)
+            stat = os.stat(source)
+            if is_current(header, stat.st_size, stat.st_mtime_ns):
+                return source, 'current', header['words'], None
+            if header is not None and header['settings'] == SETTINGS:
+                with open(source, 'rb') as file:
+                    if content_hash(file.read()) == header['hash']:
+                        _restamp(output, header, stat)
+                        return source, 'current', header['words'], None
+        words = compile_document(source, output, _text_processor)
+        return source, 'compiled', words, None
+    except (OSError, ValueError, RuntimeError) as e:
+        return source, 'failed', 0, str(e)
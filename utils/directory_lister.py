@@ -0,0 +1,133 @@
+# utils/directory_lister.py
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+from constants import DIRECTORY_CACHE_SIZE, LISTING_BATCH_SIZE
+
+
+class DirectoryEntry(NamedTuple):
+    """A subdirectory or document in a listing."""
+    name: str
+    path: str
+    is_dir: bool
+
+
+def sort_entries(entries: Sequence[DirectoryEntry]) -> List[DirectoryEntry]:
+    """Directories first, then by name, ignoring case."""
+    return sorted(entries, key=lambda entry: (not entry.is_dir, entry.name.casefold()))
+
+
+class DirectoryCache:
+    """
+    Recently listed directories, validated by directory mtime.
+
+    Adding, removing or renaming an entry changes its directory's mtime,
+    so a cached listing can be reused after a single stat. Thread-safe;
+    keeps the DIRECTORY_CACHE_SIZE most recently used listings.
+    """
+
+    def __init__(self, capacity: int = DIRECTORY_CACHE_SIZE):
+        self.capacity = capacity
+        self._listings: 'OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[int, List[DirectoryEntry]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, extensions: Sequence[str]) -> Optional[List[DirectoryEntry]]:
+        """Cached listing of path, or None if missing or out of date."""
+        key = (path, tuple(extensions))
+        with self._lock:
+            cached = self._listings.get(key)
+        if cached is None:
+            return None
+        try:
+            if os.stat(path).st_mtime_ns != cached[0]:
+                return None
+        except OSError:
+            return None
+        with self._lock:
+            if key in self._listings:
+                self._listings.move_to_end(key)
+        return cached[1]
+
+    def put(self, path: str, extensions: Sequence[str], mtime_ns: int,
+            entries: List[DirectoryEntry]):
+        """Store a listing taken when the directory had the given mtime."""
+        with self._lock:
+            self._listings[(path, tuple(extensions))] = (mtime_ns, entries)
+            self._listings.move_to_end((path, tuple(extensions)))
+            while len(self._listings) > self.capacity:
+                self._listings.popitem(last=False)
+
+
+class DirectoryLister(threading.Thread):
+    """
+    Background thread that lists a directory's subdirectories and
+    documents.
+
+    Entries are passed to on_batch(entries) in batches of
+    LISTING_BATCH_SIZE as they are read, then the complete, sorted
+    listing to on_complete(entries, error), where error is an OSError
+    message or None. Only each entry's type is checked, which scandir
+    usually answers without a stat, so slow or network-mounted
+    directories stream in instead of stalling. Both callbacks are
+    called from the worker thread.
+    """
+
+    def __init__(self, path: str, extensions: Sequence[str],
+                 on_batch: Callable[[List[DirectoryEntry]], None],
+                 on_complete: Callable[[List[DirectoryEntry], Optional[str]], None],
+                 cache: Optional[DirectoryCache] = None):
+        super().__init__(daemon=True)
+        self.path = path
+        self.extensions = tuple(extensions)
+        self.on_batch = on_batch
+        self.on_complete = on_complete
+        self.cache = cache
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop listing; neither callback will be called again."""
+        self._cancelled.set()
+
+    def run(self):
+        if self.cache is not None:
+            entries = self.cache.get(self.path, self.extensions)
+            if entries is not None:
+                self.on_complete(entries, None)
+                return
+
+        entries: List[DirectoryEntry] = []
+        batch: List[DirectoryEntry] = []
+        try:
+            # Taken first so changes made during the scan invalidate it
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            with os.scandir(self.path) as scan:
+                for item in scan:
+                    if self._cancelled.is_set():
+                        return
+                    try:
+                        is_dir = item.is_dir()
+                    except OSError:
+                        continue
+                    if not is_dir and os.path.splitext(item.name)[1] not in self.extensions:
+                        continue
+                    entry = DirectoryEntry(item.name, item.path, is_dir)
+                    entries.append(entry)
+                    batch.append(entry)
+                    if len(batch) >= LISTING_BATCH_SIZE:
+                        self.on_batch(batch)
+                        batch = []
+        except OSError as e:
+            if not self._cancelled.is_set():
+                self.on_complete(sort_entries(entries), str(e))
+            return
+
+        if self._cancelled.is_set():
+            return
+        if batch:
+            self.on_batch(batch)
+        entries = sort_entries(entries)
+        if self.cache is not None:
+            self.cache.put(self.path, self.extensions, mtime_ns, entries)
+        self.on_complete(entries, None)
@@ -5,6 +5,7 @@ from pathlib import Path
 import os
 from timecoded_transcript import parse_timecoded_text
 from constants import SUPPORTED_EXTENSIONS
+from utils.boundary_index import BoundaryIndex
 
 class Word:
     """Represents a word with optional timing information."""
@@ -28,6 +29,25 @@ class FileHandler:
         Returns:
             List of Word objects containing text and timing information
         
+        Raises:
+            ValueError: If file extension is not supported
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If file parsing fails
+        """
+        return FileHandler.load_document(filepath)[0]
+    
+    @staticmethod
+    def load_document(filepath: str) -> Tuple[List[Word], BoundaryIndex]:
+        """
+        Load and parse a text or timecode file with its sentence and
+        paragraph boundaries.
+        
+        Args:
+            filepath: Path to the file to load
+        
+        Returns:
+            Tuple of (list of Word objects, BoundaryIndex)
+        
         Raises:
             ValueError: If file extension is not supported
             FileNotFoundError: If file doesn't exist
@@ -46,9 +66,12 @@ class FileHandler:
             with open(filepath, 'r', encoding='utf-8') as file:
                 content = file.read()
             
+            boundaries = BoundaryIndex()
             if path.suffix == '.timecode':
-                return FileHandler._parse_timecode_file(content)
-            return FileHandler._parse_text_file(content)
+                words = FileHandler._parse_timecode_file(content, boundaries)
+            else:
+                words = FileHandler._parse_text_file(content, boundaries)
+            return words, boundaries
             
         except UnicodeDecodeError:
             raise RuntimeError("File must be UTF-8 encoded text")
@@ -56,36 +79,59 @@ class FileHandler:
             raise RuntimeError(f"Error parsing file: {str(e)}")
     
     @staticmethod
-    def _parse_timecode_file(content: str) -> List[Word]:
+    def _parse_timecode_file(content: str,
+                             boundaries: Optional[BoundaryIndex] = None) -> List[Word]:
         """
         Parse a timecoded transcript file.
         
+        Transcripts carry no line structure, so they form one paragraph.
+        
         Args:
             content: Raw file content
+            boundaries: Optional BoundaryIndex to record sentences into
             
         Returns:
             List of Word objects with timing information
         """
         try:
             parsed_data = parse_timecoded_text(content)
-            return [Word(word, start_time, end_time) 
-                    for word, start_time, end_time in parsed_data]
+            words = []
+            for word, start_time, end_time in parsed_data:
+                words.append(Word(word, start_time, end_time))
+                if boundaries is not None:
+                    boundaries.add_word(word)
+            return words
         except Exception as e:
             raise RuntimeError(f"Failed to parse timecode file: {str(e)}")
     
     @staticmethod
-    def _parse_text_file(content: str) -> List[Word]:
+    def _parse_text_file(content: str,
+                         boundaries: Optional[BoundaryIndex] = None) -> List[Word]:
         """
         Parse a regular text file.
         
+        Blank lines separate paragraphs. Sentence and paragraph boundaries
+        are recorded in the same pass that tokenizes the text.
+        
         Args:
             content: Raw file content
+            boundaries: Optional BoundaryIndex to record boundaries into
             
         Returns:
             List of Word objects
         """
-        return [Word(word.strip()) for word in content.split() 
-                if word.strip()]
+        words = []
+        for line in content.splitlines():
+            tokens = line.split()
+            if not tokens:
+                if boundaries is not None:
+                    boundaries.break_paragraph()
+                continue
+            for token in tokens:
+                words.append(Word(token))
+                if boundaries is not None:
+                    boundaries.add_word(token)
+        return words
 
     @staticmethod
     def verify_file_access(filepath: str) -> None:
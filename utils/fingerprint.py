@@ -0,0 +1,42 @@
+# utils/fingerprint.py
+
+import hashlib
+import os
+from constants import FINGERPRINT_BLOCK_SIZE, FINGERPRINT_BLOCKS
+
+
+def document_fingerprint(filepath: str, block_size: int = FINGERPRINT_BLOCK_SIZE,
+                         blocks: int = FINGERPRINT_BLOCKS) -> str:
+    """
+    Identify a document's contents without reading the whole file.
+
+    The fingerprint combines the file size, its modification time and a
+    hash of a few blocks sampled evenly across the file (always including
+    the first and last), so it costs a handful of reads however large the
+    file is. Small files are hashed in full.
+
+    Args:
+        filepath: Path to the document
+        block_size: Bytes read per sampled block
+        blocks: Number of blocks sampled
+
+    Returns:
+        Hex digest identifying the document
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    stat = os.stat(filepath)
+    size = stat.st_size
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{size}:{stat.st_mtime_ns}'.encode())
+
+    with open(filepath, 'rb') as file:
+        if size <= block_size * blocks:
+            digest.update(file.read())
+        else:
+            step = (size - block_size) / (blocks - 1)
+            for block in range(blocks):
+                file.seek(int(block * step))
+                digest.update(file.read(block_size))
+    return digest.hexdigest()
@@ -0,0 +1,97 @@
+# utils/focus_layout.py
+
+import threading
+from array import array
+from typing import Callable, Dict, Optional, Sequence, Tuple
+from utils.text_processor import TextProcessor
+from utils.width_predictor import WidthPredictor
+
+
+def compute_focus_offset(advances: Sequence[float], focus_pos: int,
+                         predictor: WidthPredictor) -> float:
+    """
+    Compute the distance from the left edge of a word's texture to the
+    middle of its focus character.
+
+    Mirrors the measurement RSVPReader.update_display makes from a
+    rendered texture, but scales the HarfBuzz advances to the predicted
+    texture width instead of the actual one.
+
+    Args:
+        advances: Unscaled HarfBuzz advances of the word's glyphs
+        focus_pos: Index of the focus character
+        predictor: Calibrated predictor for the font and size
+
+    Returns:
+        Focus offset in pixels
+    """
+    total = sum(advances)
+    if not total:
+        return 0.0
+    scale = predictor.predict(total, len(advances)) / total
+    focus_width = sum(advances[:focus_pos])
+    if focus_pos < len(advances):
+        focus_width += advances[focus_pos] / 2
+    return focus_width * scale
+
+
+class FocusLayoutWorker(threading.Thread):
+    """
+    Background thread that computes the focus position and focus offset
+    of every word in a document.
+
+    The worker owns its own TextMetrics and TextProcessor, since neither
+    FreeType faces nor the hyphenation dictionary are shared safely
+    across threads. Results are passed to on_complete as a pair of
+    arrays, (focus_positions, focus_offsets), indexed like the document.
+    on_complete is called from the worker thread. Focus positions do not
+    depend on the font, so positions from an earlier layout of the same
+    document can be passed in and are reused rather than recomputed.
+    """
+
+    def __init__(self, texts: Sequence[str], font_path: str, font_size: int,
+                 predictor: WidthPredictor,
+                 on_complete: Callable[[array, array], None],
+                 focus_positions: Optional[array] = None):
+        super().__init__(daemon=True)
+        self.texts = texts
+        self.font_path = font_path
+        self.font_size = font_size
+        self.predictor = predictor
+        self.on_complete = on_complete
+        self.focus_positions = focus_positions
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the worker; on_complete will not be called."""
+        self._cancelled.set()
+
+    def run(self):
+        # Imported here so FreeType and HarfBuzz stay off the startup path
+        from kivy_text_metrics import TextMetrics
+        metrics = TextMetrics(self.font_path, self.font_size)
+        text_processor = TextProcessor()
+        known_positions = self.focus_positions
+        focus_positions = known_positions if known_positions is not None else array('I')
+        focus_offsets = array('d')
+        # Books repeat the same few thousand words, so lay each out once
+        layout_cache: Dict[str, Tuple[int, float]] = {}
+
+        for index, text in enumerate(self.texts):
+            if self._cancelled.is_set():
+                return
+            layout = layout_cache.get(text)
+            if layout is None:
+                if known_positions is not None:
+                    focus_pos = known_positions[index]
+                else:
+                    focus_pos = text_processor.calculate_focus_character(text)
+                offset = compute_focus_offset(
+                    metrics.get_glyph_advances(text), focus_pos, self.predictor)
+                layout = layout_cache[text] = (focus_pos, offset)
+            if known_positions is None:
+                focus_positions.append(layout[0])
+            focus_offsets.append(layout[1])
+
+        if not self._cancelled.is_set():
+            self.on_complete(focus_positions, focus_offsets)
@@ -0,0 +1,186 @@
+# utils/font_index.py
+
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from constants import FONT_EXTENSIONS
+
+INDEX_VERSION = 3
+
+
+def font_display_name(family: str, style: str) -> str:
+    """Name a font is listed under: the family, plus the style unless Regular."""
+    if not style or style in ('Regular', 'Normal', 'Book', 'Roman'):
+        return family
+    return f'{family} {style}'
+
+
+def read_font_names(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Read the family and style names of a font file's first face.
+
+    Kivy's text providers, like the FreeType/HarfBuzz metrics, always
+    open the first face, so the other faces of a .ttc/.otc collection
+    are never read.
+
+    Args:
+        path: Font file
+
+    Returns:
+        (family, style), or None if FreeType cannot open the file or the
+        face has no family name
+    """
+    # Only needed when the index is rebuilt, so FreeType stays off the
+    # startup path otherwise
+    import freetype
+    try:
+        face = freetype.Face(path)
+    except freetype.FT_Exception:
+        return None
+    if not face.family_name:
+        return None
+    return (face.family_name.decode('utf-8', 'replace'),
+            (face.style_name or b'').decode('utf-8', 'replace'))
+
+
+def expand_directory(directory: str) -> str:
+    """Absolute form of a configured directory, with ~ and $VARIABLES expanded."""
+    return os.path.abspath(os.path.expandvars(os.path.expanduser(directory)))
+
+
+def find_font_file(directory: str, name: str) -> Optional[str]:
+    """
+    Find a font by file name, e.g. the bundled OpenDyslexic-Regular.otf
+    for 'OpenDyslexic', without opening any font file.
+
+    Returns:
+        Path of the first file named name or name-Regular, or None
+    """
+    try:
+        filenames = sorted(os.listdir(directory))
+    except OSError:
+        return None
+    for filename in filenames:
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() in FONT_EXTENSIONS and stem in (name, f'{name}-Regular'):
+            return os.path.join(directory, filename)
+    return None
+
+
+class FontIndex:
+    """
+    Installed fonts by display name, persisted as JSON.
+
+    The index remembers the modification time of every directory it
+    scanned. Adding, removing or renaming a font changes its directory's
+    mtime, so checking the index is a stat per font directory and
+    FreeType only has to open font files when something changed.
+
+    Only the first face of a .ttc/.otc collection is listed (see
+    read_font_names).
+    """
+
+    def __init__(self, roots: Sequence[str], directories: Dict[str, int],
+                 fonts: Dict[str, Tuple[str, str, str]]):
+        self.roots = list(roots)
+        self.directories = directories
+        self.fonts = fonts  # name -> (path, family, style)
+
+    @classmethod
+    def build(cls, roots: Sequence[str]) -> 'FontIndex':
+        """
+        Scan font directories recursively and read every font's names.
+
+        Earlier directories take precedence when two fonts share a name.
+
+        Args:
+            roots: Font directories; missing ones are skipped
+        """
+        roots = [expand_directory(root) for root in roots]
+        directories: Dict[str, int] = {}
+        fonts: Dict[str, Tuple[str, str, str]] = {}
+        for root in roots:
+            for directory, subdirectories, filenames in os.walk(root):
+                subdirectories.sort()
+                try:
+                    directories[directory] = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                for filename in sorted(filenames):
+                    if os.path.splitext(filename)[1].lower() not in FONT_EXTENSIONS:
+                        continue
+                    path = os.path.join(directory, filename)
+                    names = read_font_names(path)
+                    if names is not None:
+                        fonts.setdefault(font_display_name(*names), (path, *names))
+        return cls(roots, directories, fonts)
+
+    @classmethod
+    def load(cls, index_path: str) -> Optional['FontIndex']:
+        """Read a saved index, or None if it is missing or unreadable."""
+        try:
+            with open(index_path, encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') != INDEX_VERSION:
+                return None
+            return cls(data['roots'], data['directories'],
+                       {name: tuple(entry) for name, entry in data['fonts'].items()})
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def is_stale(self, roots: Sequence[str]) -> bool:
+        """Whether the font directories changed since the index was built."""
+        if [expand_directory(root) for root in roots] != self.roots:
+            return True
+        for directory, mtime_ns in self.directories.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        # A root that did not exist before may have been created since
+        return any(root not in self.directories and os.path.isdir(root)
+                   for root in self.roots)
+
+    def save(self, index_path: str):
+        """Write the index as JSON."""
+        with open(index_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'version': INDEX_VERSION,
+                'roots': self.roots,
+                'directories': self.directories,
+                'fonts': self.fonts,
+            }, file)
+
+    def names(self) -> List[str]:
+        """Display names of all indexed fonts, sorted."""
+        return sorted(self.fonts, key=str.casefold)
+
+    def path(self, name: str) -> Optional[str]:
+        """Font file for a display name, or None if it is not installed."""
+        entry = self.fonts.get(name)
+        return entry[0] if entry else None
+
+
+class FontIndexBuilder(threading.Thread):
+    """
+    Background thread that rebuilds a FontIndex, saves it and passes it
+    to on_complete (called from the worker thread), so opening every
+    installed font never happens on the startup path.
+    """
+
+    def __init__(self, index_path: str, roots: Sequence[str],
+                 on_complete: Callable[[FontIndex], None]):
+        super().__init__(daemon=True)
+        self.index_path = index_path
+        self.roots = list(roots)
+        self.on_complete = on_complete
+
+    def run(self):
+        index = FontIndex.build(self.roots)
+        try:
+            index.save(self.index_path)
+        except OSError as e:
+            print(f"Error saving font index: {e}")
+        self.on_complete(index)
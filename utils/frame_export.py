@@ -0,0 +1,346 @@
+# utils/frame_export.py
+
+import json
+import math
+import os
+import shutil
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from constants import (FOCUS_COLOR, CENTER_MARKER_COLOR, FRAME_EXPORT_CHUNK_SIZE)
+from utils.file_handler import Word
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+BACKGROUND = (0, 0, 0)  # Kivy's default window clear color
+TEXT_COLOR = (255, 255, 255)  # Kivy's default label color
+MANIFEST_FILE = 'manifest.json'
+CONCAT_FILE = 'frames.ffconcat'  # The same runs as an ffmpeg concat script
+SEQUENCE_DIRECTORY = 'frames'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _rgb(color) -> Tuple[int, int, int]:
+    """An 8-bit RGB triple from a hex string or a Kivy 0-1 RGBA tuple."""
+    if isinstance(color, str):
+        return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+    return tuple(round(channel * 255) for channel in color[:3])
+
+
+class FrameRun(NamedTuple):
+    """Consecutive frames that show the same word."""
+    word: int
+    first_frame: int
+    frames: int
+
+
+def frame_runs(timeline: Timeline, wpm: float, fps: float) -> List[FrameRun]:
+    """
+    Find the word shown on every frame of a session, as runs of frames.
+
+    Frame f shows the word Timeline.index_at(f / fps, wpm) would find,
+    so the frames agree with playback; words shorter than a frame at
+    this speed are not shown on any frame and have no run.
+
+    Args:
+        timeline: The document's Timeline
+        wpm: Reading speed
+        fps: Frames per second
+
+    Returns:
+        FrameRuns in frame order
+    """
+    runs: List[FrameRun] = []
+    starts = timeline.starts
+    last = len(timeline) - 1
+    total = timeline.total_time(wpm)
+    word = 0
+    frame = 0
+    # A merge of frame times with word start times, rather than a
+    # binary search per frame
+    while frame / fps < total:
+        position = frame / fps * wpm
+        while word < last and starts[word + 1] <= position:
+            word += 1
+        if runs and runs[-1].word == word:
+            runs[-1] = runs[-1]._replace(frames=runs[-1].frames + 1)
+        else:
+            runs.append(FrameRun(word, frame, 1))
+        frame += 1
+    return runs
+
+
+def encode_png(width: int, height: int, rows: Sequence[bytes]) -> bytes:
+    """Encode 8-bit RGB rows as a PNG, with no filtering."""
+    def chunk(tag, data):
+        return (struct.pack('>I', len(data)) + tag + data
+                + struct.pack('>I', zlib.crc32(tag + data)))
+    raw = b''.join(b'\x00' + bytes(row) for row in rows)
+    return (PNG_SIGNATURE
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw))
+            + chunk(b'IEND', b''))
+
+
+class FrameRenderer:
+    """
+    Draws RSVP frames with FreeType, without a window or Kivy.
+
+    A word is placed the way RSVPReader.update_display and WordDisplay
+    place its texture: its focus offset (the HarfBuzz advances before the
+    focus glyph plus half of the focus glyph) is put on the frame's
+    center line, and its line box is centered vertically. The texture
+    drawn here is laid out with those same advances, so no width scaling
+    is needed. Center markers are drawn above and below the line box.
+    """
+
+    def __init__(self, font_path: str, font_size: int, width: int, height: int):
+        # Imported here so FreeType and HarfBuzz stay off the startup path
+        import freetype
+        from kivy_text_metrics import TextMetrics
+        self._render_flags = freetype.FT_LOAD_RENDER
+        self.metrics = TextMetrics(font_path, font_size)
+        self.width = width
+        self.height = height
+        size = self.metrics.face.size
+        ascender, descender = size.ascender / 64.0, size.descender / 64.0
+        line_height = math.ceil(ascender - descender)
+        self.line_top = int(height / 2 - line_height / 2)
+        self.line_bottom = self.line_top + line_height
+        self.baseline = self.line_top + round(ascender)
+        # Glyph id -> (left, top, width, rows, bitmap rows)
+        self._glyphs: Dict[int, Tuple[int, int, int, int, List[bytes]]] = {}
+
+        self._blank_row = bytes(BACKGROUND) * width
+        marker_width = max(2, font_size // 16)
+        marker_height = round(font_size * 0.25)
+        marker_left = int(width / 2 - marker_width / 2)
+        marker_row = bytearray(self._blank_row)
+        marker_row[3 * marker_left:3 * (marker_left + marker_width)] = \
+            bytes(_rgb(CENTER_MARKER_COLOR)) * marker_width
+        marker_row = bytes(marker_row)
+        gap = max(1, font_size // 16)
+        self._marker_rows = {}
+        for y in range(self.line_top - gap - marker_height, self.line_top - gap):
+            self._marker_rows[y] = marker_row
+        for y in range(self.line_bottom + gap, self.line_bottom + gap + marker_height):
+            self._marker_rows[y] = marker_row
+
+        # Coverage -> channel value, for text drawn over the background
+        def ramp(color):
+            return [bytes(background + (channel - background) * coverage // 255
+                          for coverage in range(256))
+                    for channel, background in zip(color, BACKGROUND)]
+        self._text_ramp = ramp(TEXT_COLOR)
+        self._focus_ramp = ramp(_rgb(FOCUS_COLOR))
+
+    def _glyph(self, glyph_id: int):
+        glyph = self._glyphs.get(glyph_id)
+        if glyph is None:
+            face = self.metrics.face
+            face.load_glyph(glyph_id, self._render_flags)
+            bitmap = face.glyph.bitmap
+            data = bytes(bitmap.buffer)
+            pitch = bitmap.pitch
+            rows = [data[row * pitch:row * pitch + bitmap.width]
+                    for row in range(bitmap.rows)]
+            glyph = self._glyphs[glyph_id] = (face.glyph.bitmap_left, face.glyph.bitmap_top,
+                                              bitmap.width, bitmap.rows, rows)
+        return glyph
+
+    def focus_offset(self, glyphs, focus_pos: int) -> float:
+        """Distance from the word's left edge to the middle of its focus glyph."""
+        advances = [advance for _, _, advance in glyphs]
+        focus_width = sum(advances[:focus_pos])
+        if focus_pos < len(advances):
+            focus_width += advances[focus_pos] / 2
+        return focus_width
+
+    def render(self, text: str, focus_pos: int) -> bytes:
+        """
+        Draw one frame showing a word.
+
+        Args:
+            text: The word
+            focus_pos: Index of its focus character, drawn in FOCUS_COLOR
+
+        Returns:
+            The frame as PNG data
+        """
+        glyphs = self.metrics.get_glyphs(text)
+        word_x = int(self.width / 2 - self.focus_offset(glyphs, focus_pos))
+
+        # Coverage of the normal and the focus text, by frame row
+        planes: Dict[int, Tuple[bytearray, bytearray]] = {}
+        left, right = self.width, 0
+        pen = 0.0
+        for glyph_id, cluster, advance in glyphs:
+            glyph_left, glyph_top, glyph_width, glyph_rows, rows = self._glyph(glyph_id)
+            x = word_x + round(pen) + glyph_left
+            pen += advance
+            x0, x1 = max(0, x), min(self.width, x + glyph_width)
+            if x0 >= x1:
+                continue
+            left, right = min(left, x0), max(right, x1)
+            plane = 1 if cluster == focus_pos else 0
+            y = self.baseline - glyph_top
+            for row in range(glyph_rows):
+                if not 0 <= y + row < self.height:
+                    continue
+                target = planes.get(y + row)
+                if target is None:
+                    target = planes[y + row] = (bytearray(self.width), bytearray(self.width))
+                target = target[plane]
+                source = rows[row][x0 - x:x1 - x]
+                # Neighbouring glyphs can overlap; keep the stronger coverage
+                target[x0:x1] = bytes(map(max, target[x0:x1], source))
+
+        frame_rows = []
+        for y in range(self.height):
+            coverage = planes.get(y)
+            if coverage is None:
+                frame_rows.append(self._marker_rows.get(y, self._blank_row))
+                continue
+            text_plane, focus_plane = (plane[left:right] for plane in coverage)
+            span = bytearray(3 * (right - left))
+            for channel in range(3):
+                span[channel::3] = bytes(map(
+                    max, text_plane.translate(self._text_ramp[channel]),
+                    focus_plane.translate(self._focus_ramp[channel])))
+            row = bytearray(self._marker_rows.get(y, self._blank_row))
+            row[3 * left:3 * right] = span
+            frame_rows.append(row)
+        return encode_png(self.width, self.height, frame_rows)
+
+
+# One FrameRenderer per worker process, created by _init_worker
+_renderer: Optional[FrameRenderer] = None
+
+
+def _init_worker(font_path: str, font_size: int, width: int, height: int):
+    global _renderer
+    _renderer = FrameRenderer(font_path, font_size, width, height)
+
+
+def render_images(task: Sequence[Tuple[str, str, int]]) -> int:
+    """
+    Render a chunk of word images. Runs in a frame export worker process.
+
+    Args:
+        task: (path, text, focus_pos) for every image to write
+
+    Returns:
+        Number of images written
+    """
+    for path, text, focus_pos in task:
+        with open(path, 'wb') as file:
+            file.write(_renderer.render(text, focus_pos))
+    return len(task)
+
+
+def export_frames(words: Sequence[Word], timeline: Timeline, wpm: float,
+                  output_dir: str, font_path: str, font_size: int,
+                  size: Tuple[int, int], fps: float,
+                  focus_positions: Optional[Sequence[int]] = None,
+                  workers: Optional[int] = None, sequence: bool = False,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> dict:
+    """
+    Render a reading session to PNG frames in a process pool.
+
+    Consecutive frames that show the same word are one image, and so are
+    all words with the same text and focus position: each image is
+    rendered once, by the worker whose frame range it first appears in.
+    MANIFEST_FILE maps every run of frames to its image, and
+    CONCAT_FILE lists the same runs for ffmpeg's concat demuxer.
+
+    Args:
+        words: Document words
+        timeline: The document's Timeline
+        wpm: Reading speed
+        output_dir: Directory to write images and manifests to
+        font_path: Font file to draw words with
+        font_size: Font size in pixels
+        size: Frame (width, height) in pixels
+        fps: Frames per second
+        focus_positions: Precomputed focus positions, if any
+        workers: Rendering processes (default: one per CPU)
+        sequence: Also write every frame to SEQUENCE_DIRECTORY, as hard
+            links to the images where the file system allows
+        on_progress: Called with (images written, total images)
+
+    Returns:
+        The manifest
+
+    Raises:
+        OSError: If the output cannot be written
+        ValueError: If wpm or fps is not positive, or the font is unusable
+    """
+    if wpm <= 0 or fps <= 0:
+        raise ValueError("WPM and frame rate must be positive")
+    try:
+        # Fails here, rather than as a broken pool when every worker starts
+        FrameRenderer(font_path, font_size, *size)
+    except Exception as e:  # FreeType raises its own FT_Exception
+        raise ValueError(f"Cannot draw with font {font_path}: {e}")
+    os.makedirs(output_dir, exist_ok=True)
+    runs = frame_runs(timeline, wpm, fps)
+
+    text_processor = None
+    images: Dict[Tuple[str, int], str] = {}
+    tasks: List[List[Tuple[str, str, int]]] = [[]]
+    manifest_runs = []
+    for word, first_frame, frames in runs:
+        text = words[word].text
+        if focus_positions is not None:
+            focus_pos = focus_positions[word]
+        else:
+            text_processor = text_processor or TextProcessor()
+            focus_pos = text_processor.calculate_focus_character(text)
+        name = images.get((text, focus_pos))
+        if name is None:
+            name = images[(text, focus_pos)] = f'word_{word:07d}.png'
+            if len(tasks[-1]) == FRAME_EXPORT_CHUNK_SIZE:
+                tasks.append([])
+            tasks[-1].append((os.path.join(output_dir, name), text, focus_pos))
+        manifest_runs.append([first_frame, frames, name, word])
+
+    done = 0
+    if images:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(font_path, font_size, *size)) as executor:
+            for count in executor.map(render_images, tasks):
+                done += count
+                if on_progress:
+                    on_progress(done, len(images))
+
+    width, height = size
+    frame_count = sum(frames for _, frames, _, _ in manifest_runs)
+    manifest = {'fps': fps, 'wpm': wpm, 'width': width, 'height': height,
+                'frames': frame_count, 'images': len(images),
+                # [first frame, frame count, image, word index]
+                'runs': manifest_runs}
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+    with open(os.path.join(output_dir, CONCAT_FILE), 'w', encoding='utf-8') as file:
+        file.write('ffconcat version 1.0\n')
+        for _, frames, name, _ in manifest_runs:
+            file.write(f'file {name}\nduration {frames / fps!r}\n')
+        if manifest_runs:
+            # The concat demuxer ignores the last file's duration
+            file.write(f'file {manifest_runs[-1][2]}\n')
+
+    if sequence:
+        directory = os.path.join(output_dir, SEQUENCE_DIRECTORY)
+        os.makedirs(directory, exist_ok=True)
+        for first_frame, frames, name, _ in manifest_runs:
+            image = os.path.join(output_dir, name)
+            for frame in range(first_frame, first_frame + frames):
+                target = os.path.join(directory, f'frame_{frame:07d}.png')
+                if os.path.lexists(target):
+                    os.remove(target)
+                try:
+                    os.link(image, target)
+                except OSError:
+                    shutil.copyfile(image, target)
+    return manifest
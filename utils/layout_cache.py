@@ -0,0 +1,107 @@
+# utils/layout_cache.py
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from constants import LAYOUT_CACHE_SIZE
+
+
+class FontLayout:
+    """
+    Everything the reader has measured or rendered for one (font, size).
+
+    Attributes:
+        key: (font_name, font_size)
+        metrics: TextMetrics for the font and size, created on first use
+        focus_offsets: Focus offset of every word in the document, or None
+            until a FocusLayoutWorker has finished
+        prepared: Word index -> (texture, focus offset, markup) for the
+            words rendered around the reading position
+        worker: The FocusLayoutWorker filling in focus_offsets, if running
+    """
+
+    def __init__(self, key: Tuple[str, int]):
+        self.key = key
+        self.metrics = None
+        self.focus_offsets: Optional[array] = None
+        self.prepared: Dict[int, tuple] = {}
+        self.worker = None
+
+    def cancel(self):
+        """
+        Stop the layout worker, if any.
+
+        Returns:
+            The cancelled worker, which may still be running, or None
+        """
+        worker, self.worker = self.worker, None
+        if worker:
+            worker.cancel()
+        return worker
+
+    def reset_document(self):
+        """
+        Drop what depends on the open document, keeping the metrics.
+
+        Returns:
+            The cancelled layout worker, or None
+        """
+        worker = self.cancel()
+        self.focus_offsets = None
+        self.prepared = {}
+        return worker
+
+
+class LayoutCache:
+    """
+    FontLayouts of the LAYOUT_CACHE_SIZE most recently used settings.
+
+    Switching the font or size selects (or creates) the FontLayout for
+    the new setting and leaves the old one intact, so switching back
+    reuses its metrics, focus offsets and rendered words, and a layout
+    still being computed keeps going in the background. Evicted layouts
+    have their worker cancelled.
+    """
+
+    def __init__(self, capacity: int = LAYOUT_CACHE_SIZE):
+        self.capacity = capacity
+        self._layouts: 'OrderedDict[Tuple[str, int], FontLayout]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def __contains__(self, key):
+        return key in self._layouts
+
+    def get(self, font_name: str, font_size: int) -> FontLayout:
+        """
+        The layout for a setting, created if needed and marked most recent.
+
+        Args:
+            font_name: Kivy font name
+            font_size: Font size in points (before dp scaling)
+
+        Returns:
+            The setting's FontLayout
+        """
+        key = (font_name, font_size)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = FontLayout(key)
+            while len(self._layouts) > self.capacity:
+                _, evicted = self._layouts.popitem(last=False)
+                evicted.cancel()
+        else:
+            self._layouts.move_to_end(key)
+        return layout
+
+    def reset_document(self):
+        """
+        Forget every setting's document layout, e.g. when a new document opens.
+
+        Returns:
+            The cancelled layout workers; they stop at their next word
+            but may still be reading the old document until then
+        """
+        workers = [layout.reset_document() for layout in self._layouts.values()]
+        return [worker for worker in workers if worker is not None]
@@ -0,0 +1,316 @@
+# utils/library_indexer.py
+
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from constants import SUPPORTED_EXTENSIONS, LIBRARY_COMMIT_BATCH, LIBRARY_CHUNK_SIZE
+from utils.file_handler import FileHandler
+from utils.fingerprint import document_fingerprint
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    word_count INTEGER NOT NULL,
+    reading_units REAL NOT NULL
+)
+"""
+
+
+class LibraryEntry(NamedTuple):
+    """An indexed document."""
+    path: str
+    mtime_ns: int
+    size: int
+    fingerprint: str
+    word_count: int
+    reading_units: float  # Reading time at 1 WPM, see Timeline
+
+    def reading_time(self, wpm: float) -> float:
+        """Estimated reading time in seconds at the given WPM."""
+        return self.reading_units / wpm
+
+
+# One TextProcessor per worker process, created on first use
+_text_processor: Optional[TextProcessor] = None
+
+
+def index_document(path: str) -> Optional[LibraryEntry]:
+    """
+    Compute a document's library entry. Runs in a worker process.
+
+    Args:
+        path: Path to a supported document
+
+    Returns:
+        The LibraryEntry, or None if the file cannot be read or parsed
+    """
+    global _text_processor
+    if _text_processor is None:
+        _text_processor = TextProcessor()
+    try:
+        stat = os.stat(path)
+        words, boundaries = FileHandler.load_document(path)
+        timeline = Timeline.build(words, _text_processor, boundaries)
+        return LibraryEntry(path, stat.st_mtime_ns, stat.st_size,
+                            document_fingerprint(path), len(words),
+                            timeline.total_time(1))
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+
+def scan_directories(directories: Sequence[str]) -> Iterator[Tuple[str, int, int]]:
+    """
+    Walk directories for supported documents.
+
+    Args:
+        directories: Directories to scan recursively (~ is expanded);
+            missing ones are skipped
+
+    Yields:
+        (path, mtime_ns, size) of each document found
+    """
+    pending = [os.path.abspath(os.path.expanduser(directory))
+               for directory in directories]
+    seen = set()
+    while pending:
+        directory = pending.pop()
+        if directory in seen:
+            continue
+        seen.add(directory)
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif (os.path.splitext(entry.name)[1] in SUPPORTED_EXTENSIONS
+                              and entry.is_file()):
+                            stat = entry.stat()
+                            yield entry.path, stat.st_mtime_ns, stat.st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class LibraryIndex:
+    """
+    On-disk index of library documents in a local SQLite file.
+
+    Opening the library only reads this table; keeping it current is the
+    job of LibraryIndexer.
+    """
+
+    def __init__(self, db_path: str):
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def entries(self) -> List[LibraryEntry]:
+        """All indexed documents, sorted by path."""
+        rows = self.connection.execute(
+            'SELECT path, mtime_ns, size, fingerprint, word_count, reading_units '
+            'FROM documents ORDER BY path')
+        return [LibraryEntry(*row) for row in rows]
+
+    def known(self) -> Dict[str, Tuple[int, int]]:
+        """Map of indexed path to its (mtime_ns, size) when indexed."""
+        rows = self.connection.execute('SELECT path, mtime_ns, size FROM documents')
+        return {path: (mtime_ns, size) for path, mtime_ns, size in rows}
+
+    def update(self, entries: Sequence[LibraryEntry]):
+        """Add or replace entries in one transaction."""
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)',
+                entries)
+
+    def remove(self, paths: Sequence[str]):
+        """Drop entries in one transaction."""
+        with self.connection:
+            self.connection.executemany(
+                'DELETE FROM documents WHERE path = ?', [(path,) for path in paths])
+
+    def close(self):
+        self.connection.close()
+
+
+def update_library(index: LibraryIndex, directories: Sequence[str],
+                   on_progress: Optional[Callable[[int, int], None]] = None,
+                   workers: Optional[int] = None,
+                   cancelled: Optional[threading.Event] = None) -> Optional[int]:
+    """
+    Index new and modified documents and drop deleted ones.
+
+    Only files whose mtime or size changed since they were indexed are
+    parsed, spread across a process pool, and results are committed in
+    batches. Runs in the indexing process (see LibraryIndexer): the pool
+    uses the spawn start method, and its workers import this module as
+    their main module, never the app.
+
+    Args:
+        index: The LibraryIndex to update
+        directories: Library directories
+        on_progress: Called with (documents parsed, documents to parse)
+        workers: Worker processes (default: one per CPU)
+        cancelled: Optional event that stops indexing when set; running
+            workers finish their current chunk first
+
+    Returns:
+        Number of entries added, updated or removed, or None if cancelled
+    """
+    known = index.known()
+    stale = []
+    for path, mtime_ns, size in scan_directories(directories):
+        if cancelled is not None and cancelled.is_set():
+            return None
+        if known.pop(path, None) != (mtime_ns, size):
+            stale.append(path)
+    # Whatever was not seen in the scan has been deleted or moved
+    if known:
+        index.remove(list(known))
+    if not stale:
+        return len(known)
+
+    done = 0
+    batch = []
+    executor = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context('spawn'))
+    try:
+        for entry in executor.map(index_document, stale,
+                                  chunksize=LIBRARY_CHUNK_SIZE):
+            if cancelled is not None and cancelled.is_set():
+                return None
+            done += 1
+            if entry is not None:
+                batch.append(entry)
+            if len(batch) >= LIBRARY_COMMIT_BATCH:
+                index.update(batch)
+                batch = []
+                if on_progress:
+                    on_progress(done, len(stale))
+    finally:
+        if batch:
+            index.update(batch)
+        executor.shutdown(wait=False, cancel_futures=True)
+    if on_progress:
+        on_progress(done, len(stale))
+    return len(stale) + len(known)
+
+
+class LibraryIndexer(threading.Thread):
+    """
+    Background thread that brings a LibraryIndex up to date.
+
+    The work is done by update_library in a separate indexing process
+    (this module run with -m), so the app's process, with its window,
+    GL context and threads, is never forked or re-imported by the
+    process pool. The process reports progress on its stdout, which the
+    thread reads, and stops when its stdin is closed.
+
+    Results are committed in batches, so a cancelled or interrupted run
+    keeps what it finished and the next run picks up from there.
+
+    on_progress(done, total) and on_complete(changed) are called from
+    the indexer thread.
+    """
+
+    def __init__(self, db_path: str, directories: Sequence[str],
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 on_complete: Optional[Callable[[int], None]] = None,
+                 workers: Optional[int] = None):
+        super().__init__(daemon=True)
+        self.db_path = db_path
+        self.directories = directories
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.workers = workers
+        self._cancelled = threading.Event()
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Stop indexing after the current batch; on_complete will not be called."""
+        with self._lock:
+            self._cancelled.set()
+            if self._process is not None:
+                # The indexing process stops when its stdin closes
+                self._process.stdin.close()
+
+    def run(self):
+        command = [sys.executable, '-m', 'utils.library_indexer',
+                   os.path.abspath(self.db_path)]
+        command += [os.path.abspath(os.path.expanduser(directory))
+                    for directory in self.directories]
+        if self.workers:
+            command += ['--workers', str(self.workers)]
+        # Kivy (pulled in by constants) must not parse the arguments or log to the console
+        environment = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            try:
+                self._process = subprocess.Popen(
+                    command, cwd=root, env=environment, stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE, text=True)
+            except OSError as e:
+                print(f"Error starting library indexer: {e}")
+                return
+
+        changed = None
+        for line in self._process.stdout:
+            # Anything else on the process's stdout (e.g. from a library) is ignored
+            fields = line.split()
+            if len(fields) == 3 and fields[0] == 'progress' and self.on_progress:
+                self.on_progress(int(fields[1]), int(fields[2]))
+            elif len(fields) == 2 and fields[0] == 'complete':
+                changed = int(fields[1])
+        self._process.wait()
+        if self._cancelled.is_set():
+            return
+        if changed is None:
+            print(f"Error indexing library: indexer exited with {self._process.returncode}")
+        elif self.on_complete:
+            self.on_complete(changed)
+
+
+def main():
+    """Update a library index; run by LibraryIndexer in its own process."""
+    parser = argparse.ArgumentParser(description='Update a library index.')
+    parser.add_argument('db_path')
+    parser.add_argument('directories', nargs='*')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    # LibraryIndexer cancels by closing stdin (as does the app exiting)
+    cancelled = threading.Event()
+    threading.Thread(target=lambda: (sys.stdin.read(), cancelled.set()),
+                     daemon=True).start()
+
+    def report(done, total):
+        print('progress', done, total, flush=True)
+
+    index = LibraryIndex(args.db_path)
+    try:
+        changed = update_library(index, args.directories, report, args.workers,
+                                 cancelled)
+    finally:
+        index.close()
+    if changed is not None:
+        print('complete', changed, flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+# utils/playback_engine.py
+
+from typing import Callable, List, Optional
+from constants import DEFAULT_WPM
+from utils.boundary_index import BoundaryIndex
+from utils.file_handler import Word
+from utils.playback_scheduler import PlaybackScheduler
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+from utils.timing_recorder import TimingRecorder
+
+
+class PlaybackEngine:
+    """
+    Owns a document's words, the current position, its timeline and the
+    playback schedule, independent of any widget.
+
+    The engine runs against an injectable clock providing now() and
+    schedule_once(callback, delay) (see utils.clocks): KivyClock inside
+    the app, RealtimeClock for headless real-time playback, or
+    VirtualClock to play hour-long sessions in milliseconds.
+
+    on_word(index) is called whenever a word should be shown and
+    on_finished() when playback runs off the end of the document. on_word
+    may return the clock time the word actually appeared, so work it
+    does after drawing (e.g. preparing the next word) is not counted as
+    display latency; otherwise the time it returns at is recorded.
+    """
+
+    def __init__(self, clock, text_processor: Optional[TextProcessor] = None,
+                 wpm: int = DEFAULT_WPM,
+                 on_word: Optional[Callable[[int], Optional[float]]] = None,
+                 on_finished: Optional[Callable[[], None]] = None):
+        self.clock = clock
+        self.text_processor = text_processor or TextProcessor()
+        self.wpm = wpm
+        self.on_word = on_word
+        self.on_finished = on_finished
+        self.words: List[Word] = []
+        self.index = 0
+        self.timeline = Timeline.build([])
+        self.boundaries = BoundaryIndex()
+        self.is_playing = False
+        self.scheduler = PlaybackScheduler(self._advance, clock.schedule_once,
+                                           clock.now)
+        self.recorder = TimingRecorder()
+
+    def load(self, words: List[Word], timeline: Optional[Timeline] = None,
+             boundaries: Optional[BoundaryIndex] = None):
+        """
+        Load a document, stopping any playback and rewinding to the start.
+
+        Args:
+            words: Document words
+            timeline: Precomputed timeline for words, built if not given
+            boundaries: Sentence/paragraph boundaries of the document; the
+                whole document is one sentence and paragraph if not given
+        """
+        self.pause()
+        self.words = words
+        self.index = 0
+        if boundaries is None:
+            boundaries = BoundaryIndex()
+            for word in words:
+                boundaries.add_word('')
+        self.boundaries = boundaries
+        self.timeline = timeline or Timeline.build(
+            words, self.text_processor, boundaries)
+
+    def play(self):
+        """Start or resume playback from the current word."""
+        if self.is_playing or not self.words:
+            return
+        self.is_playing = True
+        # Re-anchor the timeline so time spent paused is not caught up
+        self.scheduler.start()
+        self.recorder.start_session()
+        self._show_current()
+
+    def pause(self):
+        """Pause playback on the current word."""
+        if not self.is_playing:
+            return
+        self.is_playing = False
+        self.scheduler.stop()
+        self.recorder.end_session(self.clock.now())
+
+    def set_wpm(self, wpm: int):
+        """
+        Change the reading speed, taking effect immediately.
+
+        The pending advance is rescheduled in proportion to its remaining
+        time. Nothing else needs re-timing: the timeline is WPM
+        independent, so every later word is timed at the new speed as it
+        comes up.
+
+        Args:
+            wpm: New words per minute
+        """
+        old_wpm = self.wpm
+        self.wpm = wpm
+        if self.is_playing and wpm != old_wpm:
+            duration = self.scheduler.rescale(old_wpm / wpm)
+            if duration is not None:
+                self.recorder.retime_last(duration)
+
+    def seek(self, index: int):
+        """
+        Jump to a word, keeping the playing/paused state.
+
+        When playing, the timeline is re-anchored at the target word so
+        it gets its full duration, and timing starts a new session.
+
+        Args:
+            index: Target word index (clamped to the document)
+        """
+        if not self.words:
+            return
+        self.index = max(0, min(index, len(self.words) - 1))
+        if self.is_playing:
+            self.recorder.end_session(self.clock.now())
+            self.scheduler.start()
+            self.recorder.start_session()
+            self._show_current()
+        elif self.on_word:
+            self.on_word(self.index)
+
+    def previous_sentence(self):
+        """Jump back to the start of the sentence (or the previous one)."""
+        if self.words:
+            self.seek(self.boundaries.previous_sentence(self.index))
+
+    def next_sentence(self):
+        """Jump to the start of the next sentence."""
+        if self.words:
+            self.seek(self.boundaries.next_sentence(self.index))
+
+    def previous_paragraph(self):
+        """Jump back to the start of the paragraph (or the previous one)."""
+        if self.words:
+            self.seek(self.boundaries.previous_paragraph(self.index))
+
+    def next_paragraph(self):
+        """Jump to the start of the next paragraph."""
+        if self.words:
+            self.seek(self.boundaries.next_paragraph(self.index))
+
+    def seek_time(self, seconds: float):
+        """Jump to the word shown a given time into the document at the current WPM."""
+        self.seek(self.timeline.index_at(seconds, self.wpm))
+
+    def seek_percent(self, percent: float):
+        """Jump to the word shown a given percentage of the way through the document."""
+        self.seek_time(self.timeline.total_time(self.wpm) * percent / 100.0)
+
+    def position_time(self) -> float:
+        """Time from the start of the document to the current word at the current WPM."""
+        return self.timeline.start_time(self.index, self.wpm)
+
+    def position_percent(self) -> float:
+        """Current position as a percentage of the document's reading time."""
+        total = self.timeline.total_time(self.wpm)
+        return 100.0 * self.position_time() / total if total else 0.0
+
+    def current_duration(self) -> float:
+        """Display duration of the current word at the current WPM."""
+        return self.timeline.duration(self.index, self.wpm)
+
+    def _show_current(self):
+        """Show the current word and schedule the advance past it."""
+        intended_start = self.scheduler.current_start
+        shown_at = self.on_word(self.index) if self.on_word else None
+        if shown_at is None:
+            shown_at = self.clock.now()
+
+        duration = self.current_duration()
+        self.scheduler.schedule(duration)
+        self.recorder.record(self.index, intended_start, duration, shown_at)
+
+    def _advance(self):
+        """Move to the next word, stopping at the end of the document."""
+        if not self.is_playing:
+            return
+        self.index += 1
+        if self.index >= len(self.words):
+            self.index = 0
+            self.pause()
+            if self.on_finished:
+                self.on_finished()
+            return
+        self._show_current()
@@ -0,0 +1,107 @@
+# utils/playback_scheduler.py
+
+import time
+from typing import Callable, Optional
+
+
+class PlaybackScheduler:
+    """
+    Schedules word advances against an absolute playback timeline.
+
+    Chaining relative timeouts lets every frame of callback latency add to
+    the total reading time. Instead, playback is anchored to a monotonic
+    start time and each word's end is targeted at the anchor plus the
+    cumulative intended durations, so a late callback shortens the next
+    delay rather than pushing back every later word.
+
+    The scheduler is not tied to a particular clock: schedule_once(callback,
+    delay) must return an event with a cancel() method (kivy's
+    Clock.schedule_once does) and time_source must be monotonic.
+    """
+
+    def __init__(self, callback: Callable[[], None],
+                 schedule_once: Callable,
+                 time_source: Callable[[], float] = time.perf_counter):
+        self.callback = callback
+        self.schedule_once = schedule_once
+        self.time_source = time_source
+        self._anchor: Optional[float] = None
+        self._elapsed = 0.0
+        self._word_start = 0.0
+        self._event = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the timeline is currently anchored."""
+        return self._anchor is not None
+
+    @property
+    def current_start(self) -> Optional[float]:
+        """Intended start time of the word that will be scheduled next."""
+        if self._anchor is None:
+            return None
+        return self._anchor + self._elapsed
+
+    def start(self):
+        """Anchor the timeline at the current time (start or resume)."""
+        self.cancel()
+        self._anchor = self.time_source()
+        self._elapsed = 0.0
+
+    def stop(self):
+        """Cancel any pending advance and drop the anchor (pause)."""
+        self.cancel()
+        self._anchor = None
+        self._elapsed = 0.0
+
+    def cancel(self):
+        """Cancel the pending advance, keeping the timeline anchored."""
+        if self._event:
+            self._event.cancel()
+            self._event = None
+
+    def schedule(self, duration: float):
+        """
+        Schedule the advance at the end of a word shown for duration.
+
+        Args:
+            duration: Intended display duration of the current word in seconds
+        """
+        if self._anchor is None:
+            self.start()
+        self.cancel()
+        self._word_start = self._anchor + self._elapsed
+        self._elapsed += duration
+        delay = max(0.0, self._anchor + self._elapsed - self.time_source())
+        self._event = self.schedule_once(self._fire, delay)
+
+    def rescale(self, factor: float) -> Optional[float]:
+        """
+        Stretch the remaining time of the pending advance.
+
+        Used when the reading speed changes mid-word: the part of the
+        word already shown stands, and only what is left is scaled. The
+        timeline is re-anchored at the current time so later words
+        follow on from the new end time.
+
+        Args:
+            factor: Multiplier for the remaining time (old WPM / new WPM)
+
+        Returns:
+            The current word's new total intended duration, or None if no
+            advance is pending
+        """
+        if self._event is None:
+            return None
+        now = self.time_source()
+        remaining = max(0.0, self._anchor + self._elapsed - now) * factor
+        self.cancel()
+        self._anchor = now
+        self._elapsed = remaining
+        self._event = self.schedule_once(self._fire, remaining)
+        return now + remaining - self._word_start
+
+    def _fire(self, *args):
+        """Run the advance callback for the word that just ended."""
+        self._event = None
+        self.callback()
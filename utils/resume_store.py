@@ -0,0 +1,189 @@
+# utils/resume_store.py
+
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+from constants import RESUME_SAVE_DELAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume (
+    fingerprint TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    word_index INTEGER NOT NULL,
+    wpm INTEGER NOT NULL,
+    font_name TEXT NOT NULL,
+    font_size INTEGER NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class ResumeState(NamedTuple):
+    """Where and how a document was last being read."""
+    path: str
+    word_index: int
+    wpm: int
+    font_name: str
+    font_size: int
+
+
+class ResumeStore:
+    """
+    Persistent per-document reading positions in a local SQLite file.
+
+    Entries are keyed by document fingerprint (see utils.fingerprint), so
+    a lookup is a single primary-key query and a moved or renamed file
+    still resumes.
+
+    save() only records the state in memory. A writer thread commits
+    everything saved in the last RESUME_SAVE_DELAY seconds in one
+    transaction. save_position() only updates the word index of a state
+    already saved, so it can be called on every word without allocating.
+    Call close() (or flush()) on exit to write what is pending.
+    """
+
+    def __init__(self, db_path: str, delay: float = RESUME_SAVE_DELAY):
+        self.db_path = db_path
+        self.delay = delay
+        # Last saved state of each document, as a mutable ResumeState
+        self._states: Dict[str, List] = {}
+        # Documents with unwritten changes, in order of last save
+        self._pending: Dict[str, None] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._connection = self._connect()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the store, creating the table if needed."""
+        connection = sqlite3.connect(self.db_path)
+        # WAL lets the main thread read while the writer commits
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(SCHEMA)
+        connection.commit()
+        return connection
+
+    def get(self, fingerprint: str) -> Optional[ResumeState]:
+        """
+        Look up a document's last reading state.
+
+        Args:
+            fingerprint: Document fingerprint
+
+        Returns:
+            The saved ResumeState, or None if the document is unknown
+        """
+        with self._lock:
+            state = self._states.get(fingerprint)
+            if state is not None:
+                return ResumeState(*state)
+        row = self._connection.execute(
+            'SELECT path, word_index, wpm, font_name, font_size '
+            'FROM resume WHERE fingerprint = ?', (fingerprint,)
+        ).fetchone()
+        return ResumeState(*row) if row else None
+
+    def most_recent(self) -> Optional[ResumeState]:
+        """The most recently saved state, e.g. to reopen the last document."""
+        with self._lock:
+            if self._pending:
+                return ResumeState(*self._states[next(reversed(self._pending))])
+        # A batch shares one timestamp; INSERT OR REPLACE gives each row a
+        # new rowid, so the rowid orders saves within it
+        row = self._connection.execute(
+            'SELECT path, word_index, wpm, font_name, font_size '
+            'FROM resume ORDER BY updated DESC, rowid DESC LIMIT 1'
+        ).fetchone()
+        return ResumeState(*row) if row else None
+
+    def save(self, fingerprint: str, state: ResumeState):
+        """
+        Record a document's reading state, to be written shortly.
+
+        Args:
+            fingerprint: Document fingerprint
+            state: Current reading state
+        """
+        with self._lock:
+            self._states[fingerprint] = list(state)
+            self._mark_pending(fingerprint)
+        self._wake.set()
+
+    def save_position(self, fingerprint: str, word_index: int) -> bool:
+        """
+        Record a new word index for a document, keeping its other settings.
+
+        Args:
+            fingerprint: Document fingerprint
+            word_index: Current word index
+
+        Returns:
+            False if no state has been saved for the document yet, in
+            which case nothing is recorded and save() must be used
+        """
+        with self._lock:
+            state = self._states.get(fingerprint)
+            if state is None:
+                return False
+            state[1] = word_index
+            self._mark_pending(fingerprint)
+        self._wake.set()
+        return True
+
+    def _mark_pending(self, fingerprint: str):
+        """Queue a document's state for writing; the caller holds the lock."""
+        # Re-inserted so the pending map stays in order of last save
+        self._pending.pop(fingerprint, None)
+        self._pending[fingerprint] = None
+
+    def flush(self):
+        """Write all pending states now."""
+        self._write_pending(self._connection)
+
+    def close(self):
+        """Stop the writer thread, write pending states and close the store."""
+        # Kivy can dispatch on_stop more than once
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        self._connection.close()
+
+    def _write_pending(self, connection: sqlite3.Connection):
+        """Write every pending state in one transaction."""
+        # Held across take and write so an older batch never lands last
+        with self._write_lock:
+            now = time.time()
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                # Copied under the lock, as save_position() updates in place
+                rows = [(fingerprint, *self._states[fingerprint], now)
+                        for fingerprint in pending]
+            if not rows:
+                return
+            with connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO resume VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+
+    def _write_loop(self):
+        """Writer thread: commit pending states at most once per delay."""
+        connection = self._connect()
+        try:
+            while True:
+                self._wake.wait()
+                # Let saves accumulate, but wake early when closing
+                self._closed.wait(self.delay)
+                if self._closed.is_set():
+                    return
+                self._wake.clear()
+                self._write_pending(connection)
+        finally:
+            connection.close()
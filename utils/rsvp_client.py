@@ -0,0 +1,81 @@
+# utils/rsvp_client.py
+
+import json
+import socket
+import threading
+from typing import Callable, Optional
+
+CONNECT_TIMEOUT = 5.0  # Seconds to wait for the server to accept
+
+
+class RemoteSession(threading.Thread):
+    """
+    Background thread following a session on an RSVPServer (see
+    utils.rsvp_server for the protocol).
+
+    Every message the server sends is passed to on_message(message) as a
+    dict; when the connection ends, on_closed(error) is called with an
+    error message, or None if the server closed it. Both callbacks are
+    called from the worker thread. Commands can be sent from any thread
+    with send() once the 'document' message has arrived.
+    """
+
+    def __init__(self, host: str, port: int,
+                 on_message: Callable[[dict], None],
+                 on_closed: Callable[[Optional[str]], None]):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.on_message = on_message
+        self.on_closed = on_closed
+        self._socket: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def send(self, command: str, **arguments):
+        """
+        Send a command, e.g. send('seek', index=120).
+
+        Failures are left to the reading thread, which sees the
+        connection drop and reports it through on_closed.
+        """
+        if self._socket is None or self._cancelled.is_set():
+            return
+        line = json.dumps(dict(arguments, command=command)).encode('utf-8') + b'\n'
+        with self._send_lock:
+            try:
+                self._socket.sendall(line)
+            except OSError as e:
+                print(f"Error sending to server: {e}")
+
+    def close(self):
+        """Disconnect; neither callback will be called again."""
+        self._cancelled.set()
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def run(self):
+        try:
+            connection = socket.create_connection((self.host, self.port),
+                                                  timeout=CONNECT_TIMEOUT)
+            connection.settimeout(None)
+            # Word messages are small and due now, so never wait to fill a packet
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._socket = connection
+            if self._cancelled.is_set():
+                connection.close()
+                return
+            with connection, connection.makefile('rb') as stream:
+                for line in stream:
+                    if self._cancelled.is_set():
+                        return
+                    self.on_message(json.loads(line))
+        except (OSError, ValueError) as e:
+            if not self._cancelled.is_set():
+                self.on_closed(str(e))
+            return
+        if not self._cancelled.is_set():
+            self.on_closed(None)
@@ -0,0 +1,254 @@
+# utils/rsvp_server.py
+
+import asyncio
+import json
+import os
+import time
+from array import array
+from typing import List, NamedTuple, Optional, Set
+from constants import (DEFAULT_WPM, SERVER_HOST, SERVER_PORT, SERVER_SEND_LIMIT,
+                       SESSION_TIMING_BUFFER_SIZE, COMPILED_CACHE_DIR)
+from utils.boundary_index import BoundaryIndex
+from utils.clocks import AsyncioClock
+from utils.compiled_document import open_document
+from utils.file_handler import Word
+from utils.playback_engine import PlaybackEngine
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+from utils.timing_recorder import TimingRecorder
+
+PROTOCOL_VERSION = 1
+
+
+class ServedDocument(NamedTuple):
+    """
+    A document parsed, timed and focused once and shared by every session.
+
+    message is the encoded 'document' message sent to each client as it
+    connects: every word's text and focus position and the WPM-independent
+    timeline, so clients never parse or time anything.
+    """
+    name: str
+    words: List[Word]
+    boundaries: BoundaryIndex
+    timeline: Timeline
+    focus_positions: array
+    message: bytes
+
+
+def encode(message: dict) -> bytes:
+    """One protocol message: compact JSON on a single line."""
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def prepare_document(path: str, text_processor: TextProcessor,
+                     cache_dir: Optional[str] = COMPILED_CACHE_DIR) -> ServedDocument:
+    """
+    Load a document (from its compiled file if it has one) for serving.
+
+    Raises:
+        OSError, ValueError, RuntimeError: If the document cannot be read
+            or parsed
+    """
+    words, boundaries, timeline, focus_positions = open_document(
+        path, text_processor, cache_dir)
+    if focus_positions is None:
+        focus_positions = array('I', [
+            text_processor.calculate_focus_character(word.text) for word in words])
+    name = os.path.basename(path)
+    message = encode({
+        'type': 'document',
+        'version': PROTOCOL_VERSION,
+        'name': name,
+        'words': [word.text for word in words],
+        'focus_positions': focus_positions.tolist(),
+        'units': timeline.units.tolist(),
+    })
+    return ServedDocument(name, words, boundaries, timeline, focus_positions, message)
+
+
+class ClientSession:
+    """
+    One connected client: a PlaybackEngine of its own, on the server's
+    event loop, over the shared document.
+
+    Every client keeps its own position, speed and play state. Each word
+    the engine shows is sent as a 'word' message stamped with the wall
+    time it is due, so clients can measure their delivery latency. A
+    client that stops reading is dropped once SERVER_SEND_LIMIT bytes are
+    queued for it, rather than buffering without bound.
+    """
+
+    def __init__(self, document: ServedDocument, writer: asyncio.StreamWriter,
+                 text_processor: TextProcessor, wpm: int = DEFAULT_WPM):
+        self.document = document
+        self.writer = writer
+        self.closed = False
+        self.engine = PlaybackEngine(
+            AsyncioClock(asyncio.get_running_loop()), text_processor, wpm,
+            on_word=self._on_word, on_finished=self.send_state
+        )
+        # Hundreds of sessions: keep a short timing history, not the app's
+        self.engine.recorder = TimingRecorder(SESSION_TIMING_BUFFER_SIZE)
+        self.engine.load(document.words, document.timeline, document.boundaries)
+        self._commands = {
+            'play': self._play,
+            'pause': self.engine.pause,
+            'seek': self._seek,
+            'wpm': self._set_wpm,
+            'previous_sentence': self.engine.previous_sentence,
+            'next_sentence': self.engine.next_sentence,
+            'previous_paragraph': self.engine.previous_paragraph,
+            'next_paragraph': self.engine.next_paragraph,
+        }
+
+    def handle(self, line: bytes):
+        """Run one command line from the client and report the new state."""
+        try:
+            message = json.loads(line)
+            command = self._commands[message.pop('command')]
+            command(**message)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.send({'type': 'error', 'message': f'Bad command {line[:80]!r}: {e}'})
+            return
+        self.send_state()
+
+    def send(self, message: dict):
+        """Queue a message for the client, dropping the client if it has fallen behind."""
+        if self.closed:
+            return
+        if self.writer.transport.get_write_buffer_size() > SERVER_SEND_LIMIT:
+            print(f"Dropping client {self.peer}: too slow")
+            self.close()
+            return
+        self.writer.write(encode(message))
+
+    def send_state(self):
+        """Tell the client its play state, position and speed."""
+        self.send({'type': 'state', 'playing': self.engine.is_playing,
+                   'index': self.engine.index, 'wpm': self.engine.wpm})
+
+    def close(self):
+        """Stop playback and close the connection."""
+        if self.closed:
+            return
+        self.closed = True
+        self.engine.pause()
+        self.writer.close()
+
+    @property
+    def peer(self):
+        return self.writer.get_extra_info('peername')
+
+    def _play(self, wpm: Optional[int] = None):
+        if wpm is not None:
+            self._set_wpm(wpm)
+        self.engine.play()
+
+    def _seek(self, index: int):
+        self.engine.seek(int(index))
+
+    def _set_wpm(self, wpm: int):
+        wpm = int(wpm)
+        if wpm <= 0:
+            raise ValueError(f'WPM must be positive, got {wpm}')
+        self.engine.set_wpm(wpm)
+
+    def _on_word(self, index: int):
+        # The intended start in loop time, converted to wall time for the client
+        intended = self.engine.scheduler.current_start
+        now = time.time()
+        due = now if intended is None else now + intended - self.engine.clock.now()
+        self.send({
+            'type': 'word',
+            'index': index,
+            'text': self.document.words[index].text,
+            'focus': self.document.focus_positions[index],
+            'duration': self.engine.current_duration(),
+            'due': due,
+        })
+
+
+class RSVPServer:
+    """
+    Serves one document to any number of clients over TCP.
+
+    The document is parsed and prepared once. Each client then gets a
+    ClientSession: on connecting it receives the prepared document, after
+    which it sends commands and receives the words to show. Messages are
+    single lines of JSON in both directions:
+
+        server: {"type": "document", "name", "words", "focus_positions", "units"}
+                {"type": "word", "index", "text", "focus", "duration", "due"}
+                {"type": "state", "playing", "index", "wpm"}
+                {"type": "error", "message"}
+        client: {"command": "play", "wpm": 300}   (wpm optional)
+                {"command": "pause"}
+                {"command": "seek", "index": 1200}
+                {"command": "wpm", "wpm": 450}
+                {"command": "next_sentence"}      (and previous_sentence,
+                                                   next_/previous_paragraph)
+
+    Every session is driven by the one asyncio event loop, so hundreds of
+    clients cost one thread and no per-client parsing.
+
+    Args:
+        document_path: .txt or .timecode document to serve
+        host: Interface to listen on
+        port: TCP port, or 0 for any free port
+        wpm: Starting speed of new sessions
+    """
+
+    def __init__(self, document_path: str, host: str = SERVER_HOST,
+                 port: int = SERVER_PORT, wpm: int = DEFAULT_WPM):
+        self.document_path = document_path
+        self.host = host
+        self.port = port
+        self.wpm = wpm
+        self.text_processor = TextProcessor()
+        self.document: Optional[ServedDocument] = None
+        self.sessions: Set[ClientSession] = set()
+        self._server = None
+
+    async def start(self):
+        """
+        Prepare the document and start listening.
+
+        Returns:
+            (host, port) actually listened on
+        """
+        self.document = prepare_document(self.document_path, self.text_processor)
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """Serve until cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        """Stop listening and disconnect every client."""
+        if self._server:
+            self._server.close()
+        for session in list(self.sessions):
+            session.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        session = ClientSession(self.document, writer, self.text_processor, self.wpm)
+        self.sessions.add(session)
+        try:
+            writer.write(self.document.message)
+            await writer.drain()
+            session.send_state()
+            while not session.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                session.handle(line)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            session.close()
+            self.sessions.discard(session)
@@ -0,0 +1,195 @@
+# utils/schedule_export.py
+
+import csv
+import io
+import json
+import struct
+import sys
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Sequence
+from constants import EXPORT_BUFFER_SIZE
+from utils.file_handler import Word
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+FORMATS = ('jsonl', 'csv', 'binary')
+# Binary schedules: a header, then one fixed-width record per word, then
+# the UTF-8 text of every word back to back. All fields little-endian.
+MAGIC = b'RSVPT'
+FORMAT_VERSION = 1
+# magic, format version, record size, word count, WPM
+HEADER = struct.Struct('<5sBHQd')
+# text offset (from the start of the text section), text length in bytes,
+# focus character index, start and duration in seconds
+RECORD = struct.Struct('<QIIdd')
+
+
+class ScheduledWord(NamedTuple):
+    """One word of a reading schedule at a fixed WPM."""
+    index: int
+    text: str
+    focus: int
+    start: float
+    duration: float
+
+
+def iter_schedule(words: Sequence[Word], timeline: Timeline, wpm: float,
+                  focus_positions: Optional[Sequence[int]] = None,
+                  text_processor: Optional[TextProcessor] = None
+                  ) -> Iterator[ScheduledWord]:
+    """
+    Walk a prepared document's schedule one word at a time.
+
+    Times come from the Timeline exactly as PlaybackEngine shows them.
+    Focus positions are computed as they are reached when the document
+    was parsed rather than loaded compiled.
+
+    Args:
+        words: Document words
+        timeline: The document's Timeline
+        wpm: Reading speed
+        focus_positions: Precomputed focus positions, if any
+        text_processor: TextProcessor to find missing focus positions with
+    """
+    focus_cache = {}
+    if focus_positions is None:
+        text_processor = text_processor or TextProcessor()
+    for index, word in enumerate(words):
+        if focus_positions is not None:
+            focus = focus_positions[index]
+        else:
+            focus = focus_cache.get(word.text)
+            if focus is None:
+                focus = focus_cache[word.text] = \
+                    text_processor.calculate_focus_character(word.text)
+        yield ScheduledWord(index, word.text, focus,
+                            timeline.start_time(index, wpm),
+                            timeline.duration(index, wpm))
+
+
+def write_jsonl(schedule: Iterator[ScheduledWord], file: BinaryIO) -> int:
+    """Write one JSON object per word. Returns the number of words written."""
+    text = io.TextIOWrapper(file, encoding='utf-8', newline='\n')
+    quote = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    try:
+        # Formatted directly: building a dict per word doubles the time.
+        # Floats use repr(), as json does
+        for index, word, focus, start, duration in schedule:
+            text.write(f'{{"index":{index},"text":{quote(word)},"focus":{focus},'
+                       f'"start":{start!r},"duration":{duration!r}}}\n')
+            count += 1
+    finally:
+        text.flush()
+        text.detach()
+    return count
+
+
+def write_csv(schedule: Iterator[ScheduledWord], file: BinaryIO) -> int:
+    """Write a header row, then one row per word. Returns the number of words written."""
+    text = io.TextIOWrapper(file, encoding='utf-8', newline='')
+    count = 0
+    try:
+        writer = csv.writer(text)
+        writer.writerow(ScheduledWord._fields)
+        for entry in schedule:
+            writer.writerow(entry)
+            count += 1
+    finally:
+        text.flush()
+        text.detach()
+    return count
+
+
+def write_binary(words: Sequence[Word], schedule: Iterator[ScheduledWord],
+                 file: BinaryIO, wpm: float) -> int:
+    """
+    Write the fixed-width binary layout (see HEADER and RECORD).
+
+    Records come first so a player can seek to word i at
+    HEADER.size + i * RECORD.size; the text follows them, so it is
+    encoded once for the records' offsets and again when it is written.
+
+    Returns:
+        Number of words written
+    """
+    file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, len(words), wpm))
+    offset = 0
+    for entry in schedule:
+        length = len(entry.text.encode('utf-8'))
+        file.write(RECORD.pack(offset, length, entry.focus, entry.start,
+                               entry.duration))
+        offset += length
+    for word in words:
+        file.write(word.text.encode('utf-8'))
+    return len(words)
+
+
+def export_schedule(words: Sequence[Word], timeline: Timeline, wpm: float,
+                    file: BinaryIO, format: str = 'jsonl',
+                    focus_positions: Optional[Sequence[int]] = None,
+                    text_processor: Optional[TextProcessor] = None) -> int:
+    """
+    Stream a document's reading schedule to a file.
+
+    Entries are generated and written one at a time, so memory use does
+    not grow with the document beyond the prepared document itself.
+
+    Args:
+        words: Document words
+        timeline: The document's Timeline
+        wpm: Reading speed
+        file: Binary file to write to, ideally opened with open_output
+        format: 'jsonl', 'csv' or 'binary'
+        focus_positions: Precomputed focus positions, if any
+        text_processor: TextProcessor to find missing focus positions with
+
+    Returns:
+        Number of words written
+
+    Raises:
+        ValueError: If the format is unknown or the WPM is not positive
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown schedule format: {format}")
+    if wpm <= 0:
+        raise ValueError(f"WPM must be positive: {wpm}")
+    schedule = iter_schedule(words, timeline, wpm, focus_positions, text_processor)
+    if format == 'jsonl':
+        return write_jsonl(schedule, file)
+    if format == 'csv':
+        return write_csv(schedule, file)
+    return write_binary(words, schedule, file, wpm)
+
+
+def open_output(path: str) -> BinaryIO:
+    """
+    Open an export destination with an EXPORT_BUFFER_SIZE byte buffer,
+    so small records reach the disk in large writes. '-' is stdout.
+    """
+    if path == '-':
+        return open(sys.stdout.fileno(), 'wb', buffering=EXPORT_BUFFER_SIZE,
+                    closefd=False)
+    return open(path, 'wb', buffering=EXPORT_BUFFER_SIZE)
+
+
+def read_binary(file: BinaryIO) -> Iterator[ScheduledWord]:
+    """
+    Read back a binary schedule, one word at a time.
+
+    Raises:
+        ValueError: If the file is not a binary schedule of this format
+    """
+    try:
+        magic, version, record_size, count, _ = HEADER.unpack(file.read(HEADER.size))
+    except struct.error:
+        raise ValueError("Not a binary schedule")
+    if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+        raise ValueError("Not a binary schedule")
+    text_start = HEADER.size + count * RECORD.size
+    for index in range(count):
+        file.seek(HEADER.size + index * RECORD.size)
+        offset, length, focus, start, duration = RECORD.unpack(file.read(RECORD.size))
+        file.seek(text_start + offset)
+        yield ScheduledWord(index, file.read(length).decode('utf-8'), focus,
+                            start, duration)
+
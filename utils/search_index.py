@@ -0,0 +1,136 @@
+# utils/search_index.py
+
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Leading/trailing characters ignored when matching words
+STRIP_CHARS = '.,;:!?"\'()[]{}<>“”‘’-–—…*_'
+
+
+def normalize(token: str) -> str:
+    """Reduce a word to the form it is indexed and searched under."""
+    return token.strip(STRIP_CHARS).casefold()
+
+
+def _contains(positions: array, value: int) -> bool:
+    """Binary search membership test on a sorted position array."""
+    i = bisect_left(positions, value)
+    return i < len(positions) and positions[i] == value
+
+
+class SearchIndex:
+    """
+    Inverted index from normalized word to the sorted positions where it
+    occurs.
+
+    Words that normalize to nothing (e.g. a lone dash) are not indexed
+    and take no position, so positions count indexed words only and
+    word_indices maps them back to the document. A phrase copied from
+    the text therefore matches across the punctuation inside it.
+
+    Single-word queries are a dictionary lookup. Phrase queries start from
+    the rarest word's positions and intersect them with the other words'
+    (shifted) position arrays, so the text itself is never scanned.
+    """
+
+    def __init__(self, positions: Dict[str, array], word_indices: array):
+        self.positions = positions
+        self.word_indices = word_indices
+
+    @classmethod
+    def build(cls, texts: Sequence[str],
+              cancelled: Optional[threading.Event] = None) -> Optional['SearchIndex']:
+        """
+        Index a document.
+
+        Args:
+            texts: The document's words in order
+            cancelled: Optional event that aborts the build when set
+
+        Returns:
+            The SearchIndex, or None if the build was cancelled
+        """
+        positions: Dict[str, array] = {}
+        word_indices = array('I')
+        for index, text in enumerate(texts):
+            if cancelled is not None and not index % 65536 and cancelled.is_set():
+                return None
+            key = normalize(text)
+            if not key:
+                continue
+            entry = positions.get(key)
+            if entry is None:
+                entry = positions[key] = array('I')
+            entry.append(len(word_indices))
+            word_indices.append(index)
+        return cls(positions, word_indices)
+
+    def search(self, query: str) -> List[Tuple[int, int]]:
+        """
+        Find every occurrence of a word or phrase.
+
+        Query tokens that normalize to nothing are ignored, and a match
+        may span unindexed words of the document, so its length is
+        counted in document words.
+
+        Args:
+            query: One or more words
+
+        Returns:
+            (word index, word count) of each match, sorted by word index
+        """
+        keys = [normalize(token) for token in query.split()]
+        keys = [key for key in keys if key]
+        if not keys:
+            return []
+
+        lists = [self.positions.get(key) for key in keys]
+        if any(entry is None for entry in lists):
+            return []
+        if len(lists) == 1:
+            return [(self.word_indices[position], 1) for position in lists[0]]
+
+        # Start from the rarest word and narrow its candidates word by word
+        rarest = min(range(len(lists)), key=lambda i: len(lists[i]))
+        candidates = [position - rarest for position in lists[rarest]
+                      if position >= rarest]
+        others = sorted(((offset, entry) for offset, entry in enumerate(lists)
+                         if offset != rarest), key=lambda item: len(item[1]))
+        for offset, entry in others:
+            if not candidates:
+                break
+            if len(candidates) * 16 > len(entry):
+                # Many candidates: one hash set beats a binary search each
+                members = set(entry)
+                candidates = [c for c in candidates if c + offset in members]
+            else:
+                candidates = [c for c in candidates if _contains(entry, c + offset)]
+        last = len(keys) - 1
+        word_indices = self.word_indices
+        return [(word_indices[c], word_indices[c + last] - word_indices[c] + 1)
+                for c in candidates]
+
+
+class SearchIndexBuilder(threading.Thread):
+    """
+    Background thread that builds a SearchIndex and passes it to
+    on_complete (called from the worker thread).
+    """
+
+    def __init__(self, texts: Sequence[str],
+                 on_complete: Callable[[SearchIndex], None]):
+        super().__init__(daemon=True)
+        self.texts = texts
+        self.on_complete = on_complete
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the build; on_complete will not be called."""
+        self._cancelled.set()
+
+    def run(self):
+        index = SearchIndex.build(self.texts, self._cancelled)
+        if index is not None and not self._cancelled.is_set():
+            self.on_complete(index)
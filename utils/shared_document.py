@@ -0,0 +1,403 @@
+# utils/shared_document.py
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import weakref
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+from constants import COMPILED_CACHE_DIR
+from utils.boundary_index import BoundaryIndex
+from utils.compiled_document import CompiledDocument, open_document
+from utils.file_handler import Word
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+MAGIC = b'RSVPS'
+FORMAT_VERSION = 1
+SEGMENT_HEADER = struct.Struct('<5sBxxI')  # magic, format version, JSON header length
+# The reference count: a table of the PIDs attached to the segment, one
+# slot per attachment, so references of processes that died are pruned
+HOLDERS_OFFSET = 16
+MAX_HOLDERS = 256
+JSON_OFFSET = HOLDERS_OFFSET + 4 * MAX_HOLDERS
+ALIGNMENT = 8  # Every section starts on an 8-byte boundary
+
+# Array sections after the UTF-8 word buffer, in segment order: (name, typecode)
+SECTIONS = [
+    ('word_offsets', 'Q'),
+    ('start_times', 'd'),
+    ('end_times', 'd'),
+    ('sentence_starts', 'I'),
+    ('paragraph_starts', 'I'),
+    ('sentence_of', 'I'),
+    ('paragraph_of', 'I'),
+    ('focus_positions', 'I'),
+    ('units', 'd'),
+    ('starts', 'd'),
+]
+
+
+def segment_name(source: str) -> str:
+    """
+    Shared memory name for a document: the same for every process opening
+    the same file, and a new one once the file changes.
+    """
+    stat = os.stat(source)
+    key = f'{os.path.abspath(source)}\0{stat.st_size}\0{stat.st_mtime_ns}'
+    # Short enough for macOS's 31-character POSIX shared memory names
+    return 'rsvp_' + hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class SharedWords(Sequence):
+    """
+    The words of a shared document as a read-only sequence of Word, each
+    decoded from the shared UTF-8 buffer when it is accessed.
+    """
+
+    def __init__(self, text: memoryview, offsets: memoryview,
+                 start_times: memoryview, end_times: memoryview):
+        self._text = text
+        self._offsets = offsets
+        self._start_times = start_times
+        self._end_times = end_times
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('word index out of range')
+        text = str(self._text[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+        if not self._start_times:
+            return Word(text)
+        start, end = self._start_times[index], self._end_times[index]
+        return Word(text, None if start != start else start,
+                    None if end != end else end)
+
+
+@contextmanager
+def _segment_lock(name: str):
+    """
+    Exclusive lock on a segment's reference count, shared by every process.
+
+    Lock files are left in the temporary directory: removing one while
+    another process waits on it would let two processes hold "the" lock.
+    """
+    path = os.path.join(tempfile.gettempdir(), name + '.lock')
+    with open(path, 'a+b') as file:
+        if os.name == 'nt':
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def _untrack(segment: shared_memory.SharedMemory):
+    """
+    Leave a segment's lifetime to its reference count. Python's resource
+    tracker would otherwise unlink it as soon as any one process that
+    created or attached it exits.
+    """
+    if os.name != 'nt':
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, 'shared_memory')
+
+
+def _unlink(segment: shared_memory.SharedMemory):
+    """Unlink an untracked segment (unlink() also unregisters it)."""
+    if os.name != 'nt':
+        from multiprocessing import resource_tracker
+        resource_tracker.register(segment._name, 'shared_memory')
+    segment.unlink()
+
+
+def _is_alive(pid: int) -> bool:
+    """Whether a process exists. Only used on POSIX: on Windows os.kill terminates."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _update_holders(buffer: memoryview, add: bool = False,
+                    remove: Optional[int] = None) -> Tuple[int, Optional[int]]:
+    """
+    Adjust a segment's holder table, with the lock held.
+
+    Clears slot remove, prunes processes that have died (POSIX; Windows
+    frees a segment once no process has it open), and with add claims a
+    free slot for this process.
+
+    Returns:
+        (number of holders left, slot claimed or None)
+
+    Raises:
+        RuntimeError: If add is set and every slot is taken
+    """
+    holders = buffer[HOLDERS_OFFSET:JSON_OFFSET].cast('I')
+    try:
+        if remove is not None:
+            holders[remove] = 0
+        if os.name != 'nt':
+            for slot, pid in enumerate(holders):
+                if pid and not _is_alive(pid):
+                    holders[slot] = 0
+        claimed = None
+        if add:
+            for slot, pid in enumerate(holders):
+                if not pid:
+                    holders[slot] = os.getpid()
+                    claimed = slot
+                    break
+            else:
+                raise RuntimeError(f"More than {MAX_HOLDERS} users of one shared document")
+        return sum(1 for pid in holders if pid), claimed
+    finally:
+        holders.release()
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _detach(segment: shared_memory.SharedMemory, views: list, slot: int):
+    """Drop one reference, unlinking the segment if it was the last."""
+    with _segment_lock(segment.name):
+        remaining, _ = _update_holders(segment.buf, remove=slot)
+        for view in reversed(views):
+            view.release()
+        try:
+            segment.close()
+        except BufferError:
+            # Something still holds a view; the mapping goes when it does
+            print(f"Shared document {segment.name} closed while still in use")
+        if not remaining:
+            _unlink(segment)
+
+
+class SharedDocument:
+    """
+    A compiled document in shared memory, used by every process that opens it.
+
+    The first process to open a document parses it (or loads its compiled
+    file) and publishes it into one shared memory segment: a UTF-8 buffer
+    of every word with their offsets, the timecode timestamps, sentence
+    and paragraph boundaries, focus positions, and the timeline's duration
+    units and cumulative starts. Later processes attach to the same
+    segment by name and read it in place: the arrays are memoryviews of the
+    segment and words are decoded on access, so a book is held in memory
+    once however many readers or workers have it open.
+
+    The segment counts its references in a table of the attached
+    processes' PIDs, updated under a lock file. close() (or garbage
+    collection, or interpreter exit) drops this process's reference, and
+    the last one unlinks the segment; references of processes that died
+    without detaching are pruned on the way. Views handed out (words,
+    timeline, boundaries, focus_positions) must not be used after close().
+
+    Use open() to attach or publish as needed.
+    """
+
+    def __init__(self, segment: shared_memory.SharedMemory, slot: int):
+        self.name = segment.name
+        views = []
+        buffer = segment.buf
+
+        def view(offset, size, typecode='B'):
+            section = buffer[offset:offset + size]
+            views.append(section)
+            if typecode != 'B':
+                section = section.cast(typecode)
+                views.append(section)
+            return section
+
+        _, _, length = SEGMENT_HEADER.unpack_from(buffer)
+        header = json.loads(bytes(buffer[JSON_OFFSET:JSON_OFFSET + length]))
+        sections = {name: view(offset, size, typecode)
+                    for name, typecode, offset, size in header['sections']}
+        text = view(header['text_offset'], header['text_bytes'])
+
+        self.source = header['source']
+        self.words = SharedWords(text, sections['word_offsets'],
+                                 sections['start_times'], sections['end_times'])
+        self.boundaries = BoundaryIndex()
+        for name in ('sentence_starts', 'paragraph_starts', 'sentence_of', 'paragraph_of'):
+            setattr(self.boundaries, name, sections[name])
+        self.timeline = Timeline.from_starts(sections['units'], sections['starts'])
+        self.focus_positions = sections['focus_positions']
+        self._finalizer = weakref.finalize(self, _detach, segment, views, slot)
+
+    @classmethod
+    def open(cls, source: str, text_processor: Optional[TextProcessor] = None,
+             cache_dir: Optional[str] = COMPILED_CACHE_DIR) -> 'SharedDocument':
+        """
+        Attach to a document's segment, publishing it first if no process
+        has it open. Processes opening it at the same time wait for the
+        first one to publish rather than parsing it themselves.
+
+        Raises:
+            OSError, ValueError, RuntimeError: If the document cannot be read
+                or parsed
+        """
+        name = segment_name(source)
+        with _segment_lock(name):
+            shared = cls._attach(name)
+            if shared is None:
+                document = open_document(source, text_processor, cache_dir)
+                shared = cls._publish(name, source, document, text_processor)
+        return shared
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedDocument':
+        """
+        Attach to a segment another process has published.
+
+        Raises:
+            FileNotFoundError: If no segment of that name is open
+        """
+        with _segment_lock(name):
+            shared = cls._attach(name)
+        if shared is None:
+            raise FileNotFoundError(f"No shared document named {name}")
+        return shared
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self):
+        """Detach from the segment, unlinking it if this was the last user."""
+        self._finalizer()
+
+    def to_document(self) -> CompiledDocument:
+        """The shared words, boundaries, timeline and focus positions."""
+        return CompiledDocument(self.words, self.boundaries, self.timeline,
+                                self.focus_positions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @classmethod
+    def _attach(cls, name: str) -> Optional['SharedDocument']:
+        """Attach and take a reference, with the lock held; None if there is no usable segment."""
+        try:
+            segment = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return None
+        _untrack(segment)
+        magic, version, _ = SEGMENT_HEADER.unpack_from(segment.buf)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            # Left by a process that died while publishing, or another version
+            segment.close()
+            _unlink(segment)
+            return None
+        try:
+            _, slot = _update_holders(segment.buf, add=True)
+        except RuntimeError:
+            segment.close()
+            raise
+        return cls(segment, slot)
+
+    @classmethod
+    def _publish(cls, name: str, source: str, document: CompiledDocument,
+                 text_processor: Optional[TextProcessor]) -> 'SharedDocument':
+        """Create and fill a segment, with the lock held."""
+        words, boundaries, timeline, focus_positions = document
+        if focus_positions is None:
+            text_processor = text_processor or TextProcessor()
+            focus_positions = array('I', [
+                text_processor.calculate_focus_character(word.text) for word in words])
+
+        encoded = [word.text.encode('utf-8') for word in words]
+        word_offsets = array('Q', [0])
+        total = 0
+        for text in encoded:
+            total += len(text)
+            word_offsets.append(total)
+        timed = any(word.start_time is not None for word in words)
+        nan = float('nan')
+        arrays = {
+            'word_offsets': word_offsets,
+            'start_times': array('d', [nan if word.start_time is None else word.start_time
+                                       for word in words] if timed else []),
+            'end_times': array('d', [nan if word.end_time is None else word.end_time
+                                     for word in words] if timed else []),
+            'sentence_starts': boundaries.sentence_starts,
+            'paragraph_starts': boundaries.paragraph_starts,
+            'sentence_of': boundaries.sentence_of,
+            'paragraph_of': boundaries.paragraph_of,
+            'focus_positions': focus_positions,
+            'units': timeline.units,
+            'starts': timeline.starts,
+        }
+
+        def layout(data_start):
+            offset = data_start + total
+            sections = []
+            for name, typecode in SECTIONS:
+                offset = _aligned(offset)
+                size = len(arrays[name]) * array(typecode).itemsize
+                sections.append([name, typecode, offset, size])
+                offset += size
+            header = json.dumps({'source': os.path.abspath(source), 'words': len(words),
+                                 'text_offset': data_start, 'text_bytes': total,
+                                 'sections': sections}).encode('utf-8')
+            return header, sections, offset
+
+        # The header holds the offsets of the data after it, so its length
+        # depends on where that data starts; a couple of passes settle it
+        data_start = JSON_OFFSET
+        while True:
+            header, sections, size = layout(data_start)
+            needed = _aligned(JSON_OFFSET + len(header))
+            if needed <= data_start:
+                break
+            data_start = needed
+
+        segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _untrack(segment)
+        try:
+            buffer = segment.buf
+            position = data_start
+            for text in encoded:
+                buffer[position:position + len(text)] = text
+                position += len(text)
+            for name, typecode, offset, length in sections:
+                if length:
+                    buffer[offset:offset + length] = memoryview(arrays[name]).cast('B')
+            buffer[JSON_OFFSET:JSON_OFFSET + len(header)] = header
+            _, slot = _update_holders(buffer, add=True)
+            # Written last: the magic marks the segment as complete
+            SEGMENT_HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, len(header))
+            return cls(segment, slot)
+        except BaseException:
+            segment.close()
+            _unlink(segment)
+            raise
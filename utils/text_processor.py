@@ -1,15 +1,35 @@
 # utils/text_processor.py
 
-import syllapy
-import pyphen
 from typing import Tuple, Optional
 from constants import (BASE_DURATION_FACTOR, LENGTH_FACTOR, 
                         SYLLABLE_FACTOR, DEFAULT_FOCUS_OFFSET, BASE_WPM, FOCUS_COLOR)
 
+
+def escape_markup(text: str) -> str:
+    """
+    Escape Kivy label markup characters, as kivy.utils.escape_markup does,
+    without importing Kivy into the text pipeline.
+    """
+    return text.replace('&', '&amp;').replace('[', '&bl;').replace(']', '&br;')
+
 class TextProcessor:
     def __init__(self):
-        """Initialize text processor with hyphenation dictionary."""
-        self.dic = pyphen.Pyphen(lang='en')
+        """Initialize text processor; the hyphenation dictionary loads on first use."""
+        self._dic = None
+    
+    @property
+    def dic(self):
+        """
+        Hyphenation dictionary.
+        
+        Loading it takes longer than the rest of the app's imports, so it
+        is deferred until the first word is processed rather than paid at
+        startup.
+        """
+        if self._dic is None:
+            import pyphen
+            self._dic = pyphen.Pyphen(lang='en')
+        return self._dic
     
     def calculate_focus_character(self, word: str) -> int:
         """
@@ -71,14 +91,35 @@ class TextProcessor:
         Returns:
             Float duration in seconds
         """
+        return self.calculate_duration_units(word, timecode_duration) / base_wpm
+    
+    def calculate_duration_units(self, word: str,
+                                 timecode_duration: Optional[float] = None) -> float:
+        """
+        Calculate a word's display duration independent of WPM.
+        
+        Every duration is inversely proportional to WPM, so the duration
+        at a given speed is the returned value divided by the WPM. This
+        lets a whole document be timed once and re-timed for any WPM
+        without recomputing word complexity.
+        
+        Args:
+            word: The word to time
+            timecode_duration: Optional duration from timecode file
+        
+        Returns:
+            Float duration in seconds at 1 WPM
+        """
         if timecode_duration is not None:
-            # Scale timecoded duration based on WPM
-            return timecode_duration * (BASE_WPM / base_wpm)
+            # Timecoded durations are defined at BASE_WPM
+            return timecode_duration * BASE_WPM
         
-        # Calculate base duration from WPM
-        base_duration = 60.0 / base_wpm
+        # Base duration at 1 WPM
+        base_duration = 60.0
         
-        # Get word complexity factors
+        # Get word complexity factors (syllapy loads on first use, like
+        # the hyphenation dictionary)
+        import syllapy
         syllable_count = syllapy.count(word)
         length_factor = min(len(word) / 5.0, 2.0)  # Cap length impact
         syllable_factor = min(syllable_count / 2.0, 2.0)  # Cap syllable impact
@@ -116,9 +157,10 @@ class TextProcessor:
             # This part is handled by the widget's positioning
             pass
         
-        # Format with colored focus character
+        # Format with colored focus character; brackets and ampersands in
+        # the word itself (e.g. "[2].") must not be read as markup
         return (
-            f"{word[:focus_pos]}"
-            f"[color={FOCUS_COLOR}]{word[focus_pos]}"
-            f"[/color]{word[focus_pos + 1:]}"
+            f"{escape_markup(word[:focus_pos])}"
+            f"[color={FOCUS_COLOR}]{escape_markup(word[focus_pos])}"
+            f"[/color]{escape_markup(word[focus_pos + 1:])}"
         )
\ No newline at end of file
@@ -0,0 +1,113 @@
+# utils/timeline.py
+
+from array import array
+from bisect import bisect_right
+from typing import Dict, Optional, Sequence
+from constants import PARAGRAPH_PAUSE_FACTOR
+from utils.boundary_index import BoundaryIndex
+from utils.file_handler import Word
+from utils.text_processor import TextProcessor
+
+
+class Timeline:
+    """
+    Precomputed, WPM-independent timing for a whole document.
+
+    units[i] is word i's display duration at 1 WPM (see
+    TextProcessor.calculate_duration_units) and starts[i] is the sum of
+    all earlier units, with starts[n] the total. The time at any WPM is
+    the unit value divided by the WPM, so changing speed never requires
+    re-timing the document.
+    """
+
+    def __init__(self, units: array):
+        self.units = units
+        self.starts = array('d', [0.0])
+        total = 0.0
+        for unit in units:
+            total += unit
+            self.starts.append(total)
+
+    @classmethod
+    def build(cls, words: Sequence[Word],
+              text_processor: Optional[TextProcessor] = None,
+              boundaries: Optional[BoundaryIndex] = None) -> 'Timeline':
+        """
+        Time every word of a document.
+
+        Untimed words that end a paragraph are held for an extra
+        PARAGRAPH_PAUSE_FACTOR base word durations.
+
+        Args:
+            words: Document words
+            text_processor: TextProcessor to time words with
+            boundaries: Optional paragraph boundaries for paragraph pauses
+
+        Returns:
+            The document's Timeline
+        """
+        text_processor = text_processor or TextProcessor()
+        units = array('d')
+        # Syllable counting dominates, and untimed words repeat a lot
+        unit_cache: Dict[str, float] = {}
+        for word in words:
+            if word.duration is not None:
+                units.append(text_processor.calculate_duration_units(
+                    word.text, word.duration))
+                continue
+            unit = unit_cache.get(word.text)
+            if unit is None:
+                unit = unit_cache[word.text] = \
+                    text_processor.calculate_duration_units(word.text)
+            units.append(unit)
+
+        if boundaries is not None:
+            pause = 60.0 * PARAGRAPH_PAUSE_FACTOR
+            for start in boundaries.paragraph_starts[1:]:
+                if words[start - 1].duration is None:
+                    units[start - 1] += pause
+        return cls(units)
+
+    @classmethod
+    def from_starts(cls, units: Sequence[float], starts: Sequence[float]) -> 'Timeline':
+        """
+        A Timeline over existing units and cumulative starts, used as they
+        are (e.g. views of shared memory) rather than copied or summed again.
+        """
+        timeline = cls.__new__(cls)
+        timeline.units = units
+        timeline.starts = starts
+        return timeline
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def duration(self, index: int, wpm: float) -> float:
+        """Display duration of a word in seconds at the given WPM."""
+        return self.units[index] / wpm
+
+    def start_time(self, index: int, wpm: float) -> float:
+        """Time from the start of the document to a word at the given WPM."""
+        return self.starts[index] / wpm
+
+    def total_time(self, wpm: float) -> float:
+        """Reading time of the whole document at the given WPM."""
+        return self.starts[-1] / wpm
+
+    def index_at(self, seconds: float, wpm: float) -> int:
+        """
+        Find the word being shown a given time into the document.
+
+        Binary search over the cumulative start times, O(log n).
+
+        Args:
+            seconds: Time from the start of the document
+            wpm: Reading speed
+
+        Returns:
+            Index of the word on screen at that time (clamped to the document)
+        """
+        if not self.units:
+            return 0
+        index = bisect_right(self.starts, seconds * wpm) - 1
+        return max(0, min(index, len(self.units) - 1))
@@ -0,0 +1,175 @@
+# utils/timing_recorder.py
+
+import json
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from constants import TIMING_BUFFER_SIZE, TIMING_SESSION_LIMIT, DROPPED_WORD_THRESHOLD
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class TimingRecorder:
+    """
+    Records when each word was intended to appear and when it actually did.
+
+    All storage is preallocated as fixed size typed arrays used as a ring
+    buffer, so record() only writes numbers into existing slots: no
+    allocation and no I/O on the playback path. Statistics are computed
+    when a session ends, and written out with export_json(). Only the
+    latest session_limit summaries are kept, since every pause and seek
+    ends a session.
+
+    For each word the recorder keeps the word index, the intended start
+    (from the absolute playback timeline), the intended duration, the
+    actual texture-swap time and the actual on-screen duration, which is
+    known once the next word replaces it or the session ends.
+    """
+
+    def __init__(self, capacity: int = TIMING_BUFFER_SIZE,
+                 session_limit: int = TIMING_SESSION_LIMIT):
+        self.capacity = capacity
+        self.word_index = array('q', bytes(8 * capacity))
+        self.intended_start = array('d', bytes(8 * capacity))
+        self.intended_duration = array('d', bytes(8 * capacity))
+        self.actual_start = array('d', bytes(8 * capacity))
+        self.actual_duration = array('d', bytes(8 * capacity))
+        self.count = 0  # Words recorded in the current session
+        self.sessions: Deque[Dict] = deque(maxlen=session_limit)
+        self.sessions_ended = 0  # Including summaries no longer kept
+        self._active = False
+        self._interrupted = False
+
+    @property
+    def active(self) -> bool:
+        """Whether a session is being recorded."""
+        return self._active
+
+    def start_session(self):
+        """Start recording a new playback session."""
+        self.count = 0
+        self._active = True
+        self._interrupted = False
+
+    def record(self, index: int, intended_start: float,
+               intended_duration: float, actual_start: float):
+        """
+        Record that a word was swapped onto the screen.
+
+        Args:
+            index: Word index in the document
+            intended_start: When the timeline wanted the word to appear
+            intended_duration: How long the word should stay on screen
+            actual_start: When the word's texture was actually swapped in
+        """
+        if not self._active:
+            return
+        if self.count:
+            previous = (self.count - 1) % self.capacity
+            self.actual_duration[previous] = actual_start - self.actual_start[previous]
+        slot = self.count % self.capacity
+        self.word_index[slot] = index
+        self.intended_start[slot] = intended_start
+        self.intended_duration[slot] = intended_duration
+        self.actual_start[slot] = actual_start
+        self.actual_duration[slot] = 0.0
+        self.count += 1
+
+    def retime_last(self, intended_duration: float):
+        """
+        Replace the intended duration of the word on screen, e.g. after
+        a WPM change rescheduled its end.
+        """
+        if self._active and self.count:
+            self.intended_duration[(self.count - 1) % self.capacity] = intended_duration
+
+    def end_session(self, end_time: float) -> Optional[Dict]:
+        """
+        Close the current session and compute its statistics.
+
+        A last word that left the screen before its intended duration
+        (i.e. playback was paused mid-word) is left out of the duration
+        statistics.
+
+        Args:
+            end_time: When the last word left the screen
+
+        Returns:
+            The session summary, or None if no session was active
+        """
+        if not self._active:
+            return None
+        self._active = False
+        if self.count:
+            last = (self.count - 1) % self.capacity
+            self.actual_duration[last] = end_time - self.actual_start[last]
+            self._interrupted = (self.actual_duration[last]
+                                 < self.intended_duration[last])
+        summary = self.summarize()
+        self.sessions.append(summary)
+        self.sessions_ended += 1
+        return summary
+
+    def summarize(self) -> Dict:
+        """
+        Compute statistics over the words held in the buffer.
+
+        Onset jitter is how late each word appeared relative to its
+        intended start; duration error is actual minus intended on-screen
+        time. Cumulative drift is the total of the duration errors. A word
+        counts as dropped if it was on screen for less than
+        DROPPED_WORD_THRESHOLD seconds (i.e. probably never drawn).
+
+        Returns:
+            Dictionary of session statistics (times in milliseconds)
+        """
+        stored = min(self.count, self.capacity)
+        first = self.count - stored
+        slots = [i % self.capacity for i in range(first, self.count)]
+
+        onset = sorted(self.actual_start[s] - self.intended_start[s] for s in slots)
+        shown = slots[:-1] if self._interrupted else slots
+        errors = [self.actual_duration[s] - self.intended_duration[s] for s in shown]
+        abs_errors = sorted(abs(e) for e in errors)
+        dropped = sum(1 for s in shown
+                      if self.actual_duration[s] < DROPPED_WORD_THRESHOLD)
+
+        to_ms = lambda seconds: round(seconds * 1000.0, 3)
+        return {
+            'words_recorded': self.count,
+            'words_analyzed': stored,
+            'first_word_index': self.word_index[slots[0]] if slots else None,
+            'last_word_index': self.word_index[slots[-1]] if slots else None,
+            'onset_jitter_ms': {
+                'p50': to_ms(_percentile(onset, 0.50)),
+                'p95': to_ms(_percentile(onset, 0.95)),
+                'p99': to_ms(_percentile(onset, 0.99)),
+                'max': to_ms(onset[-1]) if onset else 0.0,
+            },
+            'duration_jitter_ms': {
+                'p50': to_ms(_percentile(abs_errors, 0.50)),
+                'p95': to_ms(_percentile(abs_errors, 0.95)),
+                'p99': to_ms(_percentile(abs_errors, 0.99)),
+                'max': to_ms(abs_errors[-1]) if abs_errors else 0.0,
+            },
+            'cumulative_drift_ms': to_ms(sum(errors)),
+            'intended_time_ms': to_ms(sum(self.intended_duration[s] for s in shown)),
+            'actual_time_ms': to_ms(sum(self.actual_duration[s] for s in shown)),
+            'dropped_words': dropped,
+        }
+
+    def export_json(self, filepath: str) -> None:
+        """
+        Write the summaries of the latest finished sessions to a JSON file.
+
+        Args:
+            filepath: Path of the report to write
+        """
+        with open(filepath, 'w', encoding='utf-8') as file:
+            json.dump({'sessions_ended': self.sessions_ended,
+                       'sessions': list(self.sessions)}, file, indent=2)
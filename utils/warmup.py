@@ -0,0 +1,80 @@
+# utils/warmup.py
+
+import threading
+from array import array
+from typing import Callable, List, NamedTuple, Optional
+from constants import COMPILED_CACHE_DIR
+from utils.boundary_index import BoundaryIndex
+from utils.compiled_document import open_document
+from utils.file_handler import Word
+from utils.text_processor import TextProcessor
+from utils.timeline import Timeline
+
+# Printable ASCII, whose glyphs are loaded ahead of the first document
+BASIC_LATIN = ''.join(chr(code) for code in range(0x20, 0x7f))
+
+
+class ParsedDocument(NamedTuple):
+    """A document parsed and timed off the main thread."""
+    path: str
+    words: List[Word]
+    boundaries: BoundaryIndex
+    timeline: Timeline
+    focus_positions: Optional[array]  # Only if it was precompiled
+
+
+class WarmupWorker(threading.Thread):
+    """
+    Background half of the launch warm-up.
+
+    Creates TextMetrics for the current font and size and runs the basic
+    Latin set through it, so FreeType and HarfBuzz are loaded and every
+    common glyph has been read once. Loads the hyphenation dictionary and
+    syllable counter, and parses and times the most recently opened
+    document if one is given.
+
+    TextProcessor is not thread-safe, so the worker uses its own. pyphen
+    caches parsed dictionaries per process, so the main thread's
+    TextProcessor still finds the dictionary loaded.
+
+    on_complete(metrics, document) is called from the worker thread, with
+    document None if there was none or it could not be read. The
+    rendering half (textures) has to happen on the main thread; see
+    RSVPReader.warm_up.
+    """
+
+    def __init__(self, font_path: str, font_size: int,
+                 on_complete: Callable[[object, Optional[ParsedDocument]], None],
+                 document_path: Optional[str] = None):
+        super().__init__(daemon=True)
+        self.font_path = font_path
+        self.font_size = font_size
+        self.on_complete = on_complete
+        self.document_path = document_path
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the warm-up; on_complete will not be called."""
+        self._cancelled.set()
+
+    def run(self):
+        from kivy_text_metrics import TextMetrics
+        metrics = TextMetrics(self.font_path, self.font_size)
+        # Loads every glyph through FreeType and shapes them with HarfBuzz
+        metrics.get_text_extents(BASIC_LATIN, (1, 1))
+
+        # First use loads the hyphenation dictionary and syllapy
+        text_processor = TextProcessor()
+        text_processor.calculate_focus_character('warming')
+        text_processor.calculate_duration_units('warming')
+
+        document = None
+        if self.document_path and not self._cancelled.is_set():
+            try:
+                document = ParsedDocument(self.document_path, *open_document(
+                    self.document_path, text_processor, COMPILED_CACHE_DIR))
+            except (OSError, ValueError, RuntimeError) as e:
+                print(f"Error preloading last document: {e}")
+
+        if not self._cancelled.is_set():
+            self.on_complete(metrics, document)
@@ -0,0 +1,221 @@
+# utils/width_predictor.py
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from constants import CALIBRATION_SAMPLE_SIZE
+
+# (harfbuzz advance width, glyph count, texture width)
+Sample = Tuple[float, int, float]
+
+# Always part of the sample so short documents still cover the alphabet
+CALIBRATION_WORDS = [
+    'The', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog.',
+    'WAVY', 'illiterate', 'Mmm,', 'fi', 'ffl', 'AVAST!', '"quoted"', '1984'
+]
+
+
+class WidthPredictor:
+    """
+    Predicts the width of the texture Kivy/SDL2 renders for a word from
+    HarfBuzz measurements alone.
+
+    HarfBuzz advances do not sum to the SDL2 texture width (SDL2 rounds
+    each glyph advance to whole pixels and renders at the dp-scaled size),
+    so the width is modelled per (font, size) as:
+
+        texture_width = a * advance_width + b * glyph_count + c
+
+    The coefficients are fitted by least squares from a sample of real
+    renders, see calibrate_predictor().
+    """
+
+    def __init__(self, coefficients: Tuple[float, float, float] = (1.0, 0.0, 0.0)):
+        self.coefficients = coefficients
+
+    def predict(self, advance_width: float, glyph_count: int) -> float:
+        """
+        Predict the rendered texture width.
+
+        Args:
+            advance_width: Sum of the unscaled HarfBuzz advances
+            glyph_count: Number of shaped glyphs
+
+        Returns:
+            Predicted texture width in pixels
+        """
+        a, b, c = self.coefficients
+        return a * advance_width + b * glyph_count + c
+
+    @classmethod
+    def fit(cls, samples: Sequence[Sample]) -> 'WidthPredictor':
+        """
+        Fit a predictor to measured samples.
+
+        Args:
+            samples: (advance_width, glyph_count, texture_width) tuples
+
+        Returns:
+            Fitted WidthPredictor
+
+        Raises:
+            ValueError: If no samples are given
+        """
+        if not samples:
+            raise ValueError("At least one sample is required to fit a predictor")
+
+        # Normal equations for the three coefficient linear model
+        rows = [(adv, float(count), 1.0) for adv, count, _ in samples]
+        ata = [[sum(r[i] * r[j] for r in rows) for j in range(3)] for i in range(3)]
+        atb = [sum(r[i] * s[2] for r, s in zip(rows, samples)) for i in range(3)]
+
+        coefficients = _solve_3x3(ata, atb)
+        if coefficients is None:
+            # Degenerate sample (e.g. a single word), fall back to pure scaling
+            total_advance = sum(s[0] for s in samples)
+            total_width = sum(s[2] for s in samples)
+            scale = total_width / total_advance if total_advance else 1.0
+            coefficients = (scale, 0.0, 0.0)
+        return cls(tuple(coefficients))
+
+    def evaluate(self, samples: Iterable[Sample]) -> Tuple[float, float]:
+        """
+        Measure prediction accuracy against measured samples.
+
+        Args:
+            samples: (advance_width, glyph_count, texture_width) tuples
+
+        Returns:
+            Tuple of (mean absolute error, max absolute error) in pixels
+        """
+        errors = [abs(self.predict(adv, count) - width)
+                  for adv, count, width in samples]
+        if not errors:
+            return 0.0, 0.0
+        return sum(errors) / len(errors), max(errors)
+
+
+def _solve_3x3(a: List[List[float]], b: List[float]) -> Optional[List[float]]:
+    """Solve a 3x3 linear system by Gaussian elimination, None if singular."""
+    m = [row[:] + [rhs] for row, rhs in zip(a, b)]
+    for col in range(3):
+        pivot = max(range(col, 3), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-9:
+            return None
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(3):
+            if r != col:
+                factor = m[r][col] / m[col][col]
+                m[r] = [x - factor * y for x, y in zip(m[r], m[col])]
+    return [m[i][3] / m[i][i] for i in range(3)]
+
+
+def measure_texture_width(markup_text: str, font_name: str, font_size: float) -> int:
+    """
+    Measure the width of the texture Kivy renders for marked up text.
+
+    Uses the same sizing pass that Label.texture_update() runs before
+    creating its texture, so no window or GL context is needed.
+    Must be called from the main thread (SDL2 text rendering is not
+    thread safe).
+    """
+    from kivy.core.text.markup import MarkupLabel
+    label = MarkupLabel(text=markup_text, font_name=font_name, font_size=font_size)
+    label.resolve_font_name()
+    return label.render()[0]
+
+
+def select_sample_words(texts: Sequence[str],
+                        sample_size: int = CALIBRATION_SAMPLE_SIZE) -> List[str]:
+    """Pick distinct words spread evenly through a document for calibration."""
+    unique = list(dict.fromkeys(texts))
+    if len(unique) <= sample_size:
+        return unique
+    step = len(unique) / sample_size
+    return [unique[int(i * step)] for i in range(sample_size)]
+
+
+def collect_samples(words: Iterable[str], metrics, text_processor,
+                    font_name: str, font_size: float) -> List[Sample]:
+    """
+    Render sample words and pair their HarfBuzz measurements with the
+    actual Kivy texture widths.
+
+    Args:
+        words: Words to render
+        metrics: TextMetrics for the font being calibrated
+        text_processor: TextProcessor used to format the focus markup
+        font_name: Kivy font name used by the word display
+        font_size: Kivy font size (in pixels) used by the word display
+
+    Returns:
+        List of (advance_width, glyph_count, texture_width) samples
+    """
+    samples = []
+    for word in words:
+        if not word:
+            continue
+        advances = metrics.get_glyph_advances(word)
+        focus_pos = text_processor.calculate_focus_character(word)
+        markup = text_processor.format_word_with_focus(word, focus_pos)
+        width = measure_texture_width(markup, font_name, font_size)
+        samples.append((sum(advances), len(advances), float(width)))
+    return samples
+
+
+_predictors: Dict[Tuple[str, int, float], WidthPredictor] = {}
+
+
+def calibrate_predictor(words: Sequence[str], metrics, text_processor,
+                        font_name: str, font_size: float) -> WidthPredictor:
+    """
+    Get the predictor for a (font, size), fitting it on first use.
+
+    Predictors are cached for the lifetime of the process, so switching
+    back to a previous font or size does not re-render any samples.
+
+    Args:
+        words: Document words to draw the calibration sample from
+        metrics: TextMetrics for the font being calibrated
+        text_processor: TextProcessor used to format the focus markup
+        font_name: Kivy font name used by the word display
+        font_size: Kivy font size (in pixels) used by the word display
+
+    Returns:
+        Fitted WidthPredictor
+    """
+    key = (font_name, metrics.font_size, font_size)
+    predictor = _predictors.get(key)
+    if predictor is None:
+        sample = select_sample_words(list(words) + CALIBRATION_WORDS)
+        predictor = WidthPredictor.fit(
+            collect_samples(sample, metrics, text_processor, font_name, font_size))
+        _predictors[key] = predictor
+    return predictor
+
+
+
+if __name__ == "__main__":
+    # Accuracy check: calibrate on half of each test file and measure
+    # the prediction error on the other half against actual Kivy renders.
+    import os
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from kivy.metrics import dp
+    from kivy_text_metrics import TextMetrics
+    from utils.file_handler import FileHandler
+    from utils.text_processor import TextProcessor
+
+    text_processor = TextProcessor()
+    for font_path in ['fonts/OpenDyslexic-Regular.otf', 'fonts/APHont-Regular.ttf']:
+        for size in [16, 24, 36]:
+            metrics = TextMetrics(font_path, size)
+            words = [w.text for w in
+                     FileHandler.load_file('test_files/The_Ultimate_Display.txt')]
+            unique = list(dict.fromkeys(words))
+            train = collect_samples(unique[::2][:CALIBRATION_SAMPLE_SIZE], metrics,
+                                    text_processor, font_path, dp(size))
+            held_out = collect_samples(unique[1::2], metrics,
+                                       text_processor, font_path, dp(size))
+            predictor = WidthPredictor.fit(train)
+            mean_err, max_err = predictor.evaluate(held_out)
+            print(f"{os.path.basename(font_path)} {size}: "
+                  f"mean error {mean_err:.2f}px, max error {max_err:.2f}px "
+                  f"over {len(held_out)} words")
@@ -0,0 +1,162 @@
+# widgets/file_browser.py
+
+import os
+from kivy.uix.popup import Popup
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.clock import mainthread
+from kivy.properties import ObjectProperty
+
+from utils.directory_lister import DirectoryCache, DirectoryLister
+from constants import PADDING, SPACING, BUTTON_HEIGHT, SUPPORTED_EXTENSIONS
+
+class FileBrowserPopup(Popup):
+    """
+    File selection dialog that lists directories in the background.
+
+    A DirectoryLister reads the directory in a worker thread and its
+    entries are appended to the list as they arrive, so the dialog opens
+    at once even on slow or network-mounted directories. The list is a
+    RecycleView, so only the visible rows exist as widgets. Listings are
+    kept in a DirectoryCache and reused until the directory changes.
+    """
+
+    reader = ObjectProperty(None)
+
+    def __init__(self, reader, path='.', cache=None,
+                 extensions=SUPPORTED_EXTENSIONS, **kwargs):
+        super().__init__(**kwargs)
+        self.reader = reader
+        self.cache = cache if cache is not None else DirectoryCache()
+        self.extensions = extensions
+        self.path = None
+        self._parent_rows = []
+        self._lister = None
+        self.title = 'Select File'
+        self.size_hint = (0.9, 0.9)
+        self.content = self._create_layout()
+        self.bind(on_dismiss=self._on_dismiss)
+        self.browse(path)
+
+    def _create_layout(self) -> BoxLayout:
+        """Create and return the browser layout."""
+        layout = BoxLayout(
+            orientation='vertical',
+            padding=PADDING,
+            spacing=SPACING
+        )
+
+        # Current directory and listing status
+        self.status_label = Label(
+            text='',
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            shorten=True,
+            shorten_from='left'
+        )
+        self.status_label.bind(
+            width=lambda label, width: setattr(label, 'text_size', (width, None))
+        )
+        layout.add_widget(self.status_label)
+
+        # Only the visible rows exist as widgets
+        self.list_view = RecycleView()
+        rows = RecycleBoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            default_size=(None, BUTTON_HEIGHT),
+            default_size_hint=(1, None),
+            spacing=SPACING
+        )
+        rows.bind(minimum_height=rows.setter('height'))
+        self.list_view.add_widget(rows)
+        # Set once the layout manager exists, which holds the viewclass
+        self.list_view.viewclass = 'Button'
+        layout.add_widget(self.list_view)
+
+        # Close button
+        close_button = Button(
+            text='Close',
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            background_normal='',
+            background_color=(0.8, 0.8, 0.8, 1),
+            color = (0,0,0,1)
+        )
+        close_button.bind(on_press=self.dismiss)
+        layout.add_widget(close_button)
+
+        return layout
+
+    def browse(self, path):
+        """Show a directory, listing it in the background."""
+        if self._lister:
+            self._lister.cancel()
+        self.path = os.path.abspath(path)
+        self.status_label.text = f'{self.path}  -  loading'
+        parent = os.path.dirname(self.path)
+        self._parent_rows = [] if parent == self.path else [
+            self._row('..', parent, is_dir=True)
+        ]
+        self.list_view.data = list(self._parent_rows)
+        lister = DirectoryLister(
+            self.path, self.extensions,
+            on_batch=lambda entries: self._on_batch(lister, entries),
+            on_complete=lambda entries, error: self._on_complete(lister, entries, error),
+            cache=self.cache
+        )
+        self._lister = lister
+        lister.start()
+
+    def _row(self, name, path, is_dir):
+        """RecycleView data for one entry."""
+        return {
+            'text': name + os.sep if is_dir else name,
+            'background_normal': '',
+            'background_color': (0.8, 0.8, 0.8, 1) if is_dir else (0.9, 0.9, 0.9, 1),
+            'color': (0, 0, 0, 1),
+            'on_release': lambda: self.on_select(path, is_dir)
+        }
+
+    @mainthread
+    def _on_batch(self, lister, entries):
+        """Append entries as they are read (unsorted until complete)."""
+        if lister is not self._lister:
+            return
+        self.list_view.data.extend(
+            self._row(entry.name, entry.path, entry.is_dir) for entry in entries
+        )
+        self.status_label.text = (f'{self.path}  -  loading '
+                                  f'{len(self.list_view.data) - len(self._parent_rows)} entries')
+
+    @mainthread
+    def _on_complete(self, lister, entries, error):
+        """Show the complete, sorted listing."""
+        if lister is not self._lister:
+            return
+        self._lister = None
+        self.list_view.data = self._parent_rows + [
+            self._row(entry.name, entry.path, entry.is_dir) for entry in entries
+        ]
+        if error:
+            self.status_label.text = f'{self.path}  -  {error}'
+        else:
+            self.status_label.text = f'{self.path}  -  {len(entries)} entries'
+
+    def _on_dismiss(self, *args):
+        """Stop listing; anything already read is discarded."""
+        if self._lister:
+            self._lister.cancel()
+            self._lister = None
+
+    def on_select(self, path, is_dir):
+        """Enter a directory, or open a document and close the dialog."""
+        if is_dir:
+            self.browse(path)
+            return
+        self.dismiss()
+        self.reader.browse_path = self.path
+        self.reader.load_file(path)
@@ -0,0 +1,162 @@
+# widgets/library_view.py
+
+import os
+from kivy.uix.popup import Popup
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.clock import mainthread
+from kivy.properties import ObjectProperty
+
+from utils.library_indexer import LibraryIndex, LibraryIndexer
+from constants import PADDING, SPACING, BUTTON_HEIGHT, LIBRARY_DIRECTORIES
+
+class LibraryPopup(Popup):
+    """
+    Library dialog listing every indexed document with its word count and
+    estimated reading time.
+
+    The list is read straight from the on-disk index, so it opens at once
+    however large the library is. A LibraryIndexer brings the index up to
+    date in the background and the list is reloaded when it finishes.
+    """
+
+    reader = ObjectProperty(None)
+
+    def __init__(self, reader, db_path, directories=LIBRARY_DIRECTORIES, **kwargs):
+        super().__init__(**kwargs)
+        self.reader = reader
+        self.db_path = db_path
+        self.directories = directories
+        self.entries = []
+        self._indexer = None
+        self.title = 'Library'
+        self.size_hint = (0.9, 0.9)
+        self.content = self._create_layout()
+        self.bind(on_dismiss=self._on_dismiss)
+        self.load_entries()
+        self.start_indexer()
+
+    def _create_layout(self) -> BoxLayout:
+        """Create and return the library layout."""
+        layout = BoxLayout(
+            orientation='vertical',
+            padding=PADDING,
+            spacing=SPACING
+        )
+
+        # Filter by path
+        self.filter_input = TextInput(
+            multiline=False,
+            hint_text='Filter',
+            size_hint_y=None,
+            height=BUTTON_HEIGHT
+        )
+        self.filter_input.bind(text=lambda *args: self.refresh_list())
+        layout.add_widget(self.filter_input)
+
+        # Document count / indexing status
+        self.status_label = Label(
+            text='',
+            size_hint_y=None,
+            height=BUTTON_HEIGHT
+        )
+        layout.add_widget(self.status_label)
+
+        # Only the visible rows exist as widgets
+        self.list_view = RecycleView()
+        rows = RecycleBoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            default_size=(None, BUTTON_HEIGHT),
+            default_size_hint=(1, None),
+            spacing=SPACING
+        )
+        rows.bind(minimum_height=rows.setter('height'))
+        self.list_view.add_widget(rows)
+        # Set once the layout manager exists, which holds the viewclass
+        self.list_view.viewclass = 'Button'
+        layout.add_widget(self.list_view)
+
+        # Close button
+        close_button = Button(
+            text='Close',
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            background_normal='',
+            background_color=(0.8, 0.8, 0.8, 1),
+            color = (0,0,0,1)
+        )
+        close_button.bind(on_press=self.dismiss)
+        layout.add_widget(close_button)
+
+        return layout
+
+    def load_entries(self):
+        """Read the index and refresh the list."""
+        index = LibraryIndex(self.db_path)
+        try:
+            self.entries = index.entries()
+        finally:
+            index.close()
+        self.refresh_list()
+
+    def refresh_list(self):
+        """Show the entries matching the filter."""
+        query = self.filter_input.text.strip().casefold()
+        wpm = self.reader.engine.wpm
+        data = []
+        for entry in self.entries:
+            if query and query not in entry.path.casefold():
+                continue
+            minutes = entry.reading_time(wpm) / 60
+            data.append({
+                'text': f'{os.path.basename(entry.path)}  -  '
+                        f'{entry.word_count} words, {minutes:.0f} min',
+                'background_normal': '',
+                'background_color': (0.9, 0.9, 0.9, 1),
+                'color': (0, 0, 0, 1),
+                'on_release': lambda path=entry.path: self.on_select(path)
+            })
+        self.list_view.data = data
+        if not self._indexer:
+            self.status_label.text = f'{len(data)} documents'
+
+    def start_indexer(self):
+        """Update the index in the background."""
+        self.status_label.text = f'{len(self.entries)} documents, checking for changes'
+        self._indexer = LibraryIndexer(
+            self.db_path, self.directories,
+            on_progress=self._on_index_progress,
+            on_complete=self._on_index_complete
+        )
+        self._indexer.start()
+
+    @mainthread
+    def _on_index_progress(self, done, total):
+        """Show how far indexing has got."""
+        if self._indexer:
+            self.status_label.text = f'Indexing {done} of {total} documents'
+
+    @mainthread
+    def _on_index_complete(self, changed):
+        """Reload the list if anything changed."""
+        self._indexer = None
+        if changed:
+            self.load_entries()
+        else:
+            self.refresh_list()
+
+    def _on_dismiss(self, *args):
+        """Stop indexing; finished batches are already saved."""
+        if self._indexer:
+            self._indexer.cancel()
+            self._indexer = None
+
+    def on_select(self, path):
+        """Open a document and close the dialog."""
+        self.dismiss()
+        self.reader.load_file(path)
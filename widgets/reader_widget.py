@@ -1,23 +1,45 @@
 from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.relativelayout import RelativeLayout
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
-from kivy.uix.filechooser import FileChooserListView
+from kivy.uix.slider import Slider
 from kivy.uix.popup import Popup
-from kivy.clock import Clock
+from kivy.uix.modalview import ModalView
+from kivy.clock import Clock, mainthread
+from kivy.core.window import Window
 from kivy.metrics import dp
+from kivy.utils import escape_markup
 from kivy.properties import StringProperty, BooleanProperty, ObjectProperty
-from kivy_text_metrics import TextMetrics
+
+from array import array
 
 
 
 from utils.text_processor import TextProcessor
 from utils.file_handler import FileHandler, Word
+from utils.focus_layout import FocusLayoutWorker
+from utils.clocks import KivyClock
+from utils.playback_engine import PlaybackEngine
+from utils.search_index import SearchIndexBuilder
+from utils.fingerprint import document_fingerprint
+from utils.resume_store import ResumeState
+from utils.width_predictor import calibrate_predictor
+from utils.warmup import WarmupWorker, BASIC_LATIN
+from utils.directory_lister import DirectoryCache
+from utils.layout_cache import LayoutCache
+from utils.compiled_document import open_document
+from utils.shared_document import SharedDocument
+from utils.rsvp_client import RemoteSession
+from utils.timeline import Timeline
 from widgets.focus_indicator import FocusIndicator
+from widgets.word_display import WordDisplay
 from widgets.settings_popup import SettingsPopup
-from constants import (SUPPORTED_EXTENSIONS, PADDING, SPACING, BUTTON_HEIGHT,
-                    DISPLAY_HEIGHT)
+from widgets.search_popup import SearchPopup
+from widgets.library_view import LibraryPopup
+from widgets.file_browser import FileBrowserPopup
+from constants import (PADDING, SPACING, BUTTON_HEIGHT, DISPLAY_HEIGHT,
+                    PREPARE_AHEAD, SCRUB_UPDATE_INTERVAL, REOPEN_LAST_DOCUMENT,
+                    COMPILED_CACHE_DIR, SHARE_DOCUMENTS)
 
 class RSVPReader(FloatLayout):
     """
@@ -31,12 +53,52 @@ class RSVPReader(FloatLayout):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.text_processor = TextProcessor()
-        self.words = []
-        self.current_index = 0
-        self.scheduled_event = None
-        self.metrics = None
+        self.engine = PlaybackEngine(
+            KivyClock(), self.text_processor,
+            on_word=self._on_engine_word,
+            on_finished=self._on_engine_finished
+        )
+        self.layouts = LayoutCache()
+        self._layout = None
+        self.focus_positions = None
+        self._warmup_worker = None
+        self.search_index = None
+        self._search_builder = None
+        self.resume_store = None
+        self.library_path = None
+        self.browse_path = '.'
+        self.directory_cache = DirectoryCache()
+        self._fingerprint = None
+        self._filepath = None
+        self._scrub_event = None
+        self._scrubbing = False
+        self.remote = None
+        self.shared_document = None
         self.setup_ui()
         self.bind(size=self._on_size)
+        Window.bind(on_key_down=self._on_key_down)
+    
+    @property
+    def words(self):
+        """Words of the loaded document."""
+        return self.engine.words
+    
+    @property
+    def layout(self):
+        """FontLayout for the current font and size."""
+        key = (self.app.font_name, int(self.app.font_size))
+        if self._layout is None or self._layout.key != key:
+            self._layout = self.layouts.get(*key)
+        return self._layout
+    
+    @property
+    def current_index(self):
+        """Index of the word being displayed."""
+        return self.engine.index
+    
+    @current_index.setter
+    def current_index(self, index):
+        self.engine.index = index
     
     def _on_size(self, *args):
         """Handle window resize events."""
@@ -83,6 +145,16 @@ class RSVPReader(FloatLayout):
             color = (0,0,0,1)
         )
         
+        # Library button
+        self.library_button = Button(
+            text='Library',
+            size_hint_x=None,
+            width=dp(100),
+            background_normal='',
+            background_color=(0.9, 0.9, 0.9, 1),
+            color = (0,0,0,1)
+        )
+        
         # Play/Pause button
         self.play_button = Button(
             text='Play',
@@ -94,9 +166,31 @@ class RSVPReader(FloatLayout):
             color = (0,0,0,1)
         )
         
+        # Search button
+        self.search_button = Button(
+            text='Search',
+            size_hint_x=None,
+            width=dp(100),
+            disabled=True,
+            background_normal='',
+            background_color=(0.9, 0.9, 0.9, 1),
+            color = (0,0,0,1)
+        )
+        
         controls.add_widget(self.settings_button)
         controls.add_widget(self.file_button)
+        controls.add_widget(self.library_button)
         controls.add_widget(self.play_button)
+        controls.add_widget(self.search_button)
+        
+        # Scrub bar, position in percent of reading time
+        self.scrub_bar = Slider(
+            min=0,
+            max=100,
+            value=0,
+            disabled=True
+        )
+        controls.add_widget(self.scrub_bar)
         
         # Display area
         self.display_area = BoxLayout(
@@ -104,24 +198,15 @@ class RSVPReader(FloatLayout):
             spacing=dp(2)
         )
         
-        # Create a relative layout for precise word positioning
-        self.word_container = RelativeLayout(
-            size_hint=(1, None),
-            height=DISPLAY_HEIGHT
-        )
-        
-        # Word display with improved initial centering
-        self.word_display = Label(
+        # Word display draws each word directly at its focus offset,
+        # so showing a word never triggers a layout pass
+        self.word_display = WordDisplay(
             text='Select a file to begin',
-            markup=True,
-            size_hint=(None, None),
+            size_hint=(1, None),
             height=DISPLAY_HEIGHT,
-            font_size=dp(24),
-            pos_hint={'center_x': 0.5, 'center_y': 0.5}
+            font_size=dp(24)
         )
         
-        self.word_container.add_widget(self.word_display)
-        
         # Focus indicator with adjusted position
         self.focus_indicator = FocusIndicator(
             size_hint=(1, None),
@@ -131,7 +216,7 @@ class RSVPReader(FloatLayout):
 
 
         
-        self.display_area.add_widget(self.word_container)
+        self.display_area.add_widget(self.word_display)
         self.display_area.add_widget(self.focus_indicator)
         
         # Add everything to main layout
@@ -144,51 +229,350 @@ class RSVPReader(FloatLayout):
         # Bind events
         self.settings_button.bind(on_press=self.show_settings)
         self.file_button.bind(on_press=self.show_file_chooser)
+        self.library_button.bind(on_press=self.show_library)
         self.play_button.bind(on_press=self.toggle_playback)
+        self.search_button.bind(on_press=self.show_search)
+        self.scrub_bar.bind(on_touch_down=self._on_scrub_start,
+                            on_touch_up=self._on_scrub)
     
     def show_settings(self, instance):
         """Display the settings dialog."""
         settings_popup = SettingsPopup(self.app)
         settings_popup.open()
     
+    def show_search(self, instance):
+        """Display the search dialog."""
+        search_popup = SearchPopup(self)
+        search_popup.open()
+    
+    def show_library(self, instance):
+        """Display the document library."""
+        library_popup = LibraryPopup(self, self.library_path)
+        library_popup.open()
+    
     def show_file_chooser(self, instance):
         """Show file selection dialog."""
-        content = BoxLayout(orientation='vertical')
-        
-        file_chooser = FileChooserListView(
-            path='.',
-            filters=self._get_file_filters()
+        file_browser = FileBrowserPopup(self, self.browse_path,
+                                        cache=self.directory_cache)
+        file_browser.open()
+    
+    def load_file(self, filepath):
+        """Load and prepare file for display."""
+        try:
+            FileHandler.verify_file_access(filepath)
+            self.disconnect()
+            shared = None
+            if SHARE_DOCUMENTS:
+                # Attaches to the copy another reader process has open, if any
+                shared = SharedDocument.open(filepath, self.text_processor,
+                                             COMPILED_CACHE_DIR)
+                document = shared.to_document()
+            else:
+                # A precompiled document skips parsing, timing and focus positions
+                document = open_document(filepath, self.text_processor,
+                                         COMPILED_CACHE_DIR)
+            self._open_document(filepath, *document, shared=shared)
+        except Exception as e:
+            self.show_error_popup(str(e))
+    
+    def _open_document(self, filepath, words, boundaries, timeline=None,
+                       focus_positions=None, shared=None):
+        """Show a parsed document, resuming where it was last left."""
+        self.engine.load(words, timeline, boundaries)
+        self._adopt_shared_document(shared, self.layouts.reset_document())
+        self.focus_positions = focus_positions
+        state = self._lookup_resume_state(filepath)
+        if state:
+            self._restore_settings(state)
+        self.play_button.disabled = False
+        self.scrub_bar.disabled = False
+        self.search_button.disabled = False
+        self.build_search_index()
+        if state:
+            self.seek_to_index(state.word_index)
+        else:
+            self._update_scrub_bar()
+            self.update_display()
+        self.refresh_layout()
+
+    def _adopt_shared_document(self, shared, workers):
+        """
+        Keep the open document's shared memory, detaching from the
+        previous document's once nothing can still be reading it.
+
+        Args:
+            shared: SharedDocument of the new document, or None
+            workers: Cancelled layout workers of the previous document
+        """
+        previous, self.shared_document = self.shared_document, shared
+        if previous is None:
+            return
+        workers = list(workers)
+        if self._search_builder:
+            self._search_builder.cancel()
+            workers.append(self._search_builder)
+            self._search_builder = None
+        self._close_when_idle(previous, workers)
+
+    def _close_when_idle(self, shared, workers):
+        """Close a SharedDocument once the given worker threads have exited."""
+        if any(worker.is_alive() for worker in workers):
+            # Cancelled workers stop at their next word, within a frame or two
+            Clock.schedule_once(
+                lambda dt: self._close_when_idle(shared, workers))
+            return
+        shared.close()
+
+    def connect_to_server(self, host, port):
+        """
+        Follow a session on an RSVP server instead of a local document.
+
+        The server sends the document once, already tokenized, focused and
+        timed, then every word to show. Play, seeking, navigation and
+        speed changes are sent to the server, which keeps the position;
+        rendering and layout work as for a local document.
+        """
+        self.disconnect()
+        session = RemoteSession(
+            host, port,
+            lambda message: self._on_remote_message(session, message),
+            lambda error: self._on_remote_closed(session, error)
         )
+        self.remote = session
+        session.start()
+
+    def disconnect(self):
+        """Stop following the server, if connected."""
+        if self.remote is None:
+            return
+        self.remote.close()
+        self.remote = None
+        self._show_playing(False)
+
+    @mainthread
+    def _on_remote_message(self, session, message):
+        """Apply a message from the server on the main thread."""
+        if session is not self.remote:
+            return
+        kind = message.get('type')
+        if kind == 'word':
+            self.current_index = message['index']
+            self.update_display()
+        elif kind == 'state':
+            self.current_index = message['index']
+            self.engine.wpm = self.app.wpm = message['wpm']
+            if message['playing'] != self.is_playing:
+                self._show_playing(message['playing'])
+            else:
+                self._update_scrub_bar()
+        elif kind == 'document':
+            self._open_remote_document(message)
+        elif kind == 'error':
+            print(f"Server error: {message['message']}")
+
+    def _open_remote_document(self, message):
+        """Show a document received from the server."""
+        words = [Word(text) for text in message['words']]
+        self.engine.load(words, Timeline(array('d', message['units'])))
+        self._adopt_shared_document(None, self.layouts.reset_document())
+        self.focus_positions = array('I', message['focus_positions'])
+        # Positions are kept by the server, not the resume store
+        self._fingerprint = None
+        self._filepath = None
+        self.play_button.disabled = False
+        self.scrub_bar.disabled = False
+        self.search_button.disabled = False
+        self.build_search_index()
+        self._update_scrub_bar()
+        self.update_display()
+        self.refresh_layout()
+
+    @mainthread
+    def _on_remote_closed(self, session, error):
+        """Return to local mode when the server connection ends."""
+        if session is not self.remote:
+            return
+        self.remote = None
+        self._show_playing(False)
+        self.show_error_popup(f"Disconnected from server: {error or 'connection closed'}")
+
+    def warm_up(self):
+        """
+        Prepare rendering state in the background after launch.
         
-        def select_file(instance, filename, touch=None):
-            if filename:
-                self.load_file(filename[0])
-                popup.dismiss()
+        A WarmupWorker loads FreeType, HarfBuzz, the hyphenation dictionary
+        and the basic Latin glyphs for the current font, and parses the
+        most recently opened document. Once it is done, the glyphs are
+        rendered once on the main thread and the document is reopened at
+        its saved position with its first words prepared, so Play shows a
+        word at once.
+        """
+        if self._warmup_worker or not self.app:
+            return
+        document_path = None
+        if (REOPEN_LAST_DOCUMENT and self.resume_store is not None
+                and self.remote is None):
+            state = self.resume_store.most_recent()
+            if state:
+                document_path = state.path
+        worker = WarmupWorker(
+            self.app.get_font_path(self.app.font_name), int(self.app.font_size),
+            lambda metrics, document: self._on_warmup_complete(
+                worker, metrics, document),
+            document_path
+        )
+        self._warmup_worker = worker
+        worker.start()
+    
+    @mainthread
+    def _on_warmup_complete(self, worker, metrics, document):
+        """Adopt the warm-up results on the main thread."""
+        if worker is not self._warmup_worker:
+            return
+        self._warmup_worker = None
         
-        file_chooser.bind(on_submit=select_file)
-        content.add_widget(file_chooser)
+        layout = self.layout
+        if (layout.metrics is None and metrics.font_size == layout.key[1]
+                and metrics.font_path == self.app.get_font_path(layout.key[0])):
+            layout.metrics = metrics
+        # Renders (and caches) every basic Latin glyph at the current font and size
+        self.word_display.prepare(escape_markup(BASIC_LATIN))
         
-        popup = Popup(
-            title='Select File',
-            content=content,
-            size_hint=(0.9, 0.9)
-        )
-        popup.open()
+        # Only if the user has not opened something in the meantime
+        if document is not None and not self.words and self.remote is None:
+            try:
+                self._open_document(document.path, document.words,
+                                    document.boundaries, document.timeline,
+                                    document.focus_positions)
+            except Exception as e:
+                print(f"Error reopening last document: {e}")
     
-    def _get_file_filters(self):
-        """Get file filters based on supported extensions."""
-        return ['*' + ext for ext in SUPPORTED_EXTENSIONS]
+    def _lookup_resume_state(self, filepath):
+        """Fingerprint a newly loaded document and find its saved state."""
+        self._fingerprint = None
+        self._filepath = filepath
+        if self.resume_store is None:
+            return None
+        try:
+            self._fingerprint = document_fingerprint(filepath)
+        except OSError as e:
+            print(f"Error fingerprinting document: {e}")
+            return None
+        return self.resume_store.get(self._fingerprint)
     
-    def load_file(self, filepath):
-        """Load and prepare file for display."""
+    def _restore_settings(self, state):
+        """Apply a document's saved reading speed and font."""
+        self.app.wpm = state.wpm
+        self.engine.wpm = state.wpm
+        if self.app.register_font(state.font_name):
+            self.app.font_name = state.font_name
+            self.app.font_size = state.font_size
+            self.word_display.font_name = state.font_name
+            self.word_display.font_size = dp(state.font_size)
+    
+    def save_resume_state(self):
+        """Record the current position and settings for the open document."""
+        if self.resume_store is None or self._fingerprint is None:
+            return
+        self.resume_store.save(self._fingerprint, ResumeState(
+            self._filepath, self.current_index, int(self.app.wpm),
+            self.app.font_name, int(self.app.font_size)
+        ))
+    
+    def refresh_layout(self):
+        """
+        Switch to the current font and size.
+        
+        The words around the reading position are rendered and measured
+        straight away. Focus offsets for the rest of the document are
+        computed afterwards: the width predictor is calibrated on the
+        main thread once the switch has been drawn, then every word is
+        laid out in a background thread. A setting used recently keeps
+        its FontLayout in the LayoutCache, so switching back to it
+        reuses its metrics, offsets and rendered words.
+        """
+        if not self.words or not self.app:
+            return
+        layout = self.layout
+        self._prepare_range(self.current_index, PREPARE_AHEAD)
+        if layout.focus_offsets is None and layout.worker is None:
+            Clock.schedule_once(lambda dt: self._start_layout(layout))
+    
+    def _start_layout(self, layout):
+        """Lay out the whole document for a FontLayout in the background."""
+        if (layout is not self._layout or layout.worker is not None
+                or layout.focus_offsets is not None or not self.words):
+            return
+        
+        font_name, font_size = layout.key
+        texts = [word.text for word in self.words]
         try:
-            FileHandler.verify_file_access(filepath)
-            self.words = FileHandler.load_file(filepath)
-            self.current_index = 0
-            self.play_button.disabled = False
-            self.update_display()
+            predictor = calibrate_predictor(
+                texts, self._get_metrics(), self.text_processor,
+                font_name, dp(font_size)
+            )
         except Exception as e:
-            self.show_error_popup(str(e))
+            print(f"Error calibrating width predictor: {e}")
+            return
+        
+        worker = FocusLayoutWorker(
+            texts, self.app.get_font_path(font_name), font_size, predictor,
+            lambda positions, offsets: self._on_layout_complete(
+                layout, worker, positions, offsets),
+            focus_positions=self.focus_positions
+        )
+        layout.worker = worker
+        worker.start()
+    
+    @mainthread
+    def _on_layout_complete(self, layout, worker, focus_positions, focus_offsets):
+        """Adopt a finished layout unless it has been superseded."""
+        if worker is not layout.worker:
+            return
+        layout.worker = None
+        layout.focus_offsets = focus_offsets
+        # Focus positions do not depend on the font, so the first layout sets them
+        if self.focus_positions is None:
+            self.focus_positions = focus_positions
+    
+    def build_search_index(self):
+        """
+        Index the document for search in a background thread.
+        
+        search_index stays None until the index is ready.
+        """
+        if self._search_builder:
+            self._search_builder.cancel()
+            self._search_builder = None
+        self.search_index = None
+        
+        if not self.words:
+            return
+        
+        builder = SearchIndexBuilder(
+            [word.text for word in self.words],
+            lambda index: self._on_search_index_complete(builder, index)
+        )
+        self._search_builder = builder
+        builder.start()
+    
+    @mainthread
+    def _on_search_index_complete(self, builder, search_index):
+        """Adopt a finished search index unless it has been superseded."""
+        if builder is not self._search_builder:
+            return
+        self._search_builder = None
+        self.search_index = search_index
+    
+    def _get_metrics(self):
+        """Get TextMetrics for the current font, kept with its FontLayout."""
+        layout = self.layout
+        if layout.metrics is None:
+            # FreeType and HarfBuzz are only loaded once a document needs them
+            from kivy_text_metrics import TextMetrics
+            font_name, font_size = layout.key
+            layout.metrics = TextMetrics(self.app.get_font_path(font_name), font_size)
+        return layout.metrics
     
     def show_error_popup(self, message):
         """Display error message to user."""
@@ -208,86 +592,220 @@ class RSVPReader(FloatLayout):
     
     def start_playback(self):
         """Start or resume playback."""
-        self.is_playing = True
-        self.play_button.text = 'Pause'
-        self.schedule_next_word()
+        if self.remote:
+            self.remote.send('play', wpm=int(self.app.wpm))
+            return
+        self.engine.wpm = self.app.wpm
+        self.engine.play()
+        self._show_playing(True)
     
     def pause_playback(self):
         """Pause playback."""
-        self.is_playing = False
-        self.play_button.text = 'Play'
-        if self.scheduled_event:
-            self.scheduled_event.cancel()
-            self.scheduled_event = None
-    
-    def schedule_next_word(self):
-        """Schedule the display of the next word."""
-        if self.current_index >= len(self.words):
-            self.current_index = 0
-            self.pause_playback()
+        if self.remote:
+            self.remote.send('pause')
             return
+        self.engine.pause()
+        self._show_playing(False)
+    
+    def _show_playing(self, playing):
+        """Switch the Play button and scrub bar updates between playing and paused."""
+        self.is_playing = playing
+        self.play_button.text = 'Pause' if playing else 'Play'
+        if self._scrub_event:
+            self._scrub_event.cancel()
+            self._scrub_event = None
+        if playing:
+            self._scrub_event = Clock.schedule_interval(
+                self._update_scrub_bar, SCRUB_UPDATE_INTERVAL)
+        else:
+            self._update_scrub_bar()
+    
+    def set_wpm(self, wpm):
+        """Change the reading speed, on the server when following one."""
+        if self.remote:
+            self.remote.send('wpm', wpm=int(wpm))
+        else:
+            self.engine.set_wpm(wpm)
+    
+    def seek_to_index(self, index):
+        """
+        Jump to a word index.
         
-        word = self.words[self.current_index]
-        self.update_display()
-        
-        duration = self.text_processor.calculate_display_duration(
-            word.text,
-            self.app.wpm,
-            word.duration if hasattr(word, 'duration') else None
-        )
+        The target word and the next few are rendered before the jump,
+        so the first frame after the seek only swaps textures.
+        """
+        if not self.words:
+            return
+        index = max(0, min(index, len(self.words) - 1))
+        self._prepare_range(index, PREPARE_AHEAD)
+        if self.remote:
+            self.remote.send('seek', index=index)
+            return
+        self.engine.seek(index)
+        self._update_scrub_bar()
+    
+    def seek_to_time(self, seconds):
+        """Jump to the word shown a given time into the document."""
+        self.seek_to_index(self.engine.timeline.index_at(seconds, self.engine.wpm))
+    
+    def seek_to_percent(self, percent):
+        """Jump to the word shown a given percentage into the document."""
+        total = self.engine.timeline.total_time(self.engine.wpm)
+        self.seek_to_time(total * percent / 100.0)
+    
+    def previous_sentence(self):
+        """Jump back to the start of the sentence (or the previous one)."""
+        if self.remote:
+            self.remote.send('previous_sentence')
+        elif self.words:
+            self.seek_to_index(
+                self.engine.boundaries.previous_sentence(self.current_index))
+    
+    def next_sentence(self):
+        """Jump to the start of the next sentence."""
+        if self.remote:
+            self.remote.send('next_sentence')
+        elif self.words:
+            self.seek_to_index(
+                self.engine.boundaries.next_sentence(self.current_index))
+    
+    def previous_paragraph(self):
+        """Jump back to the start of the paragraph (or the previous one)."""
+        if self.remote:
+            self.remote.send('previous_paragraph')
+        elif self.words:
+            self.seek_to_index(
+                self.engine.boundaries.previous_paragraph(self.current_index))
+    
+    def next_paragraph(self):
+        """Jump to the start of the next paragraph."""
+        if self.remote:
+            self.remote.send('next_paragraph')
+        elif self.words:
+            self.seek_to_index(
+                self.engine.boundaries.next_paragraph(self.current_index))
+    
+    def _on_key_down(self, window, key, scancode, codepoint, modifiers):
+        """
+        Navigate with the arrow keys: left/right by sentence, up/down by paragraph.
         
-        self.scheduled_event = Clock.schedule_once(
-            lambda dt: self.advance_word(),
-            duration
-        )
+        Bound after the system keyboard, so this runs first: keys are left
+        to a focused text input or an open popup.
+        """
+        if (Window._system_keyboard.target is not None
+                or any(isinstance(child, ModalView) for child in Window.children)):
+            return False
+        actions = {
+            276: self.previous_sentence,   # Left
+            275: self.next_sentence,       # Right
+            273: self.previous_paragraph,  # Up
+            274: self.next_paragraph,      # Down
+        }
+        action = actions.get(key)
+        if action is None or not self.words:
+            return False
+        action()
+        return True
+    
+    def _on_scrub_start(self, slider, touch):
+        """Stop following playback while the user drags the scrub bar."""
+        if not slider.disabled and slider.collide_point(*touch.pos):
+            self._scrubbing = True
+    
+    def _on_scrub(self, slider, touch):
+        """Seek when the user releases the scrub bar."""
+        if touch.grab_current is slider:
+            self._scrubbing = False
+            self.seek_to_percent(slider.value)
+    
+    def _update_scrub_bar(self, *args):
+        """Move the scrub bar to the current position."""
+        if self._scrubbing:
+            return
+        self.scrub_bar.value = self.engine.position_percent()
+    
+    def _on_engine_word(self, index):
+        """Display the word the engine has moved to, returning when it was shown."""
+        return self.update_display()
     
-    def advance_word(self):
-        """Advance to the next word if still playing."""
-        if self.is_playing:
-            self.current_index += 1
-            self.schedule_next_word()
+    def _on_engine_finished(self):
+        """Reset the controls when playback reaches the end."""
+        self.pause_playback()
     
     def update_display(self):
-        """Update the display with the current word."""
+        """
+        Update the display with the current word.
+        
+        Returns:
+            The engine clock time the word's texture was swapped in, or
+            None if there is no document
+        """
         if not self.words:
-            self.word_display.pos_hint = {'center_x': 0.5, 'center_y': 0.5}
             return
             
-        self.word_display.pos_hint = {}
-        word = self.words[self.current_index]
+        self.focus_indicator.update_font_size(int(self.app.font_size))
+        index = self.current_index
+        texture, focus_width, formatted_word = self._get_prepared(index)
+        self.word_display.show(texture, focus_width, formatted_word)
+        shown_at = self.engine.clock.now()
         
-        try:
-            font_path = self.app.get_font_path(self.app.font_name)
-            font_size = int(self.app.font_size)
-            self.metrics = TextMetrics(font_path, font_size)
-            self.focus_indicator.update_font_size(font_size)
-        except Exception as e:
-            print(f"Error creating TextMetrics: {e}")
-            self.metrics = None
+        # Render the next word now so its frame only has to swap textures
+        self._prepare_range(index, 2)
+        
+        # Only the index changes from word to word
+        if (self.resume_store is not None and self._fingerprint is not None
+                and not self.resume_store.save_position(self._fingerprint, index)):
+            self.save_resume_state()
+        return shown_at
+    
+    def _get_prepared(self, index):
+        """Get the prepared texture, focus offset and markup for a word."""
+        prepared = self.layout.prepared.get(index)
+        if prepared is None:
+            prepared = self.layout.prepared[index] = self._prepare_word(index)
+        return prepared
+    
+    def _prepare_range(self, start, count):
+        """
+        Prepare count words from start, dropping any prepared word
+        outside the read-ahead window.
+        """
+        end = start + PREPARE_AHEAD
+        prepared = self.layout.prepared
+        for index in [i for i in prepared if not start <= i < end]:
+            del prepared[index]
+        for index in range(start, min(start + count, len(self.words))):
+            self._get_prepared(index)
+    
+    def _prepare_word(self, index):
+        """Render a word and find its focus offset."""
+        word = self.words[index]
         
-        focus_pos = self.text_processor.calculate_focus_character(word.text)
+        if self.focus_positions is not None:
+            focus_pos = self.focus_positions[index]
+        else:
+            focus_pos = self.text_processor.calculate_focus_character(word.text)
         formatted_word = self.text_processor.format_word_with_focus(
-            word.text, focus_pos, self.metrics,
-            self.word_display.texture_size if self.word_display.texture else None
-        )
+            word.text, focus_pos)
+        texture = self.word_display.prepare(formatted_word)
         
-        self.word_display.text = formatted_word
-        self.word_display.texture_update()
+        focus_offsets = self.layout.focus_offsets
+        if focus_offsets is not None:
+            focus_width = focus_offsets[index]
+        else:
+            try:
+                metrics = self._get_metrics()
+                glyph_attribs, ascender, descender = metrics.get_text_extents(
+                    word.text, texture.size
+                )
+                
+                # Calculate focus width including half of focus character
+                focus_width = sum(attrib[6] for attrib in glyph_attribs[:focus_pos])
+                if focus_pos < len(glyph_attribs):
+                    focus_width += glyph_attribs[focus_pos][6] / 2
+            except Exception as e:
+                print(f"Error creating TextMetrics: {e}")
+                self.layout.metrics = None
+                focus_width = None
         
-        if self.metrics and self.word_display.texture:
-            glyph_attribs, ascender, descender = self.metrics.get_text_extents(
-                word.text, self.word_display.texture_size
-            )
-            
-            # Calculate focus width including half of focus character
-            focus_width = sum(attrib[6] for attrib in glyph_attribs[:focus_pos])
-            if focus_pos < len(glyph_attribs):
-                focus_width += glyph_attribs[focus_pos][6] / 2
-            
-            self.word_display.width = self.word_display.texture_size[0]
-            
-            # Calculate x position relative to container width for consistent centering
-            self.word_display.x = self.word_container.width / 2 - focus_width
-            
-            # Position vertically
-            self.word_display.y = self.word_container.height / 2 - self.word_display.height / 2
\ No newline at end of file
+        return texture, focus_width, formatted_word
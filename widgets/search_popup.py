@@ -0,0 +1,148 @@
+# widgets/search_popup.py
+
+from kivy.uix.popup import Popup
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
+from kivy.properties import ObjectProperty
+from kivy.utils import escape_markup
+
+from constants import (PADDING, SPACING, BUTTON_HEIGHT,
+                       SEARCH_RESULT_LIMIT, SEARCH_CONTEXT_WORDS)
+
+class SearchPopup(Popup):
+    """Search dialog listing the hits for a word or phrase in the document."""
+
+    reader = ObjectProperty(None)
+
+    def __init__(self, reader, **kwargs):
+        super().__init__(**kwargs)
+        self.reader = reader
+        self.title = 'Search'
+        self.size_hint = (0.8, 0.8)
+        self.content = self._create_layout()
+
+    def _create_layout(self) -> BoxLayout:
+        """Create and return the search layout."""
+        layout = BoxLayout(
+            orientation='vertical',
+            padding=PADDING,
+            spacing=SPACING
+        )
+
+        # Query input and search button
+        query_row = BoxLayout(
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            spacing=SPACING
+        )
+        self.query_input = TextInput(
+            multiline=False,
+            hint_text='Word or phrase'
+        )
+        self.query_input.bind(on_text_validate=self.on_search)
+        search_button = Button(
+            text='Search',
+            size_hint_x=None,
+            width=BUTTON_HEIGHT * 2,
+            background_normal='',
+            background_color=(0.9, 0.9, 0.9, 1),
+            color = (0,0,0,1)
+        )
+        search_button.bind(on_press=self.on_search)
+        query_row.add_widget(self.query_input)
+        query_row.add_widget(search_button)
+        layout.add_widget(query_row)
+
+        # Result count / status
+        self.status_label = Label(
+            text='',
+            size_hint_y=None,
+            height=BUTTON_HEIGHT
+        )
+        layout.add_widget(self.status_label)
+
+        # Hits, one button per match
+        self.results = GridLayout(
+            cols=1,
+            size_hint_y=None,
+            spacing=SPACING
+        )
+        self.results.bind(minimum_height=self.results.setter('height'))
+        scroll = ScrollView()
+        scroll.add_widget(self.results)
+        layout.add_widget(scroll)
+
+        # Close button
+        close_button = Button(
+            text='Close',
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            background_normal='',
+            background_color=(0.8, 0.8, 0.8, 1),
+            color = (0,0,0,1)
+        )
+        close_button.bind(on_press=self.dismiss)
+        layout.add_widget(close_button)
+
+        return layout
+
+    def on_search(self, *args):
+        """Run the query and list its hits."""
+        self.results.clear_widgets()
+        query = self.query_input.text.strip()
+        if not query:
+            self.status_label.text = ''
+            return
+
+        index = self.reader.search_index
+        if index is None:
+            self.status_label.text = 'Still indexing, try again in a moment'
+            return
+
+        hits = index.search(query)
+        if not hits:
+            self.status_label.text = 'No matches'
+        elif len(hits) > SEARCH_RESULT_LIMIT:
+            self.status_label.text = (f'{len(hits)} matches, '
+                                      f'showing the first {SEARCH_RESULT_LIMIT}')
+        else:
+            self.status_label.text = f'{len(hits)} matches'
+
+        for position, length in hits[:SEARCH_RESULT_LIMIT]:
+            self.results.add_widget(self._create_hit_button(position, length))
+
+    def _create_hit_button(self, position: int, length: int) -> Button:
+        """Create a button showing a hit in context that jumps to it."""
+        words = self.reader.words
+        start = max(0, position - SEARCH_CONTEXT_WORDS)
+        end = min(len(words), position + length + SEARCH_CONTEXT_WORDS)
+        before = self._join(words[start:position])
+        match = self._join(words[position:position + length])
+        after = self._join(words[position + length:end])
+        button = Button(
+            text=f'{before} [b]{match}[/b] {after}'.strip(),
+            markup=True,
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            shorten=True,
+            background_normal='',
+            background_color=(0.9, 0.9, 0.9, 1),
+            color = (0,0,0,1)
+        )
+        button.bind(width=lambda b, w: setattr(b, 'text_size', (w, None)))
+        button.bind(on_press=lambda *args: self.on_hit(position))
+        return button
+
+    @staticmethod
+    def _join(words) -> str:
+        """Join words into text with Kivy markup characters escaped."""
+        return escape_markup(' '.join(word.text for word in words))
+
+    def on_hit(self, position: int):
+        """Jump to a hit and close the dialog."""
+        self.reader.seek_to_index(position)
+        self.dismiss()
@@ -8,7 +8,7 @@ from kivy.uix.spinner import Spinner
 from kivy.metrics import dp
 from kivy.properties import ObjectProperty
 
-from constants import (FONT_NAMES, FONT_SIZES, WPM_VALUES, 
+from constants import (FONT_SIZES, WPM_VALUES, 
                         PADDING, SPACING, BUTTON_HEIGHT)
 
 class SettingsPopup(Popup):
@@ -35,7 +35,7 @@ class SettingsPopup(Popup):
         layout.add_widget(self._create_section_label('Font:'))
         self.font_spinner = Spinner(
             text=self.app.font_name,
-            values=FONT_NAMES,
+            values=self.app.get_font_names(),
             size_hint_y=None,
             height=BUTTON_HEIGHT,
             background_normal='',
@@ -99,6 +99,8 @@ class SettingsPopup(Popup):
     
     def on_font_change(self, spinner, text):
         """Handle font selection change."""
+        if not self.app.register_font(text):
+            return
         self.app.font_name = text
         self.app.update_display()
     
@@ -109,4 +111,6 @@ class SettingsPopup(Popup):
     
     def on_wpm_change(self, spinner, text):
         """Handle WPM change."""
-        self.app.wpm = int(text)
\ No newline at end of file
+        self.app.wpm = int(text)
+        self.app.root.set_wpm(self.app.wpm)
+        self.app.root.save_resume_state()
\ No newline at end of file
@@ -0,0 +1,102 @@
+# widgets/word_display.py
+
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Rectangle
+from kivy.core.text.markup import MarkupLabel
+from kivy.metrics import dp
+from kivy.properties import StringProperty, NumericProperty
+
+class WordDisplay(Widget):
+    """
+    Draws a single word texture with one Rectangle instruction.
+
+    Unlike a Label, showing a word does not touch any layout properties,
+    so it never triggers a layout pass on the parent layouts. Textures
+    are rendered with prepare() and placed with show() so that the word's
+    focus character sits on the widget's center line.
+    """
+
+    font_name = StringProperty('Roboto')
+    font_size = NumericProperty(dp(24))
+
+    def __init__(self, text='', **kwargs):
+        super().__init__(**kwargs)
+        self.text = ''
+        self.texture = None
+        self._focus_offset = None
+
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self._rect = Rectangle(size=(0, 0))
+
+        self.bind(pos=self._update_rect, size=self._update_rect,
+                  font_name=self._refresh_text, font_size=self._refresh_text)
+        if text:
+            self.show_text(text)
+
+    def prepare(self, markup_text):
+        """
+        Render marked up text to a new texture with the current font.
+
+        Args:
+            markup_text: Text with Kivy markup (e.g. the focus color tag)
+
+        Returns:
+            The rendered Texture
+        """
+        label = MarkupLabel(text=markup_text, font_name=self.font_name,
+                            font_size=self.font_size)
+        label.refresh()
+        return label.texture
+
+    def show(self, texture, focus_offset=None, text=''):
+        """
+        Display a prepared texture.
+
+        Args:
+            texture: Texture returned by prepare()
+            focus_offset: Distance from the texture's left edge to the
+                focus point, or None to center the texture
+            text: The markup the texture was prepared from, used to
+                re-render centered text if the font changes
+        """
+        self.texture = texture
+        self.text = text
+        self._focus_offset = focus_offset
+        self._rect.texture = texture
+        self._rect.size = texture.size
+        self._update_rect()
+
+    def show_text(self, markup_text, focus_offset=None):
+        """Render and display marked up text."""
+        self.show(self.prepare(markup_text), focus_offset, markup_text)
+
+    def clear(self):
+        """Stop displaying any texture."""
+        self.texture = None
+        self.text = ''
+        self._focus_offset = None
+        self._rect.texture = None
+        self._rect.size = (0, 0)
+
+    def _refresh_text(self, *args):
+        """
+        Re-render the displayed text after a font change.
+
+        Text placed by a focus offset is cleared instead, as the offset
+        was measured with the old font; the owner shows it again with an
+        offset for the new one.
+        """
+        if self._focus_offset is not None:
+            self.clear()
+        elif self.text:
+            self.show_text(self.text)
+
+    def _update_rect(self, *args):
+        """Position the texture relative to the widget's center."""
+        width, height = self._rect.size
+        if self._focus_offset is None:
+            x = self.center_x - width / 2
+        else:
+            x = self.center_x - self._focus_offset
+        self._rect.pos = (int(x), int(self.center_y - height / 2))